@@ -16,6 +16,7 @@ from .models import ChatMessage
 from .forms import ChatMessageForm
 from rentals.models import Rental
 from users.models import User
+from users.backends import profile_relations
 
 logger = logging.getLogger('chat')
 
@@ -35,12 +36,15 @@ def chat_list(request):
     # Super-менеджер и администратор видят все чаты без фильтра по участнику.
     if user.role == 'administrator' or is_super:
         chats_qs = ChatMessage.objects.select_related(
-            'rental', 'rental__inventory', 'rental__client', 'rental__manager', 'sender', 'receiver'
+            'rental', 'rental__inventory', 'rental__client', 'rental__manager', 'sender', 'receiver',
+            *profile_relations('sender', 'receiver'),
         ).order_by('rental', '-sent_date')
     else:
         chats_qs = ChatMessage.objects.filter(
             Q(sender=user) | Q(receiver=user)
-        ).select_related('rental', 'rental__inventory', 'sender', 'receiver').order_by('rental', '-sent_date')
+        ).select_related(
+            'rental', 'rental__inventory', 'sender', 'receiver', *profile_relations('sender', 'receiver')
+        ).order_by('rental', '-sent_date')
 
     # Группируем по rental_id и берем последнее сообщение
     chat_groups = {}
@@ -107,7 +111,7 @@ def chat_detail(request, rental_id):
     # Получаем все сообщения
     messages_qs = ChatMessage.objects.filter(
         rental=rental
-    ).select_related('sender', 'receiver').order_by('sent_date')
+    ).select_related('sender', 'receiver', *profile_relations('sender')).order_by('sent_date')
 
     # Отмечаем сообщения как прочитанные
     ChatMessage.objects.filter(
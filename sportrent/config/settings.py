@@ -96,6 +96,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    # Продление сессии раз в сутки (вместо SESSION_SAVE_EVERY_REQUEST) — только после SessionMiddleware
+    'core.middleware.SessionRefreshMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -105,6 +107,9 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'config.urls'
 
+# Скомпилированные шаблоны кэшируются в памяти процесса: при APP_DIRS без явных
+# 'loaders' Django (4.1+) сам оборачивает загрузчики в cached.Loader, в том числе
+# при DEBUG — там runserver сбрасывает кэш при правке шаблона.
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -143,6 +148,14 @@ DATABASES = {
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
+# request.user загружается вместе с профилем роли (client/owner/manager/admin) одним запросом.
+# ModelBackend остаётся в списке: сессии, открытые до перехода, хранят его путь в
+# _auth_user_backend — без него get_user() вернул бы AnonymousUser и всех разлогинило
+AUTHENTICATION_BACKENDS = [
+    'users.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -267,7 +280,9 @@ LOGGING = {
 
 # Session settings (для сохранения сессии после перезагрузки)
 SESSION_COOKIE_AGE = 1209600  # 2 недели
-SESSION_SAVE_EVERY_REQUEST = True
+# Не пишем сессию в БД на каждый запрос: скользящий срок продлевает
+# core.middleware.SessionRefreshMiddleware не чаще раза в сутки
+SESSION_SAVE_EVERY_REQUEST = False
 SESSION_COOKIE_HTTPONLY = True
 
 # AI-поиск: GigaChat (основной LLM) + Yandex карты/геокодер
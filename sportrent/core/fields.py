@@ -0,0 +1,57 @@
+"""
+Поля моделей общего назначения.
+
+Что здесь:
+- SmallIntChoicesField: choices со строковыми кодами ('available', 'good', ...),
+  которые в БД хранятся как smallint по явной таблице codes. Фильтры, формы,
+  шаблоны, URL-параметры и AI-поиск по-прежнему работают со строками, а столбец
+  и индексы по нему занимают 2 байта на значение вместо varchar.
+
+Связано с:
+- inventory/models.py: Inventory.status, Inventory.condition
+- rentals/models.py: Rental.status, Rental.payment_status
+
+Ключевые слова: choices, smallint, перечисление, индексы
+"""
+
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class SmallIntChoicesField(models.SmallIntegerField):
+    """
+    Строковый код в Python, smallint в БД.
+    codes — {код: число}; таблицу только дополняют: числа уже записаны в строках.
+    Неизвестный код в фильтре превращается в NULL и ничего не находит — как и с varchar.
+    """
+
+    def __init__(self, *args, codes=None, **kwargs):
+        self.codes = dict(codes or {})
+        self.codes_by_number = {number: code for code, number in self.codes.items()}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # Проверка диапазона smallint от IntegerField не нужна: значение поля — строковый код
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.codes_by_number.get(value, value)
+
+    def to_python(self, value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return self.codes_by_number.get(value, value)
+        return value
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or isinstance(value, int):
+            return value
+        return self.codes.get(value)
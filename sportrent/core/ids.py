@@ -0,0 +1,28 @@
+"""
+Генерация первичных ключей.
+
+Что здесь:
+- uuid7(): UUID версии 7 (RFC 9562) — первые 48 бит это unix-время в миллисекундах,
+  остальное случайно. Новые ключи растут монотонно, поэтому вставки идут в «правый край»
+  B-tree индекса, как у автоинкремента, а не в случайные страницы, как у uuid4.
+  Формат и размер (UUIDField, 16 байт) те же — схема и URL не меняются.
+
+Связано с:
+- inventory/models.py: ключи Inventory, SportCategory, Favorite, InventoryPhoto
+- rentals/models.py: ключи Rental, Reservation, Payment, PaymentHistory, Contract, DamageReport
+
+Ключевые слова: UUID, первичный ключ, локальность индекса
+"""
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """UUIDv7: 48 бит времени (мс) + версия + 74 случайных бита + вариант RFC 4122."""
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # версия 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # вариант 10xx
+    return uuid.UUID(int=value)
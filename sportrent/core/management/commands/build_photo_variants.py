@@ -0,0 +1,40 @@
+"""
+Management-команда: python manage.py build_photo_variants [--all]
+
+Готовит WebP-варианты (thumbnail / card_image / detail_image) для фотографий
+инвентаря. Новые загрузки обрабатываются сразу при сохранении формы; команда
+нужна для фото, загруженных раньше, и для повторной попытки после ошибок:
+  */30 * * * * cd /app && python manage.py build_photo_variants
+"""
+
+from django.core.management.base import BaseCommand
+
+from inventory.models import InventoryPhoto
+from inventory.services.images import generate_photo_variants
+
+BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = 'Готовит WebP-варианты фотографий инвентаря.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересоздать варианты для всех фото (по умолчанию — только для фото без вариантов).',
+        )
+
+    def handle(self, *args, **options):
+        photos = InventoryPhoto.objects.only('photo_id', 'photo_url', 'thumbnail', 'card_image', 'detail_image')
+        if not options['all']:
+            photos = photos.filter(card_image='')
+
+        batch, processed = [], 0
+        for photo in photos.iterator(chunk_size=BATCH_SIZE):
+            batch.append(photo)
+            if len(batch) == BATCH_SIZE:
+                processed += len(generate_photo_variants(batch))
+                batch = []
+        if batch:
+            processed += len(generate_photo_variants(batch))
+        self.stdout.write(self.style.SUCCESS(f'WebP-варианты готовы для {processed} фото.'))
@@ -741,8 +741,7 @@ class Command(BaseCommand):
                 status='completed', payment_date=start,
                 transaction_id=f'TXN-{rental.rental_id.hex[:12].upper()}',
             )
-            agreement = OwnerAgreement.objects.filter(owner=item.owner, is_accepted=True).first()
-            pct = Decimal(str((agreement.owner_percentage if agreement else 70) / 100))
+            pct = Decimal(str(item.owner.current_owner_percentage / 100))
             item.owner.total_earnings += (total * pct).quantize(Decimal('0.01'))
             item.owner.save(update_fields=['total_earnings'])
             completed_rentals.append(rental)
@@ -911,7 +910,7 @@ class Command(BaseCommand):
 
     def create_reviews(self):
         self.stdout.write('Создаём отзывы...')
-        from reviews.utils import update_inventory_rating
+        from reviews.utils import recalculate_inventory_rating
         rng = random.Random(77)
 
         completed = list(getattr(self, '_completed_rentals', []))
@@ -932,8 +931,9 @@ class Command(BaseCommand):
                 communication_rating=min(5, max(1, rating + rng.randint(-1, 1))),
             )
 
-        for inventory in Inventory.objects.all():
-            update_inventory_rating(inventory)
+        inventory_ids = Inventory.objects.values_list('inventory_id', flat=True)
+        for inventory_id in inventory_ids.iterator(chunk_size=500):
+            recalculate_inventory_rating(inventory_id)
 
         self.stdout.write(self.style.SUCCESS(f'  Отзывов: {Review.objects.count()}'))
 
@@ -0,0 +1,34 @@
+"""
+Management-команда: python manage.py rebuild_earnings [--days N]
+
+Пересобирает свёртку OwnerEarningsDaily (заработок владельцев по дням) для
+страницы аналитики заработка. Без --days — вся история; по cron раз в сутки
+достаточно последних дней:
+  15 3 * * * cd /app && python manage.py rebuild_earnings --days 3
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from rentals.models import OwnerEarningsDaily
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает свёртку заработка владельцев по дням (OwnerEarningsDaily).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Пересобрать только последние N дней (по умолчанию — всю историю).',
+        )
+
+    def handle(self, *args, **options):
+        date_from = None
+        if options['days']:
+            date_from = timezone.localdate() - timedelta(days=options['days'])
+
+        rows = OwnerEarningsDaily.rebuild(date_from=date_from)
+        period = f'с {date_from}' if date_from else 'за всю историю'
+        self.stdout.write(self.style.SUCCESS(f'Свёртка заработка {period}: {rows} строк.'))
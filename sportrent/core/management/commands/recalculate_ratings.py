@@ -0,0 +1,24 @@
+"""
+Management-команда: python manage.py recalculate_ratings
+
+Полностью пересчитывает avg_rating / reviews_count / ratings_sum инвентаря по
+опубликованным отзывам. Рейтинг обновляется сигналами приращением
+(reviews/signals.py), поэтому команда нужна только для починки — после ручных
+правок в БД или массового импорта отзывов в обход сигналов.
+"""
+
+from django.core.management.base import BaseCommand
+
+from inventory.models import Inventory
+from reviews.utils import recalculate_inventory_rating
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг и число отзывов инвентаря по опубликованным отзывам.'
+
+    def handle(self, *args, **options):
+        total = 0
+        for inventory_id in Inventory.objects.values_list('inventory_id', flat=True).iterator():
+            recalculate_inventory_rating(inventory_id)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f'Рейтинг пересчитан для {total} позиций инвентаря.'))
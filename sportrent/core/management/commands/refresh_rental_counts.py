@@ -0,0 +1,20 @@
+"""
+Management-команда: python manage.py refresh_rental_counts
+
+Обновляет материализованное представление inventory_rental_counts, из которого
+дашборд администратора берёт «Топ инвентаря». Запускается по cron (раз в ~10 минут):
+  */10 * * * * cd /app && python manage.py refresh_rental_counts
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = 'Обновляет материализованное представление inventory_rental_counts.'
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            # CONCURRENTLY не блокирует чтение дашборда (нужен уникальный индекс)
+            cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY inventory_rental_counts;')
+        self.stdout.write(self.style.SUCCESS('inventory_rental_counts обновлено.'))
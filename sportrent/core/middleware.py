@@ -0,0 +1,55 @@
+"""
+Middleware проекта.
+
+Что здесь:
+- SessionRefreshMiddleware: скользящий срок сессии без записи на каждый запрос.
+  Вместо SESSION_SAVE_EVERY_REQUEST (UPDATE django_session на любой запрос
+  вошедшего пользователя) сессия помечается изменённой раз в сутки —
+  SessionMiddleware сохраняет её и продлевает срок на SESSION_COOKIE_AGE.
+  Поддерживает sync и async: под daphne (ASGI) не добавляет перехода в поток.
+
+Связано с:
+- config/settings.py: MIDDLEWARE (строго после SessionMiddleware), SESSION_COOKIE_AGE
+
+Ключевые слова: сессия, срок действия, продление, django_session
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils import timezone
+
+# Ключ в данных сессии: дата последнего продления (ISO)
+SESSION_REFRESHED_KEY = '_refreshed_on'
+
+
+class SessionRefreshMiddleware:
+    """Продлевает непустую сессию не чаще раза в сутки."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        session = getattr(request, 'session', None)
+        if session is not None and not session.is_empty():
+            today = timezone.localdate().isoformat()
+            if session.get(SESSION_REFRESHED_KEY) != today:
+                # modified=True → SessionMiddleware.process_response сохранит сессию с новым сроком
+                session[SESSION_REFRESHED_KEY] = today
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        session = getattr(request, 'session', None)
+        if session is not None and not session.is_empty():
+            today = timezone.localdate().isoformat()
+            # aget/aset: загрузка сессии из БД не блокирует event loop
+            if await session.aget(SESSION_REFRESHED_KEY) != today:
+                await session.aset(SESSION_REFRESHED_KEY, today)
+        return response
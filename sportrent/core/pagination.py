@@ -0,0 +1,177 @@
+"""
+Пагинатор с кэшируемым COUNT(*) и подсчётом в том же запросе, что и страница.
+
+Что здесь:
+- CachedCountPaginator: Paginator, который при заданном count_cache_key берёт
+  общее количество из кэша (TTL COUNT_CACHE_TTL), а не считает его на каждый запрос.
+  Ключ передают только для «широких» выборок (каталог без фильтров), где COUNT
+  дорог и одинаков для всех посетителей; узкие фильтры считаются точно.
+  С window_count=True общее количество приходит вместе со строками страницы
+  (COUNT(*) OVER ()) — один запрос вместо двух последовательных.
+
+- KeysetPaginator: пагинация «Назад / Вперёд» по ключу (поле даты, pk) без COUNT
+  и без OFFSET — страница берётся по индексу как LIMIT per_page + 1 после курсора,
+  поэтому её стоимость не растёт ни с размером таблицы, ни с глубиной листания.
+
+Связано с:
+- reviews/views.py: review_list() — KeysetPaginator по review_date
+- rentals/views.py: rental_list() — оконный подсчёт, кэш для ролей с широкой выборкой
+- inventory/services/facets.py — каталог (inventory_list) берёт общее количество
+  из кэшированных фасетов; пагинатор нужен спискам без фасетов
+
+Ключевые слова: пагинация, COUNT, оконная функция, кэш, каталог, keyset, курсор
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Count, Q, Window
+from django.utils.functional import cached_property
+
+COUNT_CACHE_TTL = 60
+
+_WINDOW_TOTAL = '_window_total'
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator с опциональным кэшем общего количества и оконным подсчётом."""
+
+    def __init__(self, object_list, per_page, *args, count_cache_key=None, window_count=False, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.count_cache_key = count_cache_key
+        self.window_count = window_count and self.orphans == 0
+
+    @cached_property
+    def count(self):
+        if not self.count_cache_key:
+            return super().count
+        # Paginator.count — cached_property, поэтому вызываем исходную функцию напрямую
+        return cache.get_or_set(
+            self.count_cache_key,
+            lambda: Paginator.count.func(self),
+            COUNT_CACHE_TTL,
+        )
+
+    def _count_known(self):
+        if 'count' in self.__dict__:
+            return True
+        if self.count_cache_key:
+            cached = cache.get(self.count_cache_key)
+            if cached is not None:
+                self.count = cached
+                return True
+        return False
+
+    def get_page(self, number):
+        if not self.window_count or self._count_known():
+            return super().get_page(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            number = 1
+        if number >= 1:
+            bottom = (number - 1) * self.per_page
+            rows = list(
+                self.object_list.annotate(**{_WINDOW_TOTAL: Window(Count('pk'))})[bottom:bottom + self.per_page]
+            )
+            if rows:
+                for row in rows:
+                    total = row.pop(_WINDOW_TOTAL) if isinstance(row, dict) else getattr(row, _WINDOW_TOTAL)
+                self.count = total
+                if self.count_cache_key:
+                    cache.set(self.count_cache_key, total, COUNT_CACHE_TTL)
+                return self._get_page(rows, number, self)
+
+        # Пустая выборка или номер за её пределами — обычный путь с точным COUNT
+        return super().get_page(number)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class KeysetPage:
+    """Строки страницы и курсоры соседних страниц (None — туда листать некуда)."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Пагинация по убыванию (field, pk). Курсор — «микросекунды_pk» граничной строки:
+    ?before=<курсор> — следующая (более старая) страница, ?after=<курсор> — предыдущая.
+    Битый курсор открывает первую страницу.
+    """
+
+    def __init__(self, queryset, per_page, field):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+
+    def _cursor(self, row):
+        micros = (getattr(row, self.field) - _EPOCH) // timedelta(microseconds=1)
+        return f'{micros}_{row.pk}'
+
+    def _parse(self, cursor):
+        try:
+            micros, pk = cursor.split('_', 1)
+            value = _EPOCH + timedelta(microseconds=int(micros))
+            pk = self.queryset.model._meta.pk.to_python(pk)
+        except (AttributeError, ValueError, OverflowError, ValidationError):
+            return None
+        return value, pk
+
+    def get_page(self, params) -> KeysetPage:
+        field = self.field
+        before = self._parse(params.get('before'))
+        after = None if before else self._parse(params.get('after'))
+
+        if after:
+            value, pk = after
+            rows = list(
+                self.queryset.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk}))
+                .order_by(field, 'pk')[:self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            if rows:
+                # Пришли со следующей страницы — она существует
+                return KeysetPage(
+                    rows,
+                    next_cursor=self._cursor(rows[-1]),
+                    previous_cursor=self._cursor(rows[0]) if has_more else None,
+                )
+
+        # Первая страница, ?before=… или ?after= за началом выборки
+        queryset = self.queryset
+        if before:
+            value, pk = before
+            queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk}))
+        rows = list(queryset.order_by(f'-{field}', '-pk')[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return KeysetPage(
+            rows,
+            next_cursor=self._cursor(rows[-1]) if rows and has_more else None,
+            previous_cursor=self._cursor(rows[0]) if rows and before else None,
+        )
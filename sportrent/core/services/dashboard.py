@@ -0,0 +1,66 @@
+"""
+Сводная статистика для административной панели.
+
+Что здесь:
+- dashboard_stats(): счётчики пользователей, инвентаря, аренд, отзывов и выручка.
+  Результат кэшируется на DASHBOARD_STATS_TTL секунд — дашборд и PDF-экспорт
+  статистики берут одни и те же цифры без повторных COUNT.
+
+Связано с:
+- custom_admin/views.py: admin_dashboard(), export_stats_pdf()
+- rentals/models.py: RevenueCounter — выручка без SUM по платежам
+
+Ключевые слова: дашборд, статистика, кэш, экспорт PDF
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+DASHBOARD_STATS_TTL = 60
+
+
+def dashboard_stats(manager_profile=None) -> dict:
+    """
+    Счётчики для дашборда. Аренды ограничиваются менеджером, если он не супер-менеджер;
+    для администратора и супер-менеджера — общий кэш по всей системе.
+    """
+    scoped = manager_profile is not None and not manager_profile.is_super_manager
+    cache_key = f'dashboard:stats:{manager_profile.pk if scoped else "all"}'
+    return cache.get_or_set(
+        cache_key,
+        lambda: _compute_dashboard_stats(manager_profile if scoped else None),
+        timeout=DASHBOARD_STATS_TTL,
+    )
+
+
+def _compute_dashboard_stats(manager_profile) -> dict:
+    from users.models import User, Client, Owner
+    from inventory.models import Inventory
+    from rentals.models import Rental, RevenueCounter
+    from reviews.models import Review
+
+    rentals_scope = Rental.objects.all()
+    if manager_profile is not None:
+        rentals_scope = rentals_scope.filter(manager=manager_profile)
+
+    last_month = timezone.now() - timedelta(days=30)
+
+    return {
+        'total_users': User.objects.count(),
+        'total_clients': Client.objects.count(),
+        'total_owners': Owner.objects.count(),
+        'total_inventory': Inventory.objects.count(),
+        'available_inventory': Inventory.objects.filter(status='available').count(),
+        'pending_inventory': Inventory.objects.filter(status='pending').count(),
+        'total_rentals': rentals_scope.count(),
+        'active_rentals': rentals_scope.filter(status='active').count(),
+        'pending_rentals': rentals_scope.filter(status='pending').count(),
+        'completed_rentals': rentals_scope.filter(status='completed').count(),
+        'pending_reviews': Review.objects.filter(status='pending').count(),
+        # Готовый счётчик вместо SUM по всей таблице платежей
+        'total_revenue': RevenueCounter.get_total(),
+        'new_users_month': User.objects.filter(registration_date__gte=last_month).count(),
+        'new_rentals_month': rentals_scope.filter(created_date__gte=last_month).count(),
+    }
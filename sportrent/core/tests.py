@@ -1,3 +1,149 @@
-from django.test import TestCase
+"""
+Тесты для приложения core.
+Проверяет CachedCountPaginator: общее количество приходит вместе со строками страницы,
+KeysetPaginator: листание по курсору вперёд и назад с одинаковыми датами,
+генератор упорядоченных по времени ключей uuid7()
+SmallIntChoicesField: строковые коды в Python, smallint в БД
+и SessionRefreshMiddleware: сессия пишется в БД не чаще раза в сутки (sync и async).
+"""
 
-# Create your tests here.
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.ids import uuid7
+from core.middleware import SESSION_REFRESHED_KEY
+from core.pagination import CachedCountPaginator, KeysetPaginator
+from inventory.models import Inventory, SportCategory
+from users.models import Owner, User
+
+
+class WindowCountPaginatorTest(TestCase):
+    """window_count=True: страница и общее количество — одним запросом."""
+
+    def setUp(self):
+        cache.clear()
+        for name in ('Бег', 'Велосипеды', 'Лыжи', 'Плавание', 'Теннис'):
+            SportCategory.objects.create(name=name)
+        self.qs = SportCategory.objects.values('name').order_by('name')
+
+    def test_page_and_count_in_one_query(self):
+        paginator = CachedCountPaginator(self.qs, 2, window_count=True)
+        with self.assertNumQueries(1):
+            page = paginator.get_page(2)
+            self.assertEqual(paginator.count, 5)
+            self.assertEqual([row['name'] for row in page], ['Лыжи', 'Плавание'])
+
+    def test_out_of_range_falls_back_to_last_page(self):
+        paginator = CachedCountPaginator(self.qs, 2, window_count=True)
+        page = paginator.get_page(99)
+        self.assertEqual(page.number, 3)
+        self.assertEqual([row['name'] for row in page], ['Теннис'])
+
+
+class KeysetPaginatorTest(TestCase):
+    """Курсор (дата, pk): страницы не теряют и не повторяют строки с одинаковой датой."""
+
+    def setUp(self):
+        owner = Owner.objects.create(
+            user=User.objects.create_user(email='owner@test.com', password='Pass1234!', role='owner'),
+            full_name='Тест Владелец',
+        )
+        category = SportCategory.objects.create(name='Лыжи')
+        same_date = timezone.now()
+        for i in range(5):
+            Inventory.objects.create(
+                owner=owner, category=category, name=f'Лыжи {i}', description='Описание',
+                price_per_day=Decimal('500.00'), added_date=same_date if i < 3 else same_date - timedelta(days=i),
+            )
+        self.paginator = KeysetPaginator(Inventory.objects.all(), 2, 'added_date')
+        self.expected = list(Inventory.objects.order_by('-added_date', '-pk'))
+
+    def test_forward_and_back(self):
+        page = self.paginator.get_page({})
+        self.assertFalse(page.has_previous())
+        pages = [list(page)]
+        while page.has_next():
+            with self.assertNumQueries(1):
+                page = self.paginator.get_page({'before': page.next_cursor})
+            pages.append(list(page))
+        self.assertEqual([row for rows in pages for row in rows], self.expected)
+
+        back = self.paginator.get_page({'after': page.previous_cursor})
+        self.assertEqual(list(back), pages[-2])
+        self.assertEqual(list(self.paginator.get_page({'before': 'мусор'})), pages[0])
+
+
+class Uuid7Test(SimpleTestCase):
+    """uuid7(): версия 7 и рост по времени — ключи ложатся в конец индекса."""
+
+    def test_version_and_time_ordering(self):
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        self.assertEqual(first.version, 7)
+        self.assertEqual(first.variant, uuid.RFC_4122)
+        self.assertLess(first.int, second.int)
+
+
+class SmallIntChoicesFieldTest(TestCase):
+    """Inventory.status: фильтры и чтение — строковые коды, в таблице — числа."""
+
+    def setUp(self):
+        user = User.objects.create_user(email='owner@test.com', password='Pass1234!', role='owner')
+        self.item = Inventory.objects.create(
+            owner=Owner.objects.create(user=user, full_name='Тест Владелец'),
+            category=SportCategory.objects.create(name='Лыжи'),
+            name='Лыжи', description='Описание', price_per_day=Decimal('500.00'),
+            status='available', condition='new',
+        )
+
+    def test_codes_stored_as_numbers(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT status, condition FROM inventory')
+            self.assertEqual(cursor.fetchone(), (2, 0))
+
+        item = Inventory.objects.get(pk=self.item.pk)
+        self.assertEqual((item.status, item.get_status_display()), ('available', 'Доступен'))
+        self.assertEqual(list(Inventory.objects.values_list('condition', flat=True)), ['new'])
+
+    def test_filters_by_code(self):
+        self.assertTrue(Inventory.objects.filter(status__in=['available', 'rented']).exists())
+        self.assertFalse(Inventory.objects.filter(status='rented').exists())
+        self.assertFalse(Inventory.objects.filter(status='unknown').exists())
+
+
+class SessionRefreshMiddlewareTest(TestCase):
+    """Повторный запрос в тот же день не переписывает django_session."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='client@test.com', password='Pass1234!', role='client')
+
+    def test_session_saved_once_a_day(self):
+        self.client.force_login(self.user)
+
+        self.client.get('/')
+        self.assertEqual(
+            self.client.session[SESSION_REFRESHED_KEY], timezone.localdate().isoformat()
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/')
+        session_writes = [q['sql'] for q in ctx.captured_queries if 'django_session' in q['sql']
+                          and not q['sql'].startswith('SELECT')]
+        self.assertEqual(session_writes, [])
+
+    async def test_async_stack_refreshes_session(self):
+        await self.async_client.aforce_login(self.user)
+
+        await self.async_client.get('/')
+        session = await self.async_client.asession()
+        self.assertEqual(await session.aget(SESSION_REFRESHED_KEY), timezone.localdate().isoformat())
@@ -21,6 +21,10 @@ from datetime import datetime
 # Шрифт с поддержкой кириллицы для PDF
 _PDF_CYRILLIC_FONT = None
 
+# Размер порции при потоковом чтении выгрузок: в памяти держим не больше
+# EXPORT_CHUNK_SIZE моделей, а не весь queryset (на Postgres — серверный курсор)
+EXPORT_CHUNK_SIZE = 500
+
 
 def _get_pdf_cyrillic_font():
     """
@@ -93,7 +97,7 @@ def export_inventory_to_xlsx(inventory_qs):
         cell.alignment = Alignment(horizontal='center', vertical='center')
 
     # Данные
-    for item in inventory_qs:
+    for item in inventory_qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
         ws.append([
             item.name,
             item.category.name,
@@ -156,7 +160,7 @@ def export_rentals_to_xlsx(rentals_qs):
         cell.alignment = Alignment(horizontal='center', vertical='center')
 
     # Данные
-    for rental in rentals_qs:
+    for rental in rentals_qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
         ws.append([
             str(rental.rental_id)[:8],
             rental.inventory.name,
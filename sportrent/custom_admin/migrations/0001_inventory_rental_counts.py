@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Материализованное представление с уникальным индексом (нужен для REFRESH ... CONCURRENTLY)
+CREATE_RENTAL_COUNTS_VIEW = """
+CREATE MATERIALIZED VIEW inventory_rental_counts AS
+    SELECT inventory_id, COUNT(*) AS rental_count FROM rentals GROUP BY inventory_id;
+CREATE UNIQUE INDEX inventory_rental_counts_pk ON inventory_rental_counts (inventory_id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('inventory', '0010_admin_list_indexes'),
+        ('rentals', '0012_revenuecounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryRentalCount',
+            fields=[
+                ('inventory', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='rental_count_row', serialize=False, to='inventory.inventory', verbose_name='Инвентарь')),
+                ('rental_count', models.IntegerField(verbose_name='Количество аренд')),
+            ],
+            options={
+                'verbose_name': 'Количество аренд инвентаря',
+                'verbose_name_plural': 'Количество аренд инвентаря',
+                'db_table': 'inventory_rental_counts',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            CREATE_RENTAL_COUNTS_VIEW,
+            'DROP MATERIALIZED VIEW IF EXISTS inventory_rental_counts;',
+        ),
+    ]
@@ -1,3 +1,36 @@
+"""
+Модели-витрины для административной панели.
+
+Что здесь:
+- InventoryRentalCount: число аренд по каждому инвентарю. Неуправляемая модель поверх
+  материализованного представления inventory_rental_counts (PostgreSQL); обновляется
+  командой refresh_rental_counts, а не на каждый запрос дашборда.
+
+Связано с:
+- custom_admin/views.py: admin_dashboard — блок «Топ инвентаря»
+- core/management/commands/refresh_rental_counts.py: REFRESH MATERIALIZED VIEW
+
+Ключевые слова: дашборд, топ инвентаря, материализованное представление
+"""
+
 from django.db import models
 
-# Create your models here.
+
+class InventoryRentalCount(models.Model):
+    """Количество аренд инвентаря (строка материализованного представления)."""
+
+    inventory = models.OneToOneField(
+        'inventory.Inventory',
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_constraint=False,
+        related_name='rental_count_row',
+        verbose_name='Инвентарь',
+    )
+    rental_count = models.IntegerField(verbose_name='Количество аренд')
+
+    class Meta:
+        managed = False
+        db_table = 'inventory_rental_counts'
+        verbose_name = 'Количество аренд инвентаря'
+        verbose_name_plural = 'Количество аренд инвентаря'
@@ -1,3 +1,33 @@
+"""
+Тесты для приложения custom_admin.
+Проверяет, что списки пользователей отвечают 304 по ETag, пока таблица не менялась,
+и перепроверяются браузером при каждом заходе (no-cache).
+"""
+
 from django.test import TestCase
+from django.urls import reverse
+
+from users.models import User, Manager
+
+
+class AdminListETagTest(TestCase):
+    """Повторный GET со старым ETag не рендерит страницу, изменение данных сбрасывает ETag."""
+
+    def setUp(self):
+        user = User.objects.create_user(email='manager@test.com', password='Pass1234!', role='manager')
+        Manager.objects.create(user=user, full_name='Тест Менеджер')
+        self.client.force_login(user)
+        self.user = user
+
+    def test_not_modified_until_users_change(self):
+        url = reverse('custom_admin:users')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        # Без max-age: после POST-редиректа браузер перепроверяет список по ETag, а не показывает старый
+        self.assertIn('no-cache', response['Cache-Control'])
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
 
-# Create your tests here.
+        User.objects.create_user(email='new@test.com', password='Pass1234!', role='client')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -18,28 +18,54 @@
 - inventory/models.py: Inventory — модерация и экспорт
 - payments/models.py: PaymentIntent — журнал платежей ЮКассы
 - core/utils.py: функции экспорта XLSX/PDF (DejaVuSans для кириллицы)
+- core/services/dashboard.py: dashboard_stats() — кэшируемые счётчики дашборда и PDF-статистики
 
 Ключевые слова: админ-панель, статистика, модерация, реестр паспортов, 152-ФЗ, экспорт
 """
 
 import logging
-from datetime import datetime, timedelta
+import re
+from decimal import Decimal
+from io import BytesIO
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Count, Sum, Avg, Q
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, Max, Q, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.paginator import Paginator
+from django.http import HttpResponse
 from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
 
-from users.models import User, Client, Owner, Manager
+from users.models import User, Owner
 from users.decorators import role_required
 from inventory.models import Inventory, SportCategory
-from rentals.models import Rental, Payment
-from reviews.models import Review
+from inventory.services.categories import get_cached_categories
+from rentals.models import Rental
+from payments.models import PaymentIntent
+from core.services.dashboard import dashboard_stats
+from .models import InventoryRentalCount
 
 logger = logging.getLogger('custom_admin')
 
 
+def _list_etag(model):
+    """
+    ETag для списков админки: пользователь + MAX(updated_date) и COUNT(*) таблицы.
+    COUNT ловит удаления, id пользователя — разную разметку для manager/administrator.
+    Пока в сессии висят flash-сообщения, ETag не отдаём: 304 их бы «проглотил».
+    """
+    def etag_func(request, *args, **kwargs):
+        if len(messages.get_messages(request)):
+            return None
+        stats = model.objects.aggregate(last=Max('updated_date'), total=Count('pk'))
+        last = stats['last'].timestamp() if stats['last'] else 0
+        return f'{request.user.pk}-{last}-{stats["total"]}'
+    return etag_func
+
+
 @login_required
 @role_required('manager', 'administrator')
 def admin_dashboard(request):
@@ -49,35 +75,13 @@ def admin_dashboard(request):
     if user.role == 'manager' and hasattr(user, 'manager_profile'):
         manager_profile = user.manager_profile
 
-    # Базовая статистика
-    total_users = User.objects.count()
-    total_clients = Client.objects.count()
-    total_owners = Owner.objects.count()
-    total_inventory = Inventory.objects.count()
-    available_inventory = Inventory.objects.filter(status='available').count()
-    pending_inventory = Inventory.objects.filter(status='pending').count()
+    # Счётчики — общий кэшируемый хелпер (его же использует export_stats_pdf)
+    stats = dashboard_stats(manager_profile)
 
     rentals_scope = Rental.objects.all()
     if manager_profile and not manager_profile.is_super_manager:
         rentals_scope = rentals_scope.filter(manager=manager_profile)
 
-    total_rentals = rentals_scope.count()
-    active_rentals = rentals_scope.filter(status='active').count()
-    pending_rentals = rentals_scope.filter(status='pending').count()
-    completed_rentals = rentals_scope.filter(status='completed').count()
-
-    pending_reviews = Review.objects.filter(status='pending').count()
-
-    # Финансовая статистика
-    total_revenue = Payment.objects.filter(status='completed').aggregate(
-        total=Sum('amount')
-    )['total'] or 0
-
-    # Статистика за последний месяц
-    last_month = timezone.now() - timedelta(days=30)
-    new_users_month = User.objects.filter(registration_date__gte=last_month).count()
-    new_rentals_month = rentals_scope.filter(created_date__gte=last_month).count()
-
     # Популярные категории
     popular_categories = SportCategory.objects.annotate(
         total_items=Count('items'),
@@ -85,10 +89,15 @@ def admin_dashboard(request):
     ).order_by('-total_rentals')[:5]
 
     # Топ инвентаря
+    # Счётчики берутся из материализованного представления (refresh_rental_counts),
+    # а не из COUNT по всей таблице rentals на каждый заход.
+    rental_counts = InventoryRentalCount.objects.filter(
+        inventory_id=OuterRef('pk')
+    ).values('rental_count')[:1]
     top_inventory = Inventory.objects.filter(
         status='available'
-    ).annotate(
-        rental_count=Count('rentals')
+    ).select_related('category').annotate(
+        rental_count=Coalesce(Subquery(rental_counts), 0)
     ).order_by('-rental_count')[:5]
 
     # Недавняя активность
@@ -97,20 +106,7 @@ def admin_dashboard(request):
     ).order_by('-created_date')[:10]
 
     context = {
-        'total_users': total_users,
-        'total_clients': total_clients,
-        'total_owners': total_owners,
-        'total_inventory': total_inventory,
-        'available_inventory': available_inventory,
-        'pending_inventory': pending_inventory,
-        'total_rentals': total_rentals,
-        'active_rentals': active_rentals,
-        'pending_rentals': pending_rentals,
-        'completed_rentals': completed_rentals,
-        'pending_reviews': pending_reviews,
-        'total_revenue': total_revenue,
-        'new_users_month': new_users_month,
-        'new_rentals_month': new_rentals_month,
+        **stats,
         'popular_categories': popular_categories,
         'top_inventory': top_inventory,
         'recent_rentals': recent_rentals,
@@ -121,6 +117,8 @@ def admin_dashboard(request):
 
 @login_required
 @role_required('manager', 'administrator')
+@cache_control(private=True, no_cache=True)
+@etag(_list_etag(User))
 def admin_users(request):
     """Управление пользователями."""
 
@@ -195,7 +193,7 @@ def admin_user_block(request, user_id):
         user.block_reason = reason
         user.save()
 
-        logger.info(f'Пользователь заблокирован: {user.email}, причина: {reason}, администратор {request.user.email}')
+        logger.info('Пользователь заблокирован: %s, причина: %s, администратор %s', user.email, reason, request.user.email)
         messages.success(request, f'Пользователь {user.email} заблокирован')
 
     return redirect('custom_admin:users')
@@ -217,7 +215,7 @@ def admin_user_unblock(request, user_id):
         user.block_reason = ''
         user.save()
 
-        logger.info(f'Пользователь разблокирован: {user.email} администратором {request.user.email}')
+        logger.info('Пользователь разблокирован: %s администратором %s', user.email, request.user.email)
         messages.success(request, f'Пользователь {user.email} разблокирован')
 
     return redirect('custom_admin:users')
@@ -225,6 +223,8 @@ def admin_user_unblock(request, user_id):
 
 @login_required
 @role_required('manager', 'administrator')
+@cache_control(private=True, no_cache=True)
+@etag(_list_etag(Inventory))
 def admin_inventory(request):
     """Управление инвентарем (для менеджеров)."""
 
@@ -254,7 +254,7 @@ def admin_inventory(request):
     page_number = request.GET.get('page', 1)
     page_obj = paginator.get_page(page_number)
 
-    categories = SportCategory.objects.all()
+    categories = get_cached_categories()
 
     context = {
         'page_obj': page_obj,
@@ -313,7 +313,6 @@ def admin_inventory_approve(request, pk):
         return redirect('custom_admin:inventory')
 
     if request.method == 'POST':
-        from decimal import Decimal
         deposit_amount = request.POST.get('deposit_amount', 0)
         try:
             deposit_amount = Decimal(str(deposit_amount)) if deposit_amount else Decimal('0')
@@ -328,12 +327,11 @@ def admin_inventory_approve(request, pk):
         inventory.save()
 
         # Менеджер заполняет адрес и телефон точки выдачи
-        import re as _re
         pickup_address = request.POST.get('pickup_address', '').strip()
         pickup_phone = request.POST.get('pickup_phone', '').strip()
         # Нормализуем телефон к E.164: снимаем скобки/дефисы, добавляем +7
         if pickup_phone:
-            digits = _re.sub(r'\D', '', pickup_phone)
+            digits = re.sub(r'\D', '', pickup_phone)
             if len(digits) == 11 and digits[0] in ('7', '8'):
                 pickup_phone = '+7' + digits[1:]
             elif len(digits) == 10:
@@ -345,7 +343,7 @@ def admin_inventory_approve(request, pk):
             pp.name = f'{pp.city.name} — {inventory.owner.full_name}'
             pp.save(update_fields=['address', 'phone', 'name'])
 
-        logger.info(f'Инвентарь одобрен: {inventory.name}, залог {deposit_amount} менеджером {request.user.email}')
+        logger.info('Инвентарь одобрен: %s, залог %s менеджером %s', inventory.name, deposit_amount, request.user.email)
         messages.success(request, 'Инвентарь одобрен. Ожидается подписание договора.')
 
     return redirect('custom_admin:inventory')
@@ -372,7 +370,7 @@ def admin_inventory_reject(request, pk):
         inventory.rejection_reason = reason
         inventory.save()
 
-        logger.info(f'Инвентарь отклонен: {inventory.name} причина: {reason}')
+        logger.info('Инвентарь отклонен: %s причина: %s', inventory.name, reason)
         messages.info(request, 'Инвентарь отклонен')
 
     return redirect('custom_admin:inventory')
@@ -402,7 +400,7 @@ def admin_inventory_publish(request, pk):
         inventory.status = 'available'
         inventory.save()
 
-        logger.info(f'Инвентарь опубликован в каталоге: {inventory.name} менеджером {request.user.email}')
+        logger.info('Инвентарь опубликован в каталоге: %s менеджером %s', inventory.name, request.user.email)
         messages.success(request, 'Инвентарь опубликован в каталоге')
 
     return redirect('custom_admin:inventory')
@@ -482,8 +480,6 @@ def inventory_contract_download(request, pk):
 
     try:
         from contracts.generator import generate_owner_contract
-        from io import BytesIO
-        from django.http import HttpResponse
 
         document = generate_owner_contract(
             contract_city=contract_city,
@@ -510,7 +506,7 @@ def inventory_contract_download(request, pk):
         return response
 
     except Exception as e:
-        logger.error(f'Ошибка при генерации договора: {str(e)}', exc_info=True)
+        logger.error('Ошибка при генерации договора: %s', e, exc_info=True)
         messages.error(request, 'Не удалось сформировать договор. Обратитесь к администратору.')
         return redirect('custom_admin:inventory_pending_detail', pk=pk)
 
@@ -525,7 +521,10 @@ def export_inventory_xlsx(request):
         messages.error(request, 'Модуль экспорта не найден. Создайте файл core/utils.py')
         return redirect('custom_admin:dashboard')
 
-    inventory_qs = Inventory.objects.select_related('category', 'owner').all()
+    inventory_qs = Inventory.objects.select_related('category').only(
+        'name', 'brand', 'model', 'condition', 'price_per_day', 'status',
+        'avg_rating', 'total_rentals', 'category__name',
+    )
 
     # Применяем фильтры из GET параметров
     status = request.GET.get('status')
@@ -564,7 +563,10 @@ def export_rentals_xlsx(request):
         messages.error(request, 'Модуль экспорта не найден. Создайте файл core/utils.py')
         return redirect('custom_admin:dashboard')
 
-    rentals_qs = Rental.objects.select_related('inventory', 'client').all()
+    rentals_qs = Rental.objects.select_related('inventory', 'client').only(
+        'rental_id', 'start_date', 'end_date', 'total_price', 'status',
+        'inventory__name', 'client__full_name',
+    )
 
     status = request.GET.get('status')
     if status:
@@ -583,19 +585,8 @@ def export_stats_pdf(request):
         messages.error(request, 'Модуль экспорта не найден. Создайте файл core/utils.py')
         return redirect('custom_admin:dashboard')
 
-    stats_data = {
-        'total_users': User.objects.count(),
-        'total_clients': Client.objects.count(),
-        'total_owners': Owner.objects.count(),
-        'total_inventory': Inventory.objects.count(),
-        'available_inventory': Inventory.objects.filter(status='available').count(),
-        'total_rentals': Rental.objects.count(),
-        'active_rentals': Rental.objects.filter(status='active').count(),
-        'completed_rentals': Rental.objects.filter(status='completed').count(),
-        'total_revenue': Payment.objects.filter(status='completed').aggregate(
-            total=Sum('amount')
-        )['total'] or 0,
-    }
+    # Те же кэшированные цифры, что и на дашборде (по всей системе)
+    stats_data = dashboard_stats()
 
     return export_stats_to_pdf(stats_data)
 
@@ -606,8 +597,6 @@ def owner_passport_registry(request):
     Реестр паспортных данных владельцев — только для администратора.
     Принцип минимальных привилегий (152-ФЗ): super_manager не имеет доступа.
     """
-    from django.core.exceptions import PermissionDenied
-
     if not (request.user.is_superuser or request.user.role == 'administrator'):
         raise PermissionDenied
 
@@ -636,15 +625,13 @@ def owner_passport_registry(request):
     }
     return render(request, 'custom_admin/owner_passport_registry.html', context)
 
+
 @login_required
 def admin_payments(request):
     """Список PaymentIntent — только для administrator."""
-    from django.core.exceptions import PermissionDenied
     if request.user.role != 'administrator':
         raise PermissionDenied
 
-    from payments.models import PaymentIntent
-
     qs = PaymentIntent.objects.select_related(
         'rental__inventory', 'rental__client__user', 'user'
     ).order_by('-created_at')
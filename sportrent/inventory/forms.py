@@ -3,8 +3,10 @@
 """
 
 from django import forms
-from django.forms import inlineformset_factory
+from django.db import transaction
+from django.forms import BaseInlineFormSet, inlineformset_factory
 from .models import Inventory, InventoryPhoto, SportCategory
+from .services.images import generate_photo_variants
 from users.models import BankAccount
 
 
@@ -101,11 +103,71 @@ class InventoryPhotoForm(forms.ModelForm):
         }
 
 
+class BaseInventoryPhotoFormSet(BaseInlineFormSet):
+    """Формсет фотографий с пакетной обработкой флага «основное фото»."""
+
+    def save_photos(self, inventory):
+        """
+        Сохраняет фото формсета для инвентаря пакетно: удаления — одним DELETE,
+        новые фото — одним bulk_create, правки существующих — одним bulk_update.
+        Если отмечено несколько основных фото, основным остаётся последнее; флаг is_main
+        у остальных сбрасывается одним UPDATE до вставки (индекс inventory_photos_one_main).
+        WebP-варианты для новых и заменённых файлов готовятся после коммита внешней
+        транзакции (transaction.on_commit), чтобы работа Pillow не держала её открытой.
+        """
+        delete_ids = []
+        new_photos = []
+        changed_photos = []
+        replaced_files = []
+        for photo_form in self.forms:
+            if not photo_form.cleaned_data:
+                continue
+            if photo_form.cleaned_data.get('DELETE'):
+                if not photo_form.instance._state.adding:
+                    delete_ids.append(photo_form.instance.pk)
+                continue
+            photo = photo_form.save(commit=False)
+            photo.inventory = inventory
+            if photo._state.adding:
+                new_photos.append(photo)
+            elif 'photo_url' in photo_form.changed_data:
+                # Новый файл нужно сохранить в хранилище — bulk_update этого не делает
+                replaced_files.append(photo)
+            elif photo_form.has_changed():
+                changed_photos.append(photo)
+
+        photos = new_photos + replaced_files + changed_photos
+        main_photo = next((photo for photo in reversed(photos) if photo.is_main), None)
+
+        with transaction.atomic():
+            if delete_ids:
+                InventoryPhoto.objects.filter(pk__in=delete_ids).delete()
+            if main_photo is not None:
+                for photo in photos:
+                    if photo is not main_photo:
+                        photo.is_main = False
+                InventoryPhoto.objects.filter(
+                    inventory=inventory, is_main=True
+                ).exclude(pk=main_photo.pk).update(is_main=False)
+
+            if changed_photos:
+                InventoryPhoto.objects.bulk_update(changed_photos, ['is_main', 'description'])
+            for photo in replaced_files:
+                photo.save(reset_main=False)
+            if new_photos:
+                InventoryPhoto.objects.bulk_create(new_photos)
+        uploaded = new_photos + replaced_files
+        if uploaded:
+            transaction.on_commit(lambda: generate_photo_variants(uploaded))
+        return photos
+
+
 # Formset для множественной загрузки фотографий
 InventoryPhotoFormSet = inlineformset_factory(
     Inventory,
     InventoryPhoto,
     form=InventoryPhotoForm,
+    formset=BaseInventoryPhotoFormSet,
     extra=3,
     max_num=10,
     can_delete=True,
@@ -114,10 +176,23 @@ InventoryPhotoFormSet = inlineformset_factory(
 
 
 class InventoryFilterForm(forms.Form):
-    """Форма для фильтрации инвентаря."""
+    """
+    Фильтры каталога (GET-параметры inventory_list).
+    Невалидные значения (например, min_price=abc) отбрасываются, а не уходят в БД;
+    валидные собираются в один словарь для одного .filter(**kwargs).
+    """
+
+    SORT_ORDERING = {
+        'price_asc': 'price_per_day',
+        'price_desc': '-price_per_day',
+        'name': 'name',
+        'newest': '-added_date',
+        'rating': '-avg_rating',
+    }
 
     search = forms.CharField(
         required=False,
+        max_length=200,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
             'placeholder': 'Поиск по названию, бренду...'
@@ -140,6 +215,8 @@ class InventoryFilterForm(forms.Form):
     min_price = forms.DecimalField(
         required=False,
         min_value=0,
+        max_digits=10,
+        decimal_places=2,
         widget=forms.NumberInput(attrs={
             'class': 'form-control',
             'placeholder': 'От',
@@ -150,6 +227,8 @@ class InventoryFilterForm(forms.Form):
     max_price = forms.DecimalField(
         required=False,
         min_value=0,
+        max_digits=10,
+        decimal_places=2,
         widget=forms.NumberInput(attrs={
             'class': 'form-control',
             'placeholder': 'До',
@@ -167,4 +246,33 @@ class InventoryFilterForm(forms.Form):
         ],
         required=False,
         widget=forms.Select(attrs={'class': 'form-select'})
-    )
\ No newline at end of file
+    )
+
+    def _valid(self, name):
+        if not hasattr(self, 'cleaned_data'):
+            self.is_valid()
+        return self.cleaned_data.get(name)
+
+    def filter_kwargs(self):
+        """Аргументы для Inventory.objects.filter() по валидным полям фильтра."""
+        lookups = {
+            'category': 'category_id',
+            'condition': 'condition',
+            'min_price': 'price_per_day__gte',
+            'max_price': 'price_per_day__lte',
+        }
+        filters = {}
+        for name, lookup in lookups.items():
+            value = self._valid(name)
+            # ModelChoiceField отдаёт объект категории — в фильтр идёт его pk
+            value = getattr(value, 'pk', value)
+            if value not in (None, ''):
+                filters[lookup] = value
+        return filters
+
+    def search_query(self):
+        return self._valid('search') or ''
+
+    def ordering(self):
+        """Поле сортировки или None (порядок модели по умолчанию)."""
+        return self.SORT_ORDERING.get(self._valid('sort'))
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+def keep_latest_main_photo(apps, schema_editor):
+    """Перед созданием индекса оставляет одно основное фото — последнее загруженное."""
+    InventoryPhoto = apps.get_model('inventory', 'InventoryPhoto')
+    seen = set()
+    duplicates = []
+    for photo_id, inventory_id in InventoryPhoto.objects.filter(
+        is_main=True
+    ).order_by('inventory_id', '-uploaded_date').values_list('photo_id', 'inventory_id'):
+        if inventory_id in seen:
+            duplicates.append(photo_id)
+        else:
+            seen.add(inventory_id)
+    if duplicates:
+        InventoryPhoto.objects.filter(photo_id__in=duplicates).update(is_main=False)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_inventory_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_main_photo, noop),
+        # Частичный уникальный индекс: не более одного основного фото на инвентарь
+        migrations.RunSQL(
+            'CREATE UNIQUE INDEX inventory_photos_one_main ON inventory_photos (inventory_id) WHERE is_main;',
+            'DROP INDEX IF EXISTS inventory_photos_one_main;',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_inventoryphoto_one_main_index'),
+        ('users', '0010_owner_passport_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(fields=['status', '-added_date'], name='inv_status_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(fields=['category', 'status', '-added_date'], name='inv_cat_status_added_idx'),
+        ),
+    ]
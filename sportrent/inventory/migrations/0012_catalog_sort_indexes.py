@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0011_updated_date'),
+        ('users', '0012_updated_date'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='inventory',
+            name='inventory_status_97306c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(fields=['status', '-avg_rating'], name='inv_status_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(fields=['status', 'price_per_day'], name='inv_status_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(fields=['status', 'category', 'price_per_day'], name='inv_status_cat_price_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+# Поля поиска каталога (inventory_list) и админ-списка инвентаря
+SEARCH_COLUMNS = ('name', 'brand', 'model', 'description')
+
+# icontains на PostgreSQL компилируется в UPPER(col::text) LIKE UPPER('%q%'):
+# триграммный GIN-индекс по тому же выражению превращает seq scan в index scan.
+CREATE_TRGM_INDEXES = ['CREATE EXTENSION IF NOT EXISTS pg_trgm;'] + [
+    f'CREATE INDEX IF NOT EXISTS inventory_{column}_trgm ON inventory '
+    f'USING gin ((UPPER({column}::text)) gin_trgm_ops);'
+    for column in SEARCH_COLUMNS
+]
+DROP_TRGM_INDEXES = [f'DROP INDEX IF EXISTS inventory_{column}_trgm;' for column in SEARCH_COLUMNS]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0012_catalog_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRGM_INDEXES, DROP_TRGM_INDEXES),
+    ]
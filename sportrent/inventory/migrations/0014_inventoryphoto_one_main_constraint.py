@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0013_inventory_search_trgm_indexes'),
+    ]
+
+    operations = [
+        # Частичный уникальный индекс уже создан в 0009 — регистрируем его только в состоянии моделей
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='inventoryphoto',
+                    constraint=models.UniqueConstraint(
+                        condition=models.Q(is_main=True),
+                        fields=('inventory',),
+                        name='inventory_photos_one_main',
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:42
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0014_inventoryphoto_one_main_constraint'),
+    ]
+
+    operations = [
+        # default — только Python-сторона (uuid7 вместо uuid4), в БД менять нечего
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='favorite',
+                    name='favorite_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='inventory',
+                    name='inventory_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='inventoryphoto',
+                    name='photo_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='sportcategory',
+                    name='category_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
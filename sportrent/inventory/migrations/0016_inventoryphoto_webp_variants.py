@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0015_time_ordered_uuid_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventoryphoto',
+            name='card_image',
+            field=models.ImageField(blank=True, upload_to='inventory_photos/variants/', verbose_name='Для карточки (WebP)'),
+        ),
+        migrations.AddField(
+            model_name='inventoryphoto',
+            name='detail_image',
+            field=models.ImageField(blank=True, upload_to='inventory_photos/variants/', verbose_name='Для страницы (WebP)'),
+        ),
+        migrations.AddField(
+            model_name='inventoryphoto',
+            name='thumbnail',
+            field=models.ImageField(blank=True, upload_to='inventory_photos/variants/', verbose_name='Миниатюра (WebP)'),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:52
+
+import core.fields
+from django.db import migrations, models
+
+# Копия Inventory.STATUS_DB_CODES / CONDITION_DB_CODES на момент миграции
+STATUS_DB_CODES = {
+    'pending': 0,
+    'awaiting_contract': 1,
+    'available': 2,
+    'rented': 3,
+    'maintenance': 4,
+    'rejected': 5,
+}
+CONDITION_DB_CODES = {
+    'new': 0,
+    'excellent': 1,
+    'good': 2,
+    'fair': 3,
+}
+
+STATUS_CHOICES = [
+    ('pending', 'Ожидает проверки'),
+    ('awaiting_contract', 'Принят и ожидается подписание договора'),
+    ('available', 'Доступен'),
+    ('rented', 'Арендован'),
+    ('maintenance', 'На обслуживании'),
+    ('rejected', 'Отклонен'),
+]
+CONDITION_CHOICES = [
+    ('new', 'Новое'),
+    ('excellent', 'Отличное'),
+    ('good', 'Хорошее'),
+    ('fair', 'Удовлетворительное'),
+]
+
+# Индексы, в которые входит status: пересоздаются поверх нового smallint-столбца
+STATUS_INDEXES = [
+    models.Index(fields=['owner', 'status'], name='inventory_owner_i_7e0d46_idx'),
+    models.Index(fields=['status', '-added_date'], name='inv_status_added_idx'),
+    models.Index(fields=['category', 'status', '-added_date'], name='inv_cat_status_added_idx'),
+    models.Index(fields=['status', '-avg_rating'], name='inv_status_rating_idx'),
+    models.Index(fields=['status', 'price_per_day'], name='inv_status_price_idx'),
+    models.Index(fields=['status', 'category', 'price_per_day'], name='inv_status_cat_price_idx'),
+]
+
+
+def _case(field, mapping):
+    return models.Case(
+        *[models.When(models.Q(**{field: key}), then=models.Value(value)) for key, value in mapping.items()],
+        default=models.Value(None),
+    )
+
+
+def codes_to_numbers(apps, schema_editor):
+    Inventory = apps.get_model('inventory', 'Inventory')
+    Inventory.objects.update(
+        status_code=_case('status', STATUS_DB_CODES),
+        condition_code=_case('condition', CONDITION_DB_CODES),
+    )
+
+
+def numbers_to_codes(apps, schema_editor):
+    Inventory = apps.get_model('inventory', 'Inventory')
+    Inventory.objects.update(
+        status=_case('status_code', {value: key for key, value in STATUS_DB_CODES.items()}),
+        condition=_case('condition_code', {value: key for key, value in CONDITION_DB_CODES.items()}),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0016_inventoryphoto_webp_variants'),
+    ]
+
+    operations = [
+        *[
+            migrations.RemoveIndex(model_name='inventory', name=index.name)
+            for index in STATUS_INDEXES
+        ],
+        migrations.AddField(
+            model_name='inventory',
+            name='status_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='inventory',
+            name='condition_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.RunPython(codes_to_numbers, numbers_to_codes),
+        migrations.RemoveField(
+            model_name='inventory',
+            name='status',
+        ),
+        migrations.RemoveField(
+            model_name='inventory',
+            name='condition',
+        ),
+        migrations.RenameField(
+            model_name='inventory',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.RenameField(
+            model_name='inventory',
+            old_name='condition_code',
+            new_name='condition',
+        ),
+        migrations.AlterField(
+            model_name='inventory',
+            name='condition',
+            field=core.fields.SmallIntChoicesField(choices=CONDITION_CHOICES, codes=CONDITION_DB_CODES, default='good', verbose_name='Состояние'),
+        ),
+        migrations.AlterField(
+            model_name='inventory',
+            name='status',
+            field=core.fields.SmallIntChoicesField(choices=STATUS_CHOICES, codes=STATUS_DB_CODES, default='pending', verbose_name='Статус'),
+        ),
+        *[
+            migrations.AddIndex(model_name='inventory', index=index)
+            for index in STATUS_INDEXES
+        ],
+    ]
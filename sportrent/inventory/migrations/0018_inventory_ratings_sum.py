@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:12
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings_sum(apps, schema_editor):
+    # Сумма оценок опубликованных отзывов на инвентарь — одним UPDATE с подзапросом
+    Inventory = apps.get_model('inventory', 'Inventory')
+    Review = apps.get_model('reviews', 'Review')
+    ratings = Review.objects.filter(
+        reviewed_id=models.OuterRef('inventory_id'),
+        target_type='inventory',
+        status='published',
+    ).order_by().values('reviewed_id').annotate(total=models.Sum('rating')).values('total')
+    Inventory.objects.update(ratings_sum=Coalesce(models.Subquery(ratings), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0017_inventory_status_condition_smallint'),
+        ('reviews', '0003_review_date_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventory',
+            name='ratings_sum',
+            field=models.IntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings_sum, migrations.RunPython.noop),
+    ]
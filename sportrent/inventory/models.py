@@ -3,10 +3,12 @@
 """
 
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from users.models import Manager, Client, BankAccount, Owner
+from core.fields import SmallIntChoicesField
+from core.ids import uuid7
 
 
 class City(models.Model):
@@ -60,7 +62,7 @@ class PickupPoint(models.Model):
 class SportCategory(models.Model):
     """Категории спортивного инвентаря."""
 
-    category_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    category_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(max_length=100, unique=True, verbose_name='Название категории')
     description = models.TextField(blank=True, verbose_name='Описание')
     icon = models.CharField(max_length=50, blank=True, help_text='CSS класс иконки', verbose_name='Иконка')
@@ -94,7 +96,23 @@ class Inventory(models.Model):
         ('fair', 'Удовлетворительное'),
     ]
 
-    inventory_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Числа, под которыми коды status/condition хранятся в БД (smallint); только дополнять
+    STATUS_DB_CODES = {
+        'pending': 0,
+        'awaiting_contract': 1,
+        'available': 2,
+        'rented': 3,
+        'maintenance': 4,
+        'rejected': 5,
+    }
+    CONDITION_DB_CODES = {
+        'new': 0,
+        'excellent': 1,
+        'good': 2,
+        'fair': 3,
+    }
+
+    inventory_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     owner = models.ForeignKey(Owner, on_delete=models.CASCADE, related_name='inventory_items', verbose_name='Владелец')
     manager = models.ForeignKey(Manager, on_delete=models.SET_NULL, null=True, blank=True, related_name='managed_items', verbose_name='Менеджер')
     category = models.ForeignKey(SportCategory, on_delete=models.PROTECT, related_name='items', verbose_name='Категория')
@@ -112,15 +130,22 @@ class Inventory(models.Model):
     )
 
     price_per_day = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)], verbose_name='Цена за день')
-    condition = models.CharField(max_length=50, choices=CONDITION_CHOICES, default='good', verbose_name='Состояние')
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='Статус')
+    condition = SmallIntChoicesField(
+        codes=CONDITION_DB_CODES, choices=CONDITION_CHOICES, default='good', verbose_name='Состояние'
+    )
+    status = SmallIntChoicesField(
+        codes=STATUS_DB_CODES, choices=STATUS_CHOICES, default='pending', verbose_name='Статус'
+    )
 
     added_date = models.DateTimeField(default=timezone.now, verbose_name='Дата добавления')
+    updated_date = models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата изменения')
     avg_rating = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True, verbose_name='Средний рейтинг')
     total_rentals = models.IntegerField(default=0, verbose_name='Всего аренд')
 
-    # Кэшированное количество отзывов
+    # Кэшированное количество отзывов и сумма их оценок: avg_rating = ratings_sum / reviews_count
+    # пересчитывается сигналами reviews/signals.py приращением, без агрегата по всем отзывам
     reviews_count = models.IntegerField(default=0, verbose_name='Количество отзывов')
+    ratings_sum = models.IntegerField(default=0, verbose_name='Сумма оценок')
 
     # Дополнительные поля для условий аренды
     min_rental_days = models.IntegerField(default=1, validators=[MinValueValidator(1)], verbose_name='Минимум дней аренды')
@@ -146,8 +171,15 @@ class Inventory(models.Model):
         verbose_name_plural = 'Инвентарь'
         ordering = ['-added_date']
         indexes = [
-            models.Index(fields=['status', 'category']),
             models.Index(fields=['owner', 'status']),
+            # Админ-список: фильтр по статусу/категории + сортировка по дате без отдельной сортировки
+            models.Index(fields=['status', '-added_date'], name='inv_status_added_idx'),
+            models.Index(fields=['category', 'status', '-added_date'], name='inv_cat_status_added_idx'),
+            # Каталог: status='available' + сортировки «по рейтингу» / «по цене»;
+            # (status, category, price_per_day) заодно покрывает прежний индекс (status, category)
+            models.Index(fields=['status', '-avg_rating'], name='inv_status_rating_idx'),
+            models.Index(fields=['status', 'price_per_day'], name='inv_status_price_idx'),
+            models.Index(fields=['status', 'category', 'price_per_day'], name='inv_status_cat_price_idx'),
         ]
 
     def __str__(self):
@@ -157,11 +189,22 @@ class Inventory(models.Model):
         """Проверка доступности инвентаря."""
         return self.status == 'available'
 
+    @property
+    def card_image(self):
+        """
+        Картинка для карточки в списках: главное фото из Prefetch(to_attr='main_photos')
+        (WebP-вариант card_image, если готов), иначе поле image. Без префетча лишних запросов не делает.
+        """
+        main_photos = getattr(self, 'main_photos', None)
+        if main_photos:
+            return main_photos[0].card_image or main_photos[0].photo_url
+        return self.image
+
 
 class Favorite(models.Model):
     """Избранный инвентарь клиента."""
 
-    favorite_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    favorite_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='favorites', verbose_name='Клиент')
     inventory = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='favorited_by', verbose_name='Инвентарь')
     created_date = models.DateTimeField(auto_now_add=True, verbose_name='Дата добавления')
@@ -183,10 +226,14 @@ class Favorite(models.Model):
 class InventoryPhoto(models.Model):
     """Фотографии инвентаря."""
 
-    photo_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    photo_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     inventory = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='photos', verbose_name='Инвентарь')
 
     photo_url = models.ImageField(upload_to='inventory_photos/', verbose_name='Фотография')
+    # WebP-варианты для показа (inventory/services/images.py); пустые — показываем оригинал
+    thumbnail = models.ImageField(upload_to='inventory_photos/variants/', blank=True, verbose_name='Миниатюра (WebP)')
+    card_image = models.ImageField(upload_to='inventory_photos/variants/', blank=True, verbose_name='Для карточки (WebP)')
+    detail_image = models.ImageField(upload_to='inventory_photos/variants/', blank=True, verbose_name='Для страницы (WebP)')
     is_main = models.BooleanField(default=False, verbose_name='Основное фото')
     description = models.TextField(blank=True, verbose_name='Описание')
     uploaded_date = models.DateTimeField(default=timezone.now, verbose_name='Дата загрузки')
@@ -196,13 +243,43 @@ class InventoryPhoto(models.Model):
         verbose_name = 'Фотография инвентаря'
         verbose_name_plural = 'Фотографии инвентаря'
         ordering = ['-is_main', 'uploaded_date']
+        constraints = [
+            # Индекс создан миграцией 0009 (RunSQL), здесь он описан для Django
+            models.UniqueConstraint(
+                fields=['inventory'],
+                condition=models.Q(is_main=True),
+                name='inventory_photos_one_main',
+            ),
+        ]
 
     def __str__(self):
         return f"Фото {self.inventory.name}"
 
-    def save(self, *args, **kwargs):
-        """Обеспечивает наличие только одного основного фото."""
-        if self.is_main:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем, было ли фото основным при загрузке — чтобы не сбрасывать флаг повторно
+        instance._loaded_main_of = instance.__dict__.get('inventory_id') if instance.__dict__.get('is_main') else None
+        return instance
+
+    def save(self, *args, reset_main=True, **kwargs):
+        """
+        Обеспечивает наличие только одного основного фото.
+        Инвариант закреплён частичным уникальным индексом inventory_photos_one_main,
+        поэтому сброс флага у других фото и запись идут в одной транзакции.
+        reset_main=False — флаг уже сброшен вызывающим кодом (см. BaseInventoryPhotoFormSet).
+        Фото, которое уже было основным у этого инвентаря, сохраняется без лишнего UPDATE.
+        """
+        already_main = not self._state.adding and getattr(self, '_loaded_main_of', None) == self.inventory_id
+        if not (self.is_main and reset_main) or already_main:
+            super().save(*args, **kwargs)
+            self._loaded_main_of = self.inventory_id if self.is_main else None
+            return
+
+        with transaction.atomic():
             # Убираем флаг is_main у других фото этого инвентаря
-            InventoryPhoto.objects.filter(inventory=self.inventory, is_main=True).update(is_main=False)
-        super().save(*args, **kwargs)
\ No newline at end of file
+            InventoryPhoto.objects.filter(
+                inventory_id=self.inventory_id, is_main=True
+            ).exclude(pk=self.pk).update(is_main=False)
+            super().save(*args, **kwargs)
+        self._loaded_main_of = self.inventory_id
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Кэш справочника категорий для фильтров каталога.
+Категории меняются редко, поэтому список держим в кэше и сбрасываем сигналами
+(inventory/signals.py) при сохранении или удалении SportCategory.
+"""
+
+from django.core.cache import cache
+
+CATEGORIES_CACHE_KEY = 'inv:categories:v1'
+CATEGORIES_CACHE_TTL = 3600
+
+
+def get_cached_categories() -> list:
+    """Список категорий (id, название, иконка) для выпадающих фильтров."""
+    from inventory.models import SportCategory
+    return cache.get_or_set(
+        CATEGORIES_CACHE_KEY,
+        lambda: list(SportCategory.objects.only('category_id', 'name', 'icon')),
+        CATEGORIES_CACHE_TTL,
+    )
+
+
+def invalidate_categories_cache():
+    cache.delete(CATEGORIES_CACHE_KEY)
@@ -0,0 +1,61 @@
+"""
+Фасеты каталога: количество доступного инвентаря по категориям для текущих фильтров.
+
+Что здесь:
+- facets_signature(): детерминированный ключ набора фильтров (без page/sort/category)
+- get_catalog_facets(): {category_id: количество} одним GROUP BY, кэш на FACETS_CACHE_TTL
+- invalidate_catalog_facets(): сброс всех фасетов сменой версии ключа
+
+Фасет по категории считается без фильтра по самой категории — посетитель видит,
+сколько вещей в соседних категориях. Сумма по всем категориям — общее число
+результатов без выбранной категории, поэтому отдельный COUNT для пагинатора не нужен.
+
+Связано с:
+- inventory/views.py: inventory_list()
+- inventory/signals.py: сброс при сохранении/удалении Inventory
+
+Ключевые слова: фасеты, кэш, GROUP BY, каталог, фильтры
+"""
+
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db.models import Count
+
+FACETS_CACHE_TTL = 120
+FACETS_VERSION_KEY = 'inv:facets:version'
+
+# Параметры, не влияющие на фасеты по категориям
+_SIGNATURE_IGNORED = ('page', 'sort', 'category')
+
+
+def facets_signature(params, extra=()) -> str:
+    """Хэш параметров запроса; extra — то, что влияет на выборку помимо GET (например, координаты)."""
+    items = sorted(
+        (key, value) for key, value in params.items()
+        if key not in _SIGNATURE_IGNORED and value not in (None, '')
+    )
+    raw = urlencode(items + sorted(extra))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def get_catalog_facets(facet_qs, signature) -> dict:
+    """Количество записей facet_qs по category_id; повторные запросы с теми же фильтрами — из кэша."""
+    version = cache.get_or_set(FACETS_VERSION_KEY, time.time_ns, None)
+    return cache.get_or_set(
+        f'inv:list:{version}:{signature}',
+        lambda: dict(
+            facet_qs.order_by().values_list('category_id').annotate(c=Count('pk'))
+        ),
+        FACETS_CACHE_TTL,
+    )
+
+
+def invalidate_catalog_facets():
+    try:
+        cache.incr(FACETS_VERSION_KEY)
+    except ValueError:
+        # Версия вытеснена из кэша — начинаем с новой, не совпадающей со старыми ключами
+        cache.set(FACETS_VERSION_KEY, time.time_ns(), None)
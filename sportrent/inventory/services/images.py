@@ -0,0 +1,67 @@
+"""
+WebP-варианты фотографий инвентаря.
+Оригинал загрузки хранится как есть, а для показа один раз при загрузке готовятся
+уменьшенные копии: thumbnail (200px), card_image (600px) и detail_image (1600px).
+Каталог и карточки отдают card_image, страница инвентаря — detail_image.
+"""
+
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger('inventory')
+
+# Поле InventoryPhoto → максимальная сторона варианта, px
+PHOTO_VARIANTS = {
+    'thumbnail': 200,
+    'card_image': 600,
+    'detail_image': 1600,
+}
+WEBP_QUALITY = 80
+
+
+def _render_webp(image, size) -> ContentFile:
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.LANCZOS)
+    buffer = BytesIO()
+    variant.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=6)
+    return ContentFile(buffer.getvalue())
+
+
+def build_photo_variants(photo):
+    """Пересоздаёт WebP-варианты фото из photo_url (без сохранения модели)."""
+    with photo.photo_url.open('rb') as source:
+        image = Image.open(source)
+        # Поворот по EXIF, чтобы снимки с телефона не лежали на боку
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+    base_name = os.path.splitext(os.path.basename(photo.photo_url.name))[0]
+    for field_name, size in PHOTO_VARIANTS.items():
+        field_file = getattr(photo, field_name)
+        if field_file:
+            field_file.delete(save=False)
+        field_file.save(f'{base_name}_{size}.webp', _render_webp(image, size), save=False)
+
+
+def generate_photo_variants(photos):
+    """
+    Готовит варианты для списка сохранённых фото и записывает пути одним bulk_update.
+    Битый или неподдерживаемый файл не мешает остальным — фото показывается оригиналом.
+    """
+    from inventory.models import InventoryPhoto
+
+    processed = []
+    for photo in photos:
+        try:
+            build_photo_variants(photo)
+        except (OSError, ValueError) as exc:
+            logger.warning('Не удалось подготовить WebP для фото %s: %s', photo.pk, exc)
+            continue
+        processed.append(photo)
+    if processed:
+        InventoryPhoto.objects.bulk_update(processed, list(PHOTO_VARIANTS))
+    return processed
@@ -0,0 +1,26 @@
+"""
+Сигналы приложения inventory.
+Паттерн «Наблюдатель»: SportCategory (издатель) → сброс кэша списка категорий (подписчик);
+Inventory (издатель) → сброс кэша фасетов каталога (подписчик).
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Inventory, SportCategory
+from .services.categories import invalidate_categories_cache
+from .services.facets import invalidate_catalog_facets
+
+
+@receiver(post_save, sender=SportCategory)
+@receiver(post_delete, sender=SportCategory)
+def reset_categories_cache(sender, **kwargs):
+    """Категория добавлена, изменена или удалена — фильтры каталога перечитают список."""
+    invalidate_categories_cache()
+
+
+@receiver(post_save, sender=Inventory)
+@receiver(post_delete, sender=Inventory)
+def reset_catalog_facets(sender, **kwargs):
+    """Инвентарь добавлен, изменён или удалён — счётчики по категориям пересчитаются."""
+    invalidate_catalog_facets()
@@ -1,3 +1,182 @@
-from django.test import TestCase
+"""
+Тесты для приложения inventory.
+Проверяет паттерн Наблюдатель: изменение SportCategory сбрасывает кэш списка категорий,
+пакетное сохранение фото формсетом с единственным основным фото и WebP-вариантами,
+кэш фасетов каталога, сбрасываемый при изменении инвентаря,
+и разбор GET-фильтров каталога формой InventoryFilterForm.
+"""
 
-# Create your tests here.
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from inventory.forms import InventoryFilterForm, InventoryPhotoFormSet
+from inventory.models import Inventory, InventoryPhoto, SportCategory
+from inventory.services.categories import get_cached_categories
+from inventory.services.facets import facets_signature, get_catalog_facets
+from users.models import Owner, User
+
+
+class CategoriesCacheTest(TestCase):
+    """Список категорий берётся из кэша и перечитывается после изменений."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_second_call_served_from_cache(self):
+        SportCategory.objects.create(name='Лыжи')
+        get_cached_categories()
+        with self.assertNumQueries(0):
+            self.assertEqual([c.name for c in get_cached_categories()], ['Лыжи'])
+
+    def test_cache_reset_on_save_and_delete(self):
+        category = SportCategory.objects.create(name='Лыжи')
+        get_cached_categories()
+
+        SportCategory.objects.create(name='Велосипеды')
+        self.assertEqual([c.name for c in get_cached_categories()], ['Велосипеды', 'Лыжи'])
+
+        category.delete()
+        self.assertEqual([c.name for c in get_cached_categories()], ['Велосипеды'])
+
+
+# Минимальный валидный GIF 1x1 для ImageField
+GIF_BYTES = (
+    b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00'
+    b',\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;'
+)
+
+
+class PhotoFormSetSaveTest(TestCase):
+    """save_photos(): новые фото вставляются пакетно, основным остаётся последнее отмеченное."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        user = User.objects.create_user(email='owner@test.com', password='Pass1234!', role='owner')
+        owner = Owner.objects.create(user=user, full_name='Тест Владелец')
+        self.inventory = Inventory.objects.create(
+            owner=owner,
+            category=SportCategory.objects.create(name='Велосипеды'),
+            name='Тестовый велосипед',
+            description='Описание',
+            price_per_day=Decimal('500.00'),
+        )
+
+    def _formset(self, main_flags):
+        data = {
+            'photos-TOTAL_FORMS': str(len(main_flags)),
+            'photos-INITIAL_FORMS': '0',
+            'photos-MIN_NUM_FORMS': '0',
+            'photos-MAX_NUM_FORMS': '10',
+        }
+        files = {}
+        for i, is_main in enumerate(main_flags):
+            files[f'photos-{i}-photo_url'] = SimpleUploadedFile(f'p{i}.gif', GIF_BYTES, content_type='image/gif')
+            if is_main:
+                data[f'photos-{i}-is_main'] = 'on'
+        return InventoryPhotoFormSet(data, files, instance=self.inventory, prefix='photos')
+
+    def test_single_main_photo_kept(self):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            formset = self._formset([True, False, True])
+            self.assertTrue(formset.is_valid(), formset.errors)
+            formset.save_photos(self.inventory)
+
+        photos = InventoryPhoto.objects.filter(inventory=self.inventory)
+        self.assertEqual(photos.count(), 3)
+        self.assertEqual(photos.filter(is_main=True).count(), 1)
+        self.assertTrue(photos.get(is_main=True).photo_url.name.endswith('p2.gif'))
+
+    def test_new_main_photo_replaces_existing(self):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            old = InventoryPhoto.objects.create(
+                inventory=self.inventory,
+                photo_url=SimpleUploadedFile('old.gif', GIF_BYTES, content_type='image/gif'),
+                is_main=True,
+            )
+            formset = self._formset([True])
+            self.assertTrue(formset.is_valid(), formset.errors)
+            formset.save_photos(self.inventory)
+
+        old.refresh_from_db()
+        self.assertFalse(old.is_main)
+        self.assertEqual(InventoryPhoto.objects.filter(inventory=self.inventory, is_main=True).count(), 1)
+
+    def test_webp_variants_generated(self):
+        buffer = BytesIO()
+        Image.new('RGB', (1000, 500), 'red').save(buffer, 'PNG')
+        with override_settings(MEDIA_ROOT=self.media_root):
+            formset = InventoryPhotoFormSet(
+                {
+                    'photos-TOTAL_FORMS': '1',
+                    'photos-INITIAL_FORMS': '0',
+                    'photos-MIN_NUM_FORMS': '0',
+                    'photos-MAX_NUM_FORMS': '10',
+                },
+                {'photos-0-photo_url': SimpleUploadedFile('big.png', buffer.getvalue(), content_type='image/png')},
+                instance=self.inventory, prefix='photos',
+            )
+            self.assertTrue(formset.is_valid(), formset.errors)
+            with self.captureOnCommitCallbacks(execute=True):
+                formset.save_photos(self.inventory)
+
+            photo = InventoryPhoto.objects.get(inventory=self.inventory)
+            for field_name, width in (('thumbnail', 200), ('card_image', 600), ('detail_image', 1000)):
+                with Image.open(getattr(photo, field_name).path) as variant:
+                    self.assertEqual((variant.format, variant.width), ('WEBP', width))
+
+
+class CatalogFacetsTest(TestCase):
+    """Фасеты по категориям: один GROUP BY, повтор — из кэша, сброс при сохранении инвентаря."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(email='owner@test.com', password='Pass1234!', role='owner')
+        self.owner = Owner.objects.create(user=user, full_name='Тест Владелец')
+        self.skis = SportCategory.objects.create(name='Лыжи')
+        self.bikes = SportCategory.objects.create(name='Велосипеды')
+        for category in (self.skis, self.skis, self.bikes):
+            self._create(category)
+
+    def _create(self, category):
+        return Inventory.objects.create(
+            owner=self.owner, category=category, name='Вещь', description='Описание',
+            price_per_day=Decimal('500.00'), status='available',
+        )
+
+    def _facets(self):
+        qs = Inventory.objects.filter(status='available')
+        return get_catalog_facets(qs, facets_signature({'page': '2', 'sort': 'price_low'}))
+
+    def test_counts_cached_until_inventory_saved(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self._facets(), {self.skis.pk: 2, self.bikes.pk: 1})
+        with self.assertNumQueries(0):
+            self._facets()
+
+        self._create(self.bikes)
+        self.assertEqual(self._facets(), {self.skis.pk: 2, self.bikes.pk: 2})
+
+    def test_signature_ignores_page_sort_and_category(self):
+        self.assertEqual(
+            facets_signature({'search': 'лыжи', 'page': '3', 'category': str(self.skis.pk)}),
+            facets_signature({'search': 'лыжи'}),
+        )
+        self.assertNotEqual(facets_signature({'search': 'лыжи'}), facets_signature({'search': 'вело'}))
+
+
+class InventoryFilterFormTest(TestCase):
+    """Категория из ModelChoiceField попадает в фильтр как pk, невалидная цена отбрасывается."""
+
+    def test_filter_kwargs(self):
+        skis = SportCategory.objects.create(name='Лыжи')
+        form = InventoryFilterForm({'category': str(skis.pk), 'min_price': 'abc', 'sort': 'price_asc'})
+        self.assertEqual(form.filter_kwargs(), {'category_id': skis.pk})
+        self.assertEqual(form.ordering(), 'price_per_day')
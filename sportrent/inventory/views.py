@@ -14,19 +14,64 @@ from django.conf import settings
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from django.core.files.storage import default_storage
 from django.core.paginator import Paginator
-from django.db.models import Q, Avg, Sum, Count
-from django.db.models.functions import TruncDate
+from django.db.models import Q, Avg, Sum, Count, CharField, F, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
 from django.db import transaction
 from django.utils import timezone
 
-from .models import Inventory, SportCategory, InventoryPhoto, Favorite, City, PickupPoint
-from .forms import InventoryForm, InventoryPhotoFormSet
+from .models import Inventory, InventoryPhoto, Favorite, City, PickupPoint
+from .forms import InventoryFilterForm, InventoryForm, InventoryPhotoFormSet
+from .services.categories import get_cached_categories
+from .services.facets import facets_signature, get_catalog_facets
 from users.models import Owner
 
 logger = logging.getLogger('inventory')
 
 
+def _is_inventory_owner(user, inventory):
+    """Владелец ли пользователь этого инвентаря — сравнение по owner_id, без загрузки inventory.owner."""
+    owner_profile = getattr(user, 'owner_profile', None)
+    return owner_profile is not None and inventory.owner_id == owner_profile.pk
+
+
+def _catalog_cards(inventory_qs):
+    """
+    Проекция каталога для карточек: словари вместо моделей (без Model.__init__ на каждую строку).
+    Главное фото (WebP card_image, если готов, иначе оригинал) подставляется подзапросом,
+    а не отдельным prefetch-запросом.
+    """
+    main_photo = InventoryPhoto.objects.filter(
+        inventory=OuterRef('pk'), is_main=True
+    ).annotate(
+        src=Coalesce(NullIf('card_image', Value('')), 'photo_url', output_field=CharField())
+    ).values('src')[:1]
+    return inventory_qs.annotate(main_photo=Subquery(main_photo)).values(
+        'inventory_id', 'name', 'brand', 'image', 'main_photo', 'price_per_day', 'avg_rating', 'reviews_count',
+        category_name=F('category__name'),
+        pickup_city=F('pickup_point__city__name'),
+    )
+
+
+def _with_photo_urls(cards):
+    """Добавляет в карточки photo_url (главное фото, иначе Inventory.image) через storage."""
+    cards = list(cards)
+    for card in cards:
+        name = card['main_photo'] or card['image']
+        card['photo_url'] = default_storage.url(name) if name else ''
+    return cards
+
+
+def _main_photo_prefetch(lookup='photos'):
+    """Только главное фото для карточек (item.main_photos / item.card_image), а не все фото."""
+    return Prefetch(
+        lookup,
+        queryset=InventoryPhoto.objects.filter(is_main=True).only('photo_id', 'inventory_id', 'photo_url', 'card_image'),
+        to_attr='main_photos',
+    )
+
+
 def _save_pickup_point(inventory, form, owner):
     """
     Создаёт или обновляет точку выдачи по данным из формы владельца.
@@ -83,39 +128,34 @@ def inventory_list(request):
     """
     Список инвентаря с фильтрацией, поиском и сортировкой.
     """
-    # Базовый queryset только для доступного инвентаря
-    inventory_qs = Inventory.objects.filter(
-        status='available'
-    ).select_related('category', 'owner', 'owner__user', 'pickup_point__city').prefetch_related('photos')
+    # Базовый queryset только для доступного инвентаря (проекция для карточек — перед пагинацией)
+    inventory_qs = Inventory.objects.filter(status='available')
 
     # Поиск
-    search_query = request.GET.get('search', '').strip()
+    filter_form = InventoryFilterForm(request.GET)
+    search_query = filter_form.search_query()
     if search_query:
+        # На PostgreSQL каждый icontains обслуживает триграммный GIN-индекс
+        # (миграция 0013_inventory_search_trgm_indexes), а не seq scan
         inventory_qs = inventory_qs.filter(
             Q(name__icontains=search_query) |
             Q(description__icontains=search_query) |
             Q(brand__icontains=search_query) |
             Q(model__icontains=search_query)
         )
-        logger.info(f'Поиск инвентаря: {search_query}')
+        logger.info('Поиск инвентаря: %s', search_query)
 
-    # Фильтрация по категории
-    category_id = request.GET.get('category')
-    if category_id:
-        inventory_qs = inventory_qs.filter(category_id=category_id)
+    # Состояние и цена — валидные значения одним .filter(); категория — после фасетов
+    filters = filter_form.filter_kwargs()
+    selected_category_id = filters.pop('category_id', None)
+    if filters:
+        inventory_qs = inventory_qs.filter(**filters)
 
-    # Фильтрация по состоянию
+    # Значения для повторного вывода в форме фильтров
+    category_id = request.GET.get('category')
     condition = request.GET.get('condition')
-    if condition:
-        inventory_qs = inventory_qs.filter(condition=condition)
-
-    # Фильтрация по цене
     min_price = request.GET.get('min_price') or ''
     max_price = request.GET.get('max_price') or ''
-    if min_price:
-        inventory_qs = inventory_qs.filter(price_per_day__gte=min_price)
-    if max_price:
-        inventory_qs = inventory_qs.filter(price_per_day__lte=max_price)
 
     # Фильтр «Только рядом со мной»
     nearby = request.GET.get('nearby') == '1'
@@ -130,41 +170,46 @@ def inventory_list(request):
         except Exception:
             nearby = False
 
+    # Фасеты по категориям (без фильтра по категории) — один GROUP BY, кэш по сигнатуре фильтров
+    signature = facets_signature(
+        request.GET,
+        extra=[('geo', f'{user_lat},{user_lon}')] if nearby else (),
+    )
+    category_counts = get_catalog_facets(inventory_qs, signature)
+    if selected_category_id:
+        inventory_qs = inventory_qs.filter(category_id=selected_category_id)
+        total_count = category_counts.get(selected_category_id, 0)
+    else:
+        total_count = sum(category_counts.values())
+
     # Сортировка
     sort_by = request.GET.get('sort', '-added_date')
-    valid_sorts = {
-        'price_asc': 'price_per_day',
-        'price_desc': '-price_per_day',
-        'name': 'name',
-        'newest': '-added_date',
-        'rating': '-avg_rating',
-    }
+    ordering = filter_form.ordering()
+    if ordering:
+        inventory_qs = inventory_qs.order_by(ordering)
 
-    if sort_by in valid_sorts:
-        inventory_qs = inventory_qs.order_by(valid_sorts[sort_by])
-
-    # Пагинация
-    paginator = Paginator(inventory_qs, 9)  # 9 items per page
+    # Пагинация. Общее количество уже известно из фасетов — пагинатор не делает COUNT
+    paginator = Paginator(_catalog_cards(inventory_qs), 9)  # 9 items per page
+    paginator.count = total_count
     page_number = request.GET.get('page', 1)
     page_obj = paginator.get_page(page_number)
+    page_obj.object_list = _with_photo_urls(page_obj.object_list)
 
-    # Обновляем рейтинги для инвентаря на текущей странице
-    from reviews.utils import update_inventory_rating
-    for item in page_obj.object_list:
-        if item.reviews_count > 0:
-            update_inventory_rating(item)
+    # avg_rating/reviews_count поддерживают сигналы reviews — пересчёт при показе не нужен
 
     favorite_ids = set()
     if request.user.is_authenticated and request.user.role == 'client' and hasattr(request.user, 'client_profile'):
         favorite_ids = set(
             Favorite.objects.filter(
                 client=request.user.client_profile,
-                inventory__in=page_obj.object_list
+                inventory__in=[item['inventory_id'] for item in page_obj.object_list]
             ).values_list('inventory_id', flat=True)
         )
 
     # Получаем категории и города для фильтров
-    categories = SportCategory.objects.all()
+    categories = get_cached_categories()
+    for cat in categories:
+        cat.facet_count = category_counts.get(cat.category_id, 0)
     cities = list(City.objects.filter(pickup_points__is_active=True).distinct().values('name').order_by('name'))
 
     context = {
@@ -177,7 +222,7 @@ def inventory_list(request):
         'min_price': min_price,
         'max_price': max_price,
         'current_sort': sort_by,
-        'total_count': paginator.count,
+        'total_count': total_count,
         'favorite_ids': favorite_ids,
         'yandex_maps_key': settings.YANDEX_MAPS_KEY,
         'nearby': nearby,
@@ -196,13 +241,9 @@ def inventory_detail(request, pk):
         pk=pk
     )
 
-    # Получаем отзывы напрямую через Review модель
-    from reviews.models import Review
-    reviews = Review.objects.filter(
-        reviewed_id=inventory.inventory_id,
-        target_type='inventory',
-        status='published'
-    ).select_related('reviewer', 'rental').order_by('-review_date')[:10]
+    # Последние отзывы (кэш на 5 минут, сбрасывается сигналами reviews)
+    from reviews.utils import get_inventory_reviews
+    reviews = get_inventory_reviews(inventory.inventory_id)
 
     is_favorite = False
     if request.user.is_authenticated and request.user.role == 'client' and hasattr(request.user, 'client_profile'):
@@ -230,12 +271,12 @@ def inventory_create(request):
         messages.error(request, 'Только владельцы могут добавлять инвентарь.')
         return redirect('core:home')
 
-    if not hasattr(request.user, 'owner_profile'):
+    # Профиль уже загружен вместе с request.user (users.backends.ProfileModelBackend)
+    owner = getattr(request.user, 'owner_profile', None)
+    if owner is None:
         messages.error(request, 'Профиль владельца не найден.')
         return redirect('users:profile')
 
-    owner = request.user.owner_profile
-
     if request.method == 'POST':
         form = InventoryForm(request.POST, request.FILES, owner=owner)
         photo_formset = InventoryPhotoFormSet(request.POST, request.FILES)
@@ -252,11 +293,7 @@ def inventory_create(request):
                     _save_pickup_point(inventory, form, owner)
 
                     # Сохраняем фотографии
-                    for photo_form in photo_formset:
-                        if photo_form.cleaned_data and not photo_form.cleaned_data.get('DELETE'):
-                            photo = photo_form.save(commit=False)
-                            photo.inventory = inventory
-                            photo.save()
+                    photo_formset.save_photos(inventory)
 
                     logger.info(f'Новый инвентарь создан: {inventory.name} by {owner.full_name}')
                     messages.success(request, 'Инвентарь успешно добавлен и отправлен на модерацию.')
@@ -283,11 +320,12 @@ def inventory_update(request, pk):
     """
     Редактирование инвентаря (только для владельца или менеджера).
     """
-    inventory = get_object_or_404(Inventory, pk=pk)
+    # owner нужен форме (банковские счета владельца) — берём тем же запросом
+    inventory = get_object_or_404(Inventory.objects.select_related('owner'), pk=pk)
 
     # Проверка прав доступа
     if request.user.role == 'owner':
-        if not hasattr(request.user, 'owner_profile') or inventory.owner != request.user.owner_profile:
+        if not _is_inventory_owner(request.user, inventory):
             messages.error(request, 'У вас нет прав на редактирование этого инвентаря.')
             return redirect('inventory:detail', pk=pk)
         if inventory.status not in ['pending', 'rejected']:
@@ -310,15 +348,7 @@ def inventory_update(request, pk):
                     _save_pickup_point(inventory, form, inventory.owner)
 
                     # Обработка фотографий
-                    for photo_form in photo_formset:
-                        if photo_form.cleaned_data:
-                            if photo_form.cleaned_data.get('DELETE'):
-                                if photo_form.instance.pk:
-                                    photo_form.instance.delete()
-                            else:
-                                photo = photo_form.save(commit=False)
-                                photo.inventory = inventory
-                                photo.save()
+                    photo_formset.save_photos(inventory)
 
                     logger.info(f'Инвентарь обновлен: {inventory.name}')
                     messages.success(request, 'Инвентарь успешно обновлен.')
@@ -350,7 +380,7 @@ def inventory_delete(request, pk):
 
     # Проверка прав доступа
     if request.user.role == 'owner':
-        if not hasattr(request.user, 'owner_profile') or inventory.owner != request.user.owner_profile:
+        if not _is_inventory_owner(request.user, inventory):
             messages.error(request, 'У вас нет прав на удаление этого инвентаря.')
             return redirect('inventory:detail', pk=pk)
     elif request.user.role != 'administrator':
@@ -376,18 +406,20 @@ def my_inventory(request):
         messages.error(request, 'Эта страница доступна только владельцам инвентаря')
         return redirect('inventory:list')
 
-    if not hasattr(request.user, 'owner_profile'):
+    # Профиль уже загружен вместе с request.user (users.backends.ProfileModelBackend)
+    owner = getattr(request.user, 'owner_profile', None)
+    if owner is None:
         messages.error(request, 'Профиль владельца не найден')
         return redirect('users:profile')
 
-    owner = request.user.owner_profile
-
     # Фильтрация по статусу
     status = request.GET.get('status')
 
     inventory_qs = Inventory.objects.filter(
         owner=owner
-    ).select_related('category', 'manager').prefetch_related('photos').order_by('-added_date')
+    ).prefetch_related(_main_photo_prefetch()).only(
+        'inventory_id', 'name', 'description', 'image', 'price_per_day', 'status', 'rejection_reason',
+    ).order_by('-added_date')
 
     if status:
         inventory_qs = inventory_qs.filter(status=status)
@@ -411,15 +443,14 @@ def owner_earnings_analytics(request):
     """
     Аналитика заработка владельца: по дням, за период, топ и аутсайдеры по инвентарю.
     """
-    if request.user.role != 'owner' or not hasattr(request.user, 'owner_profile'):
+    owner = getattr(request.user, 'owner_profile', None)
+    if request.user.role != 'owner' or owner is None:
         messages.error(request, 'Доступно только владельцам инвентаря')
         return redirect('core:home')
-
-    owner = request.user.owner_profile
     owner_pct = Decimal('0.70')  # 70% владельцу по умолчанию
 
-    # Период из GET или по умолчанию последние 30 дней
-    today = timezone.now().date()
+    # Период из GET или по умолчанию последние 30 дней (локальные даты — как у свёртки и __date)
+    today = timezone.localdate()
     try:
         date_from = request.GET.get('date_from')
         date_to = request.GET.get('date_to')
@@ -437,38 +468,39 @@ def owner_earnings_analytics(request):
         date_from = today - timedelta(days=30)
         date_to = today
 
-    from rentals.models import Rental
-
-    # Заработок по дням (завершённые аренды, дата = actual_return_date)
-    rentals_completed = Rental.objects.filter(
-        inventory__owner=owner,
-        status='completed',
-        actual_return_date__isnull=False,
-        actual_return_date__date__gte=date_from,
-        actual_return_date__date__lte=date_to,
-    )
-    earnings_by_day_qs = rentals_completed.annotate(
-        day=TruncDate('actual_return_date')
-    ).values('day').annotate(
-        total=Sum('total_price')
-    ).order_by('day')
-    earnings_by_day = []
-    for row in earnings_by_day_qs:
-        earnings_by_day.append({
+    from rentals.models import OwnerEarningsDaily, Rental
+
+    # Заработок по дням (завершённые аренды, дата = actual_return_date).
+    # Дни до closed_until() — из свёртки OwnerEarningsDaily (rebuild_earnings), следующие — на лету:
+    # до ночного пересчёта в 03:15 это и вчерашний день, а если cron не отработал — несколько дней
+    closed_until = OwnerEarningsDaily.closed_until()
+    daily_rows = []
+    if closed_until is not None and closed_until >= date_from:
+        daily_rows = list(
+            OwnerEarningsDaily.objects.filter(
+                owner=owner, day__gte=date_from, day__lte=min(date_to, closed_until),
+            ).order_by('day').values('day', 'gross', 'rentals_count')
+        )
+    live_from = max(date_from, closed_until + timedelta(days=1)) if closed_until else date_from
+    if live_from <= date_to:
+        daily_rows += [
+            {'day': row['day'], 'gross': row['gross'], 'rentals_count': row['rentals_count']}
+            for row in OwnerEarningsDaily.aggregate_rentals(
+                Rental.objects.filter(
+                    inventory__owner=owner,
+                    actual_return_date__date__gte=live_from,
+                    actual_return_date__date__lte=date_to,
+                )
+            )
+        ]
+    earnings_by_day = [
+        {
             'day': row['day'],
-            'earnings': (row['total'] or Decimal('0')) * owner_pct,
-            'rentals_count': None,
-        })
-    # Количество аренд по дням
-    from django.db.models import Count
-    count_by_day = rentals_completed.annotate(
-        day=TruncDate('actual_return_date')
-    ).values('day').annotate(
-        cnt=Count('rental_id')
-    )
-    count_map = {r['day']: r['cnt'] for r in count_by_day}
-    for row in earnings_by_day:
-        row['rentals_count'] = count_map.get(row['day'], 0)
+            'earnings': (row['gross'] or Decimal('0')) * owner_pct,
+            'rentals_count': row['rentals_count'],
+        }
+        for row in daily_rows
+    ]
 
     # Итого за период
     period_total = sum((r['earnings'] for r in earnings_by_day), Decimal('0'))
@@ -538,7 +570,7 @@ def favorites_list(request):
 
     favorites_qs = Favorite.objects.filter(
         client=request.user.client_profile
-    ).select_related('inventory', 'inventory__category').prefetch_related('inventory__photos').order_by('-created_date')
+    ).select_related('inventory', 'inventory__category').prefetch_related(_main_photo_prefetch('inventory__photos')).order_by('-created_date')
 
     paginator = Paginator(favorites_qs, 9)
     page_number = request.GET.get('page', 1)
@@ -617,7 +649,7 @@ def ai_search_view(request):
             photo = item.photos.first()
             pp = item.pickup_point
             if photo and photo.photo_url:
-                photo_url = photo.photo_url.url
+                photo_url = (photo.card_image or photo.photo_url).url
             elif item.image:
                 photo_url = item.image.url
             else:
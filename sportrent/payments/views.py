@@ -284,7 +284,7 @@ def _apply_payment_succeeded(intent: PaymentIntent, raw_data: dict) -> None:
     if intent.purpose == 'rental_main':
         rental.payment_status = 'paid'
         # Поля payment_date на Rental нет — статус оплаты отражается через payment_status
-        rental.save(update_fields=['payment_status'])
+        rental.save(update_fields=['payment_status', 'updated_date'])
         # PaymentHistory не имеет типа для rental_main — только extension/overdue
         # TODO: добавить тип 'rental_main_card' в PaymentHistory.PAYMENT_TYPE_CHOICES если понадобится история
 
@@ -293,7 +293,7 @@ def _apply_payment_succeeded(intent: PaymentIntent, raw_data: dict) -> None:
         # Если нет других долгов — итоговый статус тоже paid
         if rental.overdue_fee_unpaid <= 0:
             rental.payment_status = 'paid'
-        rental.save(update_fields=['additional_payment_paid', 'payment_status'])
+        rental.save(update_fields=['additional_payment_paid', 'payment_status', 'updated_date'])
         PaymentHistory.objects.create(
             rental=rental,
             amount=intent.amount,
@@ -304,7 +304,7 @@ def _apply_payment_succeeded(intent: PaymentIntent, raw_data: dict) -> None:
     elif intent.purpose == 'overdue':
         rental.overdue_fee_paid_at = now
         rental.overdue_fee_snapshot = intent.amount
-        rental.save(update_fields=['overdue_fee_paid_at', 'overdue_fee_snapshot'])
+        rental.save(update_fields=['overdue_fee_paid_at', 'overdue_fee_snapshot', 'updated_date'])
         PaymentHistory.objects.create(
             rental=rental,
             amount=intent.amount,
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class RentalsConfig(AppConfig):
     name = 'rentals'
+
+    def ready(self):
+        import rentals.signals  # noqa: F401 — регистрация сигналов
@@ -10,6 +10,45 @@ from .models import Rental, Reservation
 from users.models import BankAccount
 
 
+OCCUPYING_RENTAL_STATUSES = ['pending', 'confirmed', 'active']
+# Сколько пересечений показывать в сообщении об ошибке
+OCCUPIED_RANGES_LIMIT = 3
+
+
+def _occupied_ranges(inventory, start_dt, end_dt, exclude_client=None):
+    """
+    Человекочитаемые пересечения периода с арендами и активными бронями инвентаря.
+    Берём только даты (values_list) и не больше OCCUPIED_RANGES_LIMIT строк каждого вида:
+    это тот же запрос, что и проверка на занятость, без материализации моделей.
+    """
+    rentals = Rental.objects.filter(
+        inventory=inventory,
+        status__in=OCCUPYING_RENTAL_STATUSES,
+        start_date__lt=end_dt,
+        end_date__gt=start_dt,
+    ).order_by('start_date').values_list('start_date', 'end_date')[:OCCUPIED_RANGES_LIMIT]
+
+    reservations = Reservation.objects.filter(
+        inventory=inventory,
+        status='active',
+        end_date__gt=timezone.now(),
+    ).filter(
+        start_date__lt=end_dt,
+        end_date__gt=start_dt,
+    )
+    if exclude_client is not None:
+        reservations = reservations.exclude(client=exclude_client)
+    reservations = reservations.order_by('start_date').values_list('start_date', 'end_date')[:OCCUPIED_RANGES_LIMIT]
+
+    occupied_ranges = [
+        f"аренда с {start.strftime('%d.%m.%Y')} по {end.strftime('%d.%m.%Y')}" for start, end in rentals
+    ]
+    occupied_ranges += [
+        f"бронь с {start.strftime('%d.%m.%Y')} по {end.strftime('%d.%m.%Y')}" for start, end in reservations
+    ]
+    return occupied_ranges
+
+
 class RentalCreateForm(forms.ModelForm):
     """Форма создания заявки на аренду."""
 
@@ -89,36 +128,11 @@ class RentalCreateForm(forms.ModelForm):
                         f'Максимальный срок аренды для этого инвентаря: {self.inventory.max_rental_days} дней'
                     )
 
-                # Проверка что инвентарь свободен в эти даты
-                overlapping = Rental.objects.filter(
-                    inventory=self.inventory,
-                    status__in=['pending', 'confirmed', 'active']
-                ).filter(
-                    start_date__lt=end_dt,
-                    end_date__gt=start_dt
-                )
-
-                overlapping_reservations = Reservation.objects.filter(
-                    inventory=self.inventory,
-                    status='active',
-                    end_date__gt=timezone.now(),
-                ).filter(
-                    start_date__lt=end_dt,
-                    end_date__gt=start_dt
+                # Проверка что инвентарь свободен в эти даты.
+                # Пересечение только с активными бронями других клиентов.
+                occupied_ranges = _occupied_ranges(
+                    self.inventory, start_dt, end_dt, exclude_client=self.client,
                 )
-                # Блокируем пересечение только с активными бронями других клиентов.
-                if self.client is not None:
-                    overlapping_reservations = overlapping_reservations.exclude(client=self.client)
-
-                occupied_ranges = []
-                for rent in overlapping:
-                    occupied_ranges.append(
-                        f"аренда с {rent.start_date.strftime('%d.%m.%Y')} по {rent.end_date.strftime('%d.%m.%Y')}"
-                    )
-                for res in overlapping_reservations:
-                    occupied_ranges.append(
-                        f"бронь с {res.start_date.strftime('%d.%m.%Y')} по {res.end_date.strftime('%d.%m.%Y')}"
-                    )
 
                 if occupied_ranges:
                     if len(occupied_ranges) == 1:
@@ -198,32 +212,7 @@ class ReservationCreateForm(forms.ModelForm):
                     f'Максимальный срок брони для этого инвентаря: {self.inventory.max_rental_days} дней'
                 )
 
-            overlapping_rentals = Rental.objects.filter(
-                inventory=self.inventory,
-                status__in=['pending', 'confirmed', 'active']
-            ).filter(
-                start_date__lt=end_dt,
-                end_date__gt=start_dt
-            )
-
-            overlapping_reservations = Reservation.objects.filter(
-                inventory=self.inventory,
-                status='active',
-                end_date__gt=timezone.now(),
-            ).filter(
-                start_date__lt=end_dt,
-                end_date__gt=start_dt
-            )
-
-            occupied_ranges = []
-            for rent in overlapping_rentals:
-                occupied_ranges.append(
-                    f"аренда с {rent.start_date.strftime('%d.%m.%Y')} по {rent.end_date.strftime('%d.%m.%Y')}"
-                )
-            for res in overlapping_reservations:
-                occupied_ranges.append(
-                    f"бронь с {res.start_date.strftime('%d.%m.%Y')} по {res.end_date.strftime('%d.%m.%Y')}"
-                )
+            occupied_ranges = _occupied_ranges(self.inventory, start_dt, end_dt)
 
             if occupied_ranges:
                 if len(occupied_ranges) == 1:
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:26
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def fill_revenue_counter(apps, schema_editor):
+    Payment = apps.get_model('rentals', 'Payment')
+    RevenueCounter = apps.get_model('rentals', 'RevenueCounter')
+    total = Payment.objects.filter(status='completed').aggregate(total=Sum('amount'))['total'] or 0
+    RevenueCounter.objects.create(counter_id=1, total=total)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0011_rental_overdue_terms_accepted'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueCounter',
+            fields=[
+                ('counter_id', models.PositiveSmallIntegerField(default=1, editable=False, primary_key=True, serialize=False)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Выручка')),
+                ('updated_date', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Счётчик выручки',
+                'verbose_name_plural': 'Счётчик выручки',
+                'db_table': 'revenue_counter',
+            },
+        ),
+        migrations.RunPython(fill_revenue_counter, noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0012_catalog_sort_indexes'),
+        ('rentals', '0012_revenuecounter'),
+        ('users', '0012_updated_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rental',
+            name='rentals_invento_c58f56_idx',
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['inventory', 'status', 'start_date', 'end_date'], name='rental_inv_status_dates_idx'),
+        ),
+    ]
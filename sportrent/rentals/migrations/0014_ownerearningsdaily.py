@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def fill_owner_earnings(apps, schema_editor):
+    Rental = apps.get_model('rentals', 'Rental')
+    OwnerEarningsDaily = apps.get_model('rentals', 'OwnerEarningsDaily')
+    rows = Rental.objects.filter(
+        status='completed', actual_return_date__isnull=False,
+    ).annotate(day=TruncDate('actual_return_date')).values('inventory__owner_id', 'day').annotate(
+        gross=Sum('total_price'), rentals_count=Count('rental_id'),
+    ).order_by('day')
+    OwnerEarningsDaily.objects.bulk_create([
+        OwnerEarningsDaily(owner_id=row['inventory__owner_id'], day=row['day'],
+                           gross=row['gross'] or 0, rentals_count=row['rentals_count'])
+        for row in rows
+    ])
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0013_rental_overlap_index'),
+        ('users', '0012_updated_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OwnerEarningsDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('gross', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Сумма аренд')),
+                ('rentals_count', models.PositiveIntegerField(default=0, verbose_name='Количество аренд')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='earnings_daily', to='users.owner', verbose_name='Владелец')),
+            ],
+            options={
+                'verbose_name': 'Заработок владельца за день',
+                'verbose_name_plural': 'Заработок владельцев по дням',
+                'db_table': 'owner_earnings_daily',
+                'constraints': [models.UniqueConstraint(fields=('owner', 'day'), name='owner_earnings_daily_unique')],
+            },
+        ),
+        migrations.RunPython(fill_owner_earnings, noop),
+    ]
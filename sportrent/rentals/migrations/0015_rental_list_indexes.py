@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0017_inventory_status_condition_smallint'),
+        ('rentals', '0014_ownerearningsdaily'),
+        ('users', '0012_updated_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rental',
+            name='rentals_client__3149ab_idx',
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['client', 'status', '-created_date'], name='rental_cli_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['manager', 'status', '-created_date'], name='rental_mgr_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['status', '-created_date'], name='rental_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:04
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0015_rental_list_indexes'),
+    ]
+
+    operations = [
+        # default — только Python-сторона (uuid7 вместо uuid4), в БД менять нечего
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='contract',
+                    name='contract_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='damagereport',
+                    name='report_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='payment',
+                    name='payment_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='paymenthistory',
+                    name='history_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='rental',
+                    name='rental_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='reservation',
+                    name='reservation_id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,127 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:10
+
+import core.fields
+from django.db import migrations, models
+
+# Копия Rental.STATUS_DB_CODES / PAYMENT_STATUS_DB_CODES на момент миграции
+STATUS_DB_CODES = {
+    'inquiry': 0,
+    'pending': 1,
+    'confirmed': 2,
+    'active': 3,
+    'completed': 4,
+    'cancelled': 5,
+    'rejected': 6,
+}
+PAYMENT_STATUS_DB_CODES = {
+    'pending': 0,
+    'paid': 1,
+    'delayed': 2,
+    'refunded': 3,
+    'failed': 4,
+}
+
+STATUS_CHOICES = [
+    ('inquiry', 'Вопрос по инвентарю'),
+    ('pending', 'Ожидает подтверждения'),
+    ('confirmed', 'Подтверждена'),
+    ('active', 'Активна'),
+    ('completed', 'Завершена'),
+    ('cancelled', 'Отменена'),
+    ('rejected', 'Отклонена'),
+]
+PAYMENT_STATUS_CHOICES = [
+    ('pending', 'Ожидает оплаты'),
+    ('paid', 'Оплачено'),
+    ('delayed', 'Задержка оплаты'),
+    ('refunded', 'Возвращено'),
+    ('failed', 'Ошибка оплаты'),
+]
+
+# Индексы, в которые входит status: пересоздаются поверх нового smallint-столбца
+STATUS_INDEXES = [
+    models.Index(fields=['client', 'status', '-created_date'], name='rental_cli_status_created_idx'),
+    models.Index(fields=['manager', 'status', '-created_date'], name='rental_mgr_status_created_idx'),
+    models.Index(fields=['status', '-created_date'], name='rental_status_created_idx'),
+    models.Index(fields=['inventory', 'status', 'start_date', 'end_date'], name='rental_inv_status_dates_idx'),
+]
+
+
+def _case(field, mapping):
+    return models.Case(
+        *[models.When(models.Q(**{field: key}), then=models.Value(value)) for key, value in mapping.items()],
+        default=models.Value(None),
+    )
+
+
+def codes_to_numbers(apps, schema_editor):
+    Rental = apps.get_model('rentals', 'Rental')
+    Rental.objects.update(
+        status_code=_case('status', STATUS_DB_CODES),
+        payment_status_code=_case('payment_status', PAYMENT_STATUS_DB_CODES),
+    )
+
+
+def numbers_to_codes(apps, schema_editor):
+    Rental = apps.get_model('rentals', 'Rental')
+    Rental.objects.update(
+        status=_case('status_code', {value: key for key, value in STATUS_DB_CODES.items()}),
+        payment_status=_case('payment_status_code', {value: key for key, value in PAYMENT_STATUS_DB_CODES.items()}),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0016_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        *[
+            migrations.RemoveIndex(model_name='rental', name=index.name)
+            for index in STATUS_INDEXES
+        ],
+        migrations.AddField(
+            model_name='rental',
+            name='status_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='rental',
+            name='payment_status_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.RunPython(codes_to_numbers, numbers_to_codes),
+        migrations.RemoveField(
+            model_name='rental',
+            name='status',
+        ),
+        migrations.RemoveField(
+            model_name='rental',
+            name='payment_status',
+        ),
+        migrations.RenameField(
+            model_name='rental',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.RenameField(
+            model_name='rental',
+            old_name='payment_status_code',
+            new_name='payment_status',
+        ),
+        migrations.AlterField(
+            model_name='rental',
+            name='payment_status',
+            field=core.fields.SmallIntChoicesField(choices=PAYMENT_STATUS_CHOICES, codes=PAYMENT_STATUS_DB_CODES, default='pending', verbose_name='Статус оплаты'),
+        ),
+        migrations.AlterField(
+            model_name='rental',
+            name='status',
+            field=core.fields.SmallIntChoicesField(choices=STATUS_CHOICES, codes=STATUS_DB_CODES, default='pending', verbose_name='Статус'),
+        ),
+        *[
+            migrations.AddIndex(model_name='rental', index=index)
+            for index in STATUS_INDEXES
+        ],
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:08
+
+from django.db import migrations, models
+
+
+def updated_from_created(apps, schema_editor):
+    # Существующим арендам — дата создания, а не момент миграции
+    Rental = apps.get_model('rentals', 'Rental')
+    Rental.objects.update(updated_date=models.F('created_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0017_rental_status_smallint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rental',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(updated_from_created, migrations.RunPython.noop),
+    ]
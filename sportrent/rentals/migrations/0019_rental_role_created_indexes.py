@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0018_inventory_ratings_sum'),
+        ('rentals', '0018_rental_updated_date'),
+        ('users', '0018_drop_default_ordering'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['client', '-created_date'], name='rental_cli_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['manager', '-created_date'], name='rental_mgr_created_idx'),
+        ),
+    ]
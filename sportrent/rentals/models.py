@@ -8,6 +8,8 @@
 - PaymentHistory: аудит-лог всех платёжных событий по аренде
 - Reservation: предварительное бронирование до подтверждения менеджером
 - Payment: устаревший мок-платёж (заменён PaymentIntent), оставлен для истории
+- RevenueCounter: накопленная выручка по завершённым Payment (одна строка, id=1)
+- OwnerEarningsDaily: свёртка завершённых аренд по владельцу и дню (для аналитики заработка)
 - Contract: договор аренды — привязан к Rental и Owner
 - DamageReport: акт повреждения инвентаря после возврата
 
@@ -20,12 +22,17 @@
 Ключевые слова: аренда, просрочка, штраф, доплата, продление, статья 622 ГК РФ
 """
 
-import uuid
+from datetime import timedelta
 from decimal import Decimal
 from django.db import models
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import TruncDate
 from django.core.validators import MinValueValidator
 from django.utils import timezone
-from users.models import Client, Manager, BankAccount
+from core.fields import SmallIntChoicesField
+from core.ids import uuid7
+from users.models import Client, Manager, Owner, BankAccount
 from inventory.models import Inventory
 
 
@@ -50,7 +57,25 @@ class Rental(models.Model):
         ('failed', 'Ошибка оплаты'),
     ]
 
-    rental_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Код → число в БД (core.fields.SmallIntChoicesField); таблицы только дополнять
+    STATUS_DB_CODES = {
+        'inquiry': 0,
+        'pending': 1,
+        'confirmed': 2,
+        'active': 3,
+        'completed': 4,
+        'cancelled': 5,
+        'rejected': 6,
+    }
+    PAYMENT_STATUS_DB_CODES = {
+        'pending': 0,
+        'paid': 1,
+        'delayed': 2,
+        'refunded': 3,
+        'failed': 4,
+    }
+
+    rental_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     inventory = models.ForeignKey(Inventory, on_delete=models.PROTECT, related_name='rentals', verbose_name='Инвентарь')
     client = models.ForeignKey(Client, on_delete=models.PROTECT, related_name='rentals', verbose_name='Клиент')
     manager = models.ForeignKey(Manager, on_delete=models.SET_NULL, null=True, blank=True,
@@ -77,15 +102,21 @@ class Rental(models.Model):
         related_name='marked_extension_paid', verbose_name='Оплату наличными зафиксировал'
     )
 
-    status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='pending', verbose_name='Статус')
-    payment_status = models.CharField(max_length=20, choices=PAYMENT_STATUS_CHOICES, default='pending',
-                                      verbose_name='Статус оплаты')
+    status = SmallIntChoicesField(
+        codes=STATUS_DB_CODES, choices=STATUS_CHOICES, default='pending', verbose_name='Статус'
+    )
+    payment_status = SmallIntChoicesField(
+        codes=PAYMENT_STATUS_DB_CODES, choices=PAYMENT_STATUS_CHOICES, default='pending', verbose_name='Статус оплаты'
+    )
 
     # Подтверждение ознакомления с условиями штрафа за просрочку (ст. 622 ГК РФ)
     overdue_terms_accepted_at = models.DateTimeField(null=True, blank=True,
                                                      verbose_name='Условия просрочки приняты')
 
     created_date = models.DateTimeField(default=timezone.now, verbose_name='Дата создания')
+    # ETag списка аренд (rentals/views.py). auto_now не срабатывает в QuerySet.update()
+    # и в save(update_fields=...) без этого поля — там его передают явно
+    updated_date = models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата изменения')
     notes = models.TextField(blank=True, verbose_name='Примечания')
     rejection_reason = models.TextField(blank=True, verbose_name='Причина отклонения')
     
@@ -99,8 +130,19 @@ class Rental(models.Model):
         verbose_name_plural = 'Аренды'
         ordering = ['-created_date']
         indexes = [
-            models.Index(fields=['client', 'status']),
-            models.Index(fields=['inventory', 'status']),
+            # Списки аренд по ролям: фильтр (клиент / менеджер / статус) + ORDER BY -created_date
+            # отдаёт страницу прямо из индекса, без отдельной сортировки;
+            # (client, status, -created_date) заменяет прежний (client, status) — тот его префикс
+            models.Index(fields=['client', 'status', '-created_date'], name='rental_cli_status_created_idx'),
+            models.Index(fields=['manager', 'status', '-created_date'], name='rental_mgr_status_created_idx'),
+            # Список без фильтра по статусу (по умолчанию): status между равенством и сортировкой
+            # не даёт индексам выше отдать WHERE client_id=? ORDER BY created_date DESC по порядку
+            models.Index(fields=['client', '-created_date'], name='rental_cli_created_idx'),
+            models.Index(fields=['manager', '-created_date'], name='rental_mgr_created_idx'),
+            models.Index(fields=['status', '-created_date'], name='rental_status_created_idx'),
+            # Проверка пересечения периодов: inventory + status + диапазон дат одним range scan;
+            # заменяет прежний (inventory, status), который является его префиксом
+            models.Index(fields=['inventory', 'status', 'start_date', 'end_date'], name='rental_inv_status_dates_idx'),
             models.Index(fields=['start_date', 'end_date']),
         ]
 
@@ -112,10 +154,18 @@ class Rental(models.Model):
         """Количество дней аренды."""
         return (self.end_date - self.start_date).days
 
-    def is_overdue(self):
-        """Проверка просрочки возврата."""
+    @staticmethod
+    def calculate_total_price(inventory, start_date, end_date):
+        """
+        Стоимость аренды по текущей цене инвентаря. Считается один раз при создании
+        и хранится в total_price как снимок: владелец может позже поменять price_per_day.
+        """
+        return inventory.price_per_day * (end_date - start_date).days
+
+    def is_overdue(self, now=None):
+        """Проверка просрочки возврата. now — общий момент времени, если проверяется много аренд."""
         if self.status == 'active' and not self.actual_return_date:
-            return timezone.now() > self.end_date
+            return (now or timezone.now()) > self.end_date
         return False
 
     @property
@@ -170,7 +220,7 @@ class PaymentHistory(models.Model):
         ('overdue_cash',   'Штраф за просрочку (наличными)'),
     ]
 
-    history_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    history_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     rental = models.ForeignKey(Rental, on_delete=models.CASCADE,
                                related_name='payment_history', verbose_name='Аренда')
     amount = models.DecimalField(max_digits=10, decimal_places=2,
@@ -208,7 +258,7 @@ class Reservation(models.Model):
         ('expired', 'Истекла'),
     ]
 
-    reservation_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    reservation_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     inventory = models.ForeignKey(Inventory, on_delete=models.PROTECT, related_name='reservations', verbose_name='Инвентарь')
     client = models.ForeignKey(Client, on_delete=models.PROTECT, related_name='reservations', verbose_name='Клиент')
 
@@ -251,7 +301,7 @@ class Payment(models.Model):
         ('refunded', 'Возвращен'),
     ]
 
-    payment_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    payment_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     rental = models.ForeignKey(Rental, on_delete=models.PROTECT, related_name='payments', verbose_name='Аренда')
 
     amount = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)],
@@ -275,6 +325,118 @@ class Payment(models.Model):
         return f"Платеж {self.amount} руб. - {self.rental}"
 
 
+class RevenueCounter(models.Model):
+    """
+    Накопленная выручка по завершённым платежам — единственная строка с id=1.
+    Поддерживается сигналами rentals/signals.py, поэтому дашборд читает одно значение
+    вместо SUM(amount) по всей таблице payments. Массовые QuerySet.update() сигналов
+    не шлют — после таких правок счётчик пересобирается через rebuild().
+    """
+
+    SINGLETON_ID = 1
+
+    counter_id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID, editable=False)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Выручка')
+    updated_date = models.DateTimeField(auto_now=True, verbose_name='Дата обновления')
+
+    class Meta:
+        db_table = 'revenue_counter'
+        verbose_name = 'Счётчик выручки'
+        verbose_name_plural = 'Счётчик выручки'
+
+    def __str__(self):
+        return f"Выручка {self.total} руб."
+
+    @classmethod
+    def rebuild(cls):
+        """Пересчитывает выручку по таблице payments и сохраняет в счётчик."""
+        total = Payment.objects.filter(status='completed').aggregate(total=Sum('amount'))['total'] or Decimal('0')
+        cls.objects.update_or_create(pk=cls.SINGLETON_ID, defaults={'total': total})
+        return total
+
+    @classmethod
+    def add(cls, amount):
+        """Атомарно прибавляет сумму (может быть отрицательной) к выручке."""
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(total=F('total') + amount)
+        if not updated:
+            cls.rebuild()
+
+    @classmethod
+    def get_total(cls):
+        """Текущая выручка; если счётчика ещё нет — собирает его."""
+        total = cls.objects.filter(pk=cls.SINGLETON_ID).values_list('total', flat=True).first()
+        return cls.rebuild() if total is None else total
+
+
+class OwnerEarningsDaily(models.Model):
+    """
+    Свёртка завершённых аренд по владельцу и дню возврата (actual_return_date).
+    Аналитика заработка читает закрытые дни отсюда — O(дней) вместо агрегата по всем арендам;
+    дни после последнего свёрнутого (сегодня и, до ночного пересчёта, вчера) считаются на лету.
+    Пересобирается командой rebuild_earnings (cron, раз в сутки). Дни — локальные (TIME_ZONE).
+    """
+
+    owner = models.ForeignKey(Owner, on_delete=models.CASCADE, related_name='earnings_daily', verbose_name='Владелец')
+    day = models.DateField(verbose_name='День')
+    gross = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name='Сумма аренд')
+    rentals_count = models.PositiveIntegerField(default=0, verbose_name='Количество аренд')
+
+    class Meta:
+        db_table = 'owner_earnings_daily'
+        verbose_name = 'Заработок владельца за день'
+        verbose_name_plural = 'Заработок владельцев по дням'
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'day'], name='owner_earnings_daily_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner.full_name} {self.day}: {self.gross} руб."
+
+    @staticmethod
+    def aggregate_rentals(rentals):
+        """Завершённые аренды → строки (owner, day, gross, rentals_count) по дню возврата."""
+        return rentals.filter(
+            status='completed',
+            actual_return_date__isnull=False,
+        ).annotate(
+            day=TruncDate('actual_return_date'),
+        ).values('inventory__owner_id', 'day').annotate(
+            gross=Sum('total_price'),
+            rentals_count=Count('rental_id'),
+        ).order_by('day')
+
+    @classmethod
+    def closed_until(cls):
+        """Последний свёрнутый день (все дни до него включительно есть в свёртке) или None."""
+        return cls.objects.aggregate(last=Max('day'))['last']
+
+    @classmethod
+    def rebuild(cls, date_from=None, date_to=None):
+        """
+        Пересобирает свёртку за период (по умолчанию — целиком). Возвращает число строк.
+        Текущий день не сворачивается: он ещё не закрыт, и closed_until() не должен его покрывать.
+        """
+        yesterday = timezone.localdate() - timedelta(days=1)
+        date_to = min(date_to, yesterday) if date_to else yesterday
+        rentals = Rental.objects.all()
+        rollup = cls.objects.all()
+        if date_from:
+            rentals = rentals.filter(actual_return_date__date__gte=date_from)
+            rollup = rollup.filter(day__gte=date_from)
+        rentals = rentals.filter(actual_return_date__date__lte=date_to)
+        rollup = rollup.filter(day__lte=date_to)
+
+        rows = [
+            cls(owner_id=row['inventory__owner_id'], day=row['day'],
+                gross=row['gross'] or Decimal('0'), rentals_count=row['rentals_count'])
+            for row in cls.aggregate_rentals(rentals)
+        ]
+        with transaction.atomic():
+            rollup.delete()
+            cls.objects.bulk_create(rows)
+        return len(rows)
+
+
 class Contract(models.Model):
     """Договоры аренды."""
 
@@ -285,7 +447,7 @@ class Contract(models.Model):
         ('cancelled', 'Отменен'),
     ]
 
-    contract_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    contract_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     rental = models.OneToOneField(Rental, on_delete=models.CASCADE, related_name='contract', verbose_name='Аренда')
 
     contract_number = models.CharField(max_length=50, unique=True, verbose_name='Номер договора')
@@ -325,7 +487,7 @@ class DamageReport(models.Model):
         ('disputed', 'Оспаривается'),
     ]
 
-    report_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    report_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     rental = models.ForeignKey(Rental, on_delete=models.CASCADE, related_name='damage_reports', verbose_name='Аренда')
     inventory = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='damage_reports',
                                   verbose_name='Инвентарь')
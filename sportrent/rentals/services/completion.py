@@ -0,0 +1,76 @@
+"""
+Завершение аренды одним SQL-запросом.
+
+Что здесь:
+- complete_rental(): переводит аренду в completed и в том же выражении возвращает
+  инвентарь в доступные, начисляет клиенту аренду и баллы, владельцу — заработок
+  по проценту из его строки. Четыре UPDATE сведены в один WITH-запрос
+  (data-modifying CTE PostgreSQL) — один round trip вместо четырёх, пока держится
+  блокировка строки аренды.
+
+Связано с:
+- rentals/views.py: rental_complete (блокировка lock_rental_or_busy и сообщения)
+- inventory/services/facets.py: сброс кэша фасетов — сигнал post_save Inventory здесь не срабатывает
+- core/fields.py: SmallIntChoicesField — коды статусов берутся из поля, а не пишутся числами
+
+Ключевые слова: завершение аренды, CTE, UPDATE, счётчики, заработок владельца
+"""
+
+from django.db import connection
+
+from inventory.models import Inventory
+from inventory.services.facets import invalidate_catalog_facets
+from rentals.models import Rental
+
+# Баллы лояльности клиенту за завершённую аренду
+LOYALTY_POINTS_PER_RENTAL = 10
+
+_COMPLETE_RENTAL_SQL = """
+WITH r AS (
+    UPDATE rentals
+    SET status = %(completed)s, actual_return_date = %(now)s, updated_date = %(now)s
+    WHERE rental_id = %(rental_id)s AND status IN (%(confirmed)s, %(active)s)
+    RETURNING inventory_id, client_id, total_price
+), i AS (
+    UPDATE inventory
+    SET status = %(available)s, total_rentals = inventory.total_rentals + 1, updated_date = %(now)s
+    FROM r
+    WHERE inventory.inventory_id = r.inventory_id
+    RETURNING inventory.owner_id
+), c AS (
+    UPDATE clients
+    SET total_rentals = clients.total_rentals + 1, loyalty_points = clients.loyalty_points + %(points)s
+    FROM r
+    WHERE clients.client_id = r.client_id
+), o AS (
+    UPDATE owners
+    SET total_earnings = owners.total_earnings + r.total_price * owners.current_owner_percentage / 100
+    FROM r, i
+    WHERE owners.owner_id = i.owner_id
+)
+SELECT count(*) FROM r
+"""
+
+
+def complete_rental(rental_id, now):
+    """
+    Завершает аренду в статусе confirmed/active со всеми начислениями (вызывать внутри atomic).
+    Возвращает False, если аренда уже не в этих статусах — тогда ничего не меняется:
+    повторная отправка формы не начислит баллы и заработок дважды.
+    """
+    rental_status = Rental._meta.get_field('status')
+    with connection.cursor() as cursor:
+        cursor.execute(_COMPLETE_RENTAL_SQL, {
+            'rental_id': rental_id,
+            'now': now,
+            'completed': rental_status.get_prep_value('completed'),
+            'confirmed': rental_status.get_prep_value('confirmed'),
+            'active': rental_status.get_prep_value('active'),
+            'available': Inventory._meta.get_field('status').get_prep_value('available'),
+            'points': LOYALTY_POINTS_PER_RENTAL,
+        })
+        completed = cursor.fetchone()[0] == 1
+    if completed:
+        # Статус инвентаря изменён мимо save() — счётчики каталога сбрасываем сами
+        invalidate_catalog_facets()
+    return completed
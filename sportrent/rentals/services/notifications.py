@@ -0,0 +1,43 @@
+"""
+Push-уведомления об изменении статуса аренды (NotificationConsumer, группа user_<id>).
+Отправка откладывается до коммита транзакции (transaction.on_commit): уведомление
+уходит только если смена статуса действительно записана, и не держит открытой
+транзакцию с блокировкой строки аренды. Недоступный Redis не ломает запрос —
+ошибка только пишется в лог.
+"""
+
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.urls import reverse
+
+logger = logging.getLogger('rentals')
+
+
+def _send(user_ids, message):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    for user_id in user_ids:
+        try:
+            async_to_sync(channel_layer.group_send)(
+                f'user_{user_id}',
+                {'type': 'notify.message', 'message': message},
+            )
+        except Exception as e:
+            logger.warning('Не удалось отправить уведомление пользователю %s: %s', user_id, e)
+
+
+def notify_rental_status(rental, user_ids, title):
+    """Ставит уведомление title получателям user_ids после коммита текущей транзакции."""
+    user_ids = [user_id for user_id in user_ids if user_id]
+    if not user_ids:
+        return
+    message = {
+        'title': title,
+        'body': rental.inventory.name,
+        'url': reverse('rentals:detail', args=[rental.rental_id]),
+    }
+    transaction.on_commit(lambda: _send(user_ids, message))
@@ -0,0 +1,45 @@
+"""
+Сигналы поддержки счётчика выручки RevenueCounter.
+Паттерн «Наблюдатель»: Payment (издатель) → изменение RevenueCounter (подписчик).
+В счётчик попадают только платежи в статусе completed.
+"""
+
+import logging
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Payment, RevenueCounter
+
+logger = logging.getLogger('rentals')
+
+
+def _revenue_of(status, amount):
+    return amount if status == 'completed' else 0
+
+
+@receiver(pre_save, sender=Payment)
+def remember_revenue_before_save(sender, instance, **kwargs):
+    """Запоминает вклад платежа в выручку до изменения (только для существующих записей)."""
+    instance._revenue_before = 0
+    if instance._state.adding:
+        return
+    previous = Payment.objects.filter(pk=instance.pk).values_list('status', 'amount').first()
+    if previous:
+        instance._revenue_before = _revenue_of(*previous)
+
+
+@receiver(post_save, sender=Payment)
+def update_revenue_on_payment_save(sender, instance, **kwargs):
+    """Прибавляет к выручке разницу между новым и прежним вкладом платежа."""
+    delta = _revenue_of(instance.status, instance.amount) - getattr(instance, '_revenue_before', 0)
+    if delta:
+        RevenueCounter.add(delta)
+        logger.debug('Выручка изменена на %s по платежу %s', delta, instance.pk)
+
+
+@receiver(post_delete, sender=Payment)
+def update_revenue_on_payment_delete(sender, instance, **kwargs):
+    """Вычитает из выручки удалённый завершённый платёж."""
+    amount = _revenue_of(instance.status, instance.amount)
+    if amount:
+        RevenueCounter.add(-amount)
@@ -1,3 +1,225 @@
+"""
+Тесты для приложения rentals.
+Проверяет паттерн Наблюдатель: сигналы на Payment поддерживают счётчик выручки RevenueCounter,
+свёртку заработка владельцев OwnerEarningsDaily (дни после последнего свёрнутого — на лету),
+то, что число запросов списка аренд не зависит от количества строк (и повторный заход без изменений — 304),
+и смену статуса аренды условным UPDATE (завершение начисляет счётчики один раз,
+заблокированная параллельным запросом строка не меняется, уведомление уходит после коммита).
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from users.models import BankAccount, User, Client, Owner, Manager
+from inventory.models import Inventory, SportCategory
+from rentals.models import OwnerEarningsDaily, Payment, Rental, RevenueCounter
+
+
+def _make_rental():
+    owner = Owner.objects.create(
+        user=User.objects.create_user(email='owner@test.com', password='Pass1234!', role='owner'),
+        full_name='Тест Владелец',
+    )
+    client = Client.objects.create(
+        user=User.objects.create_user(email='client@test.com', password='Pass1234!', role='client'),
+        full_name='Тест Клиент',
+    )
+    manager = Manager.objects.create(
+        user=User.objects.create_user(email='manager@test.com', password='Pass1234!', role='manager'),
+        full_name='Тест Менеджер',
+    )
+    inventory = Inventory.objects.create(
+        owner=owner,
+        category=SportCategory.objects.create(name='Велосипеды'),
+        name='Тестовый велосипед',
+        description='Описание',
+        price_per_day=Decimal('500.00'),
+        status='available',
+    )
+    now = timezone.now()
+    return Rental.objects.create(
+        inventory=inventory,
+        client=client,
+        manager=manager,
+        start_date=now,
+        end_date=now,
+        total_price=Decimal('500.00'),
+    )
+
+
+class RevenueCounterSignalTest(TestCase):
+    """Выручка меняется только за счёт завершённых платежей."""
+
+    def setUp(self):
+        self.rental = _make_rental()
+
+    def _pay(self, amount, status='completed'):
+        return Payment.objects.create(
+            rental=self.rental, amount=Decimal(amount), payment_method='online', status=status,
+        )
+
+    def test_completed_payment_increases_revenue(self):
+        self._pay('500.00')
+        self._pay('100.00', status='pending')
+        self.assertEqual(RevenueCounter.get_total(), Decimal('500.00'))
+
+    def test_status_change_and_delete_are_tracked(self):
+        payment = self._pay('300.00', status='pending')
+        payment.status = 'completed'
+        payment.save()
+        self.assertEqual(RevenueCounter.get_total(), Decimal('300.00'))
+
+        payment.status = 'refunded'
+        payment.save()
+        self.assertEqual(RevenueCounter.get_total(), Decimal('0.00'))
+
+        completed = self._pay('200.00')
+        completed.delete()
+        self.assertEqual(RevenueCounter.get_total(), Decimal('0.00'))
+
+    def test_counter_matches_rebuild(self):
+        self._pay('250.00')
+        self._pay('50.00')
+        self.assertEqual(RevenueCounter.get_total(), RevenueCounter.rebuild())
+
+
+class OwnerEarningsDailyTest(TestCase):
+    """rebuild() сворачивает завершённые аренды по владельцу и дню возврата."""
+
+    def test_rebuild_groups_completed_rentals_by_day(self):
+        rental = _make_rental()
+        yesterday = timezone.now() - timedelta(days=1)
+        Rental.objects.filter(pk=rental.pk).update(status='completed', actual_return_date=yesterday)
+        for total_price, status in (('300.00', 'completed'), ('900.00', 'active')):
+            Rental.objects.create(
+                inventory=rental.inventory, client=rental.client, manager=rental.manager,
+                start_date=yesterday, end_date=yesterday, actual_return_date=yesterday,
+                total_price=Decimal(total_price), status=status,
+            )
+
+        self.assertEqual(OwnerEarningsDaily.rebuild(), 1)
+        row = OwnerEarningsDaily.objects.get()
+        self.assertEqual(row.owner_id, rental.inventory.owner_id)
+        self.assertEqual(row.day, timezone.localdate(yesterday))
+        self.assertEqual(row.gross, Decimal('800.00'))
+        self.assertEqual(row.rentals_count, 2)
+
+    def test_days_after_rollup_counted_live(self):
+        """До ночного пересчёта вчерашний заработок считается на лету, текущий день не сворачивается."""
+        rental = _make_rental()
+        owner = rental.inventory.owner
+        returned = timezone.now() - timedelta(days=1)
+        closed_day = timezone.localdate(returned) - timedelta(days=1)
+        OwnerEarningsDaily.objects.create(owner=owner, day=closed_day, gross=Decimal('100.00'), rentals_count=1)
+        Rental.objects.filter(pk=rental.pk).update(status='completed', actual_return_date=returned)
+
+        self.client.force_login(owner.user)
+        response = self.client.get(reverse('inventory:owner_earnings'))
+        days = {row['day']: row['rentals_count'] for row in response.context['earnings_by_day']}
+        self.assertEqual(days, {closed_day: 1, timezone.localdate(returned): 1})
+
+        Rental.objects.filter(pk=rental.pk).update(actual_return_date=timezone.now())
+        self.assertEqual(OwnerEarningsDaily.rebuild(), 0)
+
+
+class RentalListQueriesTest(TestCase):
+    """rental_list: связи подгружаются JOIN-ом, а не запросом на каждую строку."""
+
+    def setUp(self):
+        self.rental = _make_rental()
+
+    def _add_rentals(self, count):
+        for _ in range(count):
+            Rental.objects.create(
+                inventory=self.rental.inventory, client=self.rental.client, manager=self.rental.manager,
+                start_date=self.rental.start_date, end_date=self.rental.end_date, total_price=Decimal('100.00'),
+            )
+
+    def _query_count(self, user):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('rentals:list'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_independent_of_rows(self):
+        users = (
+            self.rental.client.user,
+            self.rental.manager.user,
+            self.rental.inventory.owner.user,
+        )
+        baseline = [self._query_count(user) for user in users]
+        self._add_rentals(5)
+        self.assertEqual([self._query_count(user) for user in users], baseline)
+
+    def test_not_modified_until_rental_changes(self):
+        self.client.force_login(self.rental.client.user)
+        url = reverse('rentals:list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Rental.objects.filter(pk=self.rental.pk).update(status='cancelled', updated_date=timezone.now())
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class RentalStatusTransitionTest(TestCase):
+    """Подтверждение и отмена меняют статус одним UPDATE с условием на исходный статус."""
+
+    def setUp(self):
+        self.rental = _make_rental()
+        Rental.objects.filter(pk=self.rental.pk).update(status='pending', payment_status='paid')
+
+    def test_confirm_then_cancel(self):
+        self.client.force_login(self.rental.manager.user)
+        self.client.post(reverse('rentals:confirm', args=[self.rental.pk]))
+        self.rental.refresh_from_db()
+        self.assertEqual((self.rental.status, self.rental.manager_id), ('confirmed', self.rental.manager.pk))
+        self.assertEqual(Inventory.objects.get(pk=self.rental.inventory_id).status, 'rented')
+
+        self.client.post(reverse('rentals:cancel', args=[self.rental.pk]))
+        self.rental.refresh_from_db()
+        self.assertEqual(self.rental.status, 'cancelled')
+        self.assertEqual(Inventory.objects.get(pk=self.rental.inventory_id).status, 'available')
+
+        # Повторное подтверждение отменённой аренды ничего не меняет
+        self.client.post(reverse('rentals:confirm', args=[self.rental.pk]))
+        self.rental.refresh_from_db()
+        self.assertEqual(self.rental.status, 'cancelled')
+
+    def test_complete_credits_once(self):
+        owner = self.rental.inventory.owner
+        BankAccount.objects.create(owner=owner, bank_name='Банк', account_number='4081-7810-0000-0001', recipient_name='Владелец')
+        Rental.objects.filter(pk=self.rental.pk).update(status='active')
+        self.client.force_login(self.rental.manager.user)
+        for _ in range(2):
+            self.client.post(reverse('rentals:complete', args=[self.rental.pk]))
+
+        self.rental.refresh_from_db()
+        self.assertEqual(self.rental.status, 'completed')
+        inventory = Inventory.objects.get(pk=self.rental.inventory_id)
+        self.assertEqual((inventory.status, inventory.total_rentals), ('available', 1))
+        client = Client.objects.get(pk=self.rental.client_id)
+        self.assertEqual((client.total_rentals, client.loyalty_points), (1, 10))
+        self.assertEqual(Owner.objects.get(pk=owner.pk).total_earnings, Decimal('350.00'))
+
+    def test_confirm_notifies_client_after_commit(self):
+        self.client.force_login(self.rental.manager.user)
+        with mock.patch('rentals.services.notifications._send') as send:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('rentals:confirm', args=[self.rental.pk]))
+        send.assert_called_once()
+        self.assertEqual(send.call_args.args[0], [self.rental.client.user_id])
 
-# Create your tests here.
+    def test_locked_rental_is_left_alone(self):
+        # Строку держит параллельный запрос — SKIP LOCKED ничего не вернул
+        self.client.force_login(self.rental.manager.user)
+        with mock.patch('rentals.views.lock_rental_or_busy', return_value=False):
+            self.client.post(reverse('rentals:confirm', args=[self.rental.pk]))
+        self.rental.refresh_from_db()
+        self.assertEqual(self.rental.status, 'pending')
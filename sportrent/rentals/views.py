@@ -18,10 +18,12 @@ Views управления арендой — создание, статус-м
 - payments/views.py: create_payment — фактическая оплата через ЮКассу
 - rentals/models.py: Rental, Reservation, Contract, PaymentHistory
 - contracts/generator.py: generate_rental_contract() при подтверждении
+- rentals/services/notifications.py: push-уведомления сторонам после смены статуса
 
 Ключевые слова: аренда, бронирование, продление, статус, чекбокс, договор
 """
 
+import hashlib
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -29,21 +31,50 @@ from decimal import Decimal
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Exists, Max, OuterRef, Q
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
 
 from .forms import RentalBankAccountForm, RentalCreateForm, RentalUpdateForm
 from .forms import ReservationCreateForm
 from .models import Contract, Payment, PaymentHistory, Rental, Reservation
+from .services.completion import complete_rental
+from .services.notifications import notify_rental_status
+from core.pagination import CachedCountPaginator
 from inventory.models import Inventory
-from users.models import Client, Manager
+from users.models import Manager
+from users.backends import profile_relations
 
 logger = logging.getLogger('rentals')
 
+# Владельцу запросы (inquiry) не показываются — в фильтре списка их тоже нет
+OWNER_STATUS_CHOICES = tuple(choice for choice in Rental.STATUS_CHOICES if choice[0] != 'inquiry')
+
+# Список аренд по ролям: роль → (атрибут профиля, сообщение при его отсутствии,
+# сужение общей выборки по профилю, варианты фильтра статуса)
+RENTAL_LIST_SCOPES = {
+    'client': (
+        'client_profile', 'Профиль клиента не найден',
+        lambda qs, client: qs.filter(client=client),
+        Rental.STATUS_CHOICES,
+    ),
+    'manager': (
+        'manager_profile', 'Профиль менеджера не найден',
+        lambda qs, manager: qs if manager.is_super_manager else qs.filter(manager=manager),
+        Rental.STATUS_CHOICES,
+    ),
+    'owner': (
+        'owner_profile', 'Профиль владельца не найден',
+        lambda qs, owner: qs.filter(inventory__owner=owner).exclude(status='inquiry'),
+        OWNER_STATUS_CHOICES,
+    ),
+    'administrator': (None, None, lambda qs, profile: qs, Rental.STATUS_CHOICES),
+}
+
 
 def get_primary_manager_profile() -> Manager:
     """
@@ -53,69 +84,100 @@ def get_primary_manager_profile() -> Manager:
     return Manager.objects.filter(user__email='manager1@sportrent.ru').first() or Manager.objects.first()
 
 
-@login_required
-def rental_list(request):
-    """
-    Список аренд пользователя с фильтрацией по статусу.
-    """
-    user = request.user
-
-    # Определяем queryset в зависимости от роли
-    if user.role == 'client':
-        if not hasattr(user, 'client_profile'):
-            messages.error(request, 'Профиль клиента не найден')
-            return redirect('users:profile')
+RENTAL_BUSY_MESSAGE = 'Заявка уже обрабатывается. Обновите страницу через несколько секунд.'
 
-        rentals = Rental.objects.filter(
-            client=user.client_profile
-        ).select_related('inventory', 'inventory__category', 'manager').order_by('-created_date')
-        status_choices = Rental.STATUS_CHOICES
 
-    elif user.role == 'manager':
-        if not hasattr(user, 'manager_profile'):
-            messages.error(request, 'Профиль менеджера не найден')
-            return redirect('users:profile')
-
-        mp = user.manager_profile
-        base_qs = Rental.objects.select_related('inventory', 'client', 'client__user').order_by('-created_date')
-        rentals = base_qs if mp.is_super_manager else base_qs.filter(manager=mp)
-        status_choices = Rental.STATUS_CHOICES
-
-    elif user.role == 'owner':
-        if not hasattr(user, 'owner_profile'):
-            messages.error(request, 'Профиль владельца не найден')
-            return redirect('users:profile')
-
-        rentals = Rental.objects.filter(
-            inventory__owner=user.owner_profile
-        ).select_related('inventory', 'client', 'client__user', 'manager').order_by('-created_date')
-        rentals = rentals.exclude(status='inquiry')
-        status_choices = [choice for choice in Rental.STATUS_CHOICES if choice[0] != 'inquiry']
+def lock_rental_or_busy(pk) -> bool:
+    """
+    Блокирует строку аренды до конца текущей транзакции (вызывать внутри atomic).
+    SKIP LOCKED: если строку держит параллельный запрос (двойной клик, второй менеджер),
+    сразу возвращает False вместо ожидания — воркер не простаивает на блокировке.
+    """
+    return Rental.objects.select_for_update(skip_locked=True).filter(pk=pk).values_list('pk', flat=True).first() is not None
 
-    elif user.role == 'administrator':
-        rentals = Rental.objects.all().select_related(
-            'inventory', 'client', 'client__user', 'manager'
-        ).order_by('-created_date')
-        status_choices = Rental.STATUS_CHOICES
-    else:
-        messages.error(request, 'Недостаточно прав для просмотра аренд')
-        return redirect('core:home')
 
+def _filter_rental_list(rentals, user, params):
+    """Поиск (для менеджера) и фильтр по статусу rental_list — общие для страницы и её ETag."""
     # Поиск для менеджера
-    search_query = request.GET.get('search', '').strip()
+    search_query = params.get('search', '').strip()
     if search_query and user.role == 'manager':
+        # icontains на PostgreSQL обслуживают триграммные GIN-индексы
+        # (users/0013_full_name_trgm_indexes, inventory/0013_inventory_search_trgm_indexes)
         rentals = rentals.filter(
             Q(client__full_name__icontains=search_query) |
             Q(inventory__name__icontains=search_query)
         )
-    
+
     # Фильтрация по статусу
-    status = request.GET.get('status')
+    status = params.get('status')
     if status:
         rentals = rentals.filter(status=status)
+    return rentals, search_query, status
+
+
+def _rental_list_etag(request):
+    """
+    ETag списка аренд: пользователь + MAX(updated_date) и COUNT(*) его выборки с фильтрами.
+    Повторный заход без изменений получает 304 без JOIN-ов и рендера шаблона.
+    Пока в сессии висят flash-сообщения, ETag не отдаём: 304 их бы «проглотил».
+    Роль без доступа или без профиля — тоже без ETag, view сам сделает редирект.
+    """
+    user = request.user
+    if len(messages.get_messages(request)):
+        return None
+    scope = RENTAL_LIST_SCOPES.get(user.role)
+    if scope is None:
+        return None
+    profile_attr, _, narrow, _ = scope
+    profile = getattr(user, profile_attr, None) if profile_attr else None
+    if profile_attr and profile is None:
+        return None
+    rentals, _, _ = _filter_rental_list(narrow(Rental.objects.all(), profile), user, request.GET)
+    stats = rentals.aggregate(last=Max('updated_date'), total=Count('pk'))
+    last = stats['last'].timestamp() if stats['last'] else 0
+    return f'{user.pk}-{last}-{stats["total"]}'
+
+
+@login_required
+@cache_control(private=True)
+@etag(_rental_list_etag)
+def rental_list(request):
+    """
+    Список аренд пользователя с фильтрацией по статусу.
+    """
+    user = request.user
+
+    # Связи, которые выводит rental_list.html (инвентарь, клиент, менеджер), — одним JOIN для всех ролей;
+    # роль только сужает выборку, поэтому число запросов не растёт с количеством строк на странице.
+    # .only() — ровно те столбцы, что рендерит шаблон (при правке шаблона дополнять список)
+    base_qs = Rental.objects.select_related('inventory', 'client', 'manager').only(
+        'rental_id', 'status', 'payment_status', 'start_date', 'end_date', 'total_price', 'additional_payment',
+        'inventory__name', 'inventory__image', 'client__full_name', 'manager__full_name',
+    ).order_by('-created_date')
+
+    # Определяем queryset в зависимости от роли
+    scope = RENTAL_LIST_SCOPES.get(user.role)
+    if scope is None:
+        messages.error(request, 'Недостаточно прав для просмотра аренд')
+        return redirect('core:home')
 
-    # Пагинация
-    paginator = Paginator(rentals, 10)
+    profile_attr, missing_profile_message, narrow, status_choices = scope
+    profile = getattr(user, profile_attr, None) if profile_attr else None
+    if profile_attr and profile is None:
+        messages.error(request, missing_profile_message)
+        return redirect('users:profile')
+    rentals = narrow(base_qs, profile)
+
+    rentals, search_query, status = _filter_rental_list(rentals, user, request.GET)
+
+    # Пагинация: общее количество приходит вместе со строками страницы (COUNT(*) OVER ()),
+    # у менеджеров, владельцев и администраторов оно ещё и кэшируется на COUNT_CACHE_TTL.
+    # Клиент свою новую заявку должен видеть сразу, а выборка у него маленькая — без кэша.
+    count_cache_key = None
+    if user.role != 'client':
+        search_hash = hashlib.blake2b(search_query.encode(), digest_size=8).hexdigest()
+        count_cache_key = f'rental_count:{user.pk}:{user.role}:{status or ""}:{search_hash}'
+    paginator = CachedCountPaginator(rentals, 10, count_cache_key=count_cache_key, window_count=True)
     page_number = request.GET.get('page', 1)
     page_obj = paginator.get_page(page_number)
 
@@ -134,13 +196,21 @@ def rental_detail(request, pk):
     """
     Детальная информация об аренде.
     """
-    rental = get_object_or_404(
-        Rental.objects.select_related('inventory', 'client', 'client__user', 'manager'),
-        pk=pk
+    user = request.user
+
+    # contract (обратный OneToOne) и категория инвентаря — тем же JOIN, без отдельных запросов
+    rental_qs = Rental.objects.select_related(
+        'inventory', 'inventory__category', 'client', 'client__user', 'manager', 'contract'
     )
+    if user.role == 'client':
+        # Оставлял ли клиент отзыв — EXISTS в том же запросе, а не отдельным запросом ниже
+        from reviews.models import Review
+        rental_qs = rental_qs.annotate(has_review=Exists(
+            Review.objects.filter(rental=OuterRef('pk'), reviewer=user, target_type='inventory')
+        ))
+    rental = get_object_or_404(rental_qs, pk=pk)
 
     # Проверка прав доступа
-    user = request.user
     has_access = False
 
     if user.role == 'client' and hasattr(user, 'client_profile'):
@@ -149,7 +219,7 @@ def rental_detail(request, pk):
         mp = user.manager_profile
         has_access = mp.is_super_manager or rental.manager == mp
     elif user.role == 'owner' and hasattr(user, 'owner_profile'):
-        has_access = rental.inventory.owner == user.owner_profile
+        has_access = rental.inventory.owner_id == user.owner_profile.pk
     elif user.role == 'administrator':
         has_access = True
 
@@ -161,8 +231,8 @@ def rental_detail(request, pk):
         messages.info(request, 'Запросы по инвентарю отображаются только в чатах')
         return redirect('rentals:list')
 
-    # Получаем связанные данные
-    payments = rental.payments.all().order_by('-payment_date')
+    # Получаем связанные данные (платежи уже упорядочены Payment.Meta.ordering)
+    payments = rental.payments.all()
     contract = getattr(rental, 'contract', None)
 
     # Может ли менеджер завершить аренду (у владельца есть реквизиты в профиле)
@@ -170,7 +240,7 @@ def rental_detail(request, pk):
     owner_bank_account = None
     if user.role == 'manager' and rental.status in ('confirmed', 'active'):
         from users.models import BankAccount
-        owner_accounts = BankAccount.objects.filter(owner=rental.inventory.owner)
+        owner_accounts = BankAccount.objects.filter(owner_id=rental.inventory.owner_id)
         can_complete_rental = owner_accounts.exists()
         owner_bank_account = owner_accounts.order_by('-is_default').first()
 
@@ -178,17 +248,11 @@ def rental_detail(request, pk):
     can_leave_review = False
     if user.role == 'client' and hasattr(user, 'client_profile') and rental.client == user.client_profile:
         if rental.status == 'completed' and rental.total_price > 0:
-            from reviews.models import Review
-            has_review = Review.objects.filter(
-                rental=rental,
-                reviewer=user,
-                target_type='inventory'
-            ).exists()
-            can_leave_review = not has_review
+            can_leave_review = not rental.has_review
 
     pay_total = rental.total_price + (rental.deposit_paid or Decimal('0'))
     payment_history = (
-        rental.payment_history.select_related('paid_to_manager').all()
+        rental.payment_history.select_related('paid_to_manager', *profile_relations('paid_to_manager')).all()
         if user.role in ('manager', 'administrator')
         else None
     )
@@ -249,8 +313,7 @@ def rental_create(request, inventory_id):
                         rental.manager = inventory.manager or primary_manager
 
                         # Рассчитываем стоимость
-                        rental_days = (rental.end_date - rental.start_date).days
-                        rental.total_price = inventory.price_per_day * rental_days
+                        rental.total_price = Rental.calculate_total_price(inventory, rental.start_date, rental.end_date)
                         rental.deposit_paid = inventory.deposit_amount
 
                         rental.status = 'pending'
@@ -275,9 +338,10 @@ def rental_create(request, inventory_id):
                     messages.error(request, 'Произошла ошибка при создании заявки')
     else:
         # Предзаполняем форму
+        now = timezone.now()
         initial = {
-            'start_date': timezone.now().date(),
-            'end_date': (timezone.now() + timedelta(days=inventory.min_rental_days)).date(),
+            'start_date': now.date(),
+            'end_date': (now + timedelta(days=inventory.min_rental_days)).date(),
         }
         form = RentalCreateForm(initial=initial, inventory=inventory, client=client)
 
@@ -322,9 +386,10 @@ def reservation_create(request, inventory_id):
             messages.success(request, 'Бронь оформлена. Товар закреплён за вами на выбранный период.')
             return redirect('rentals:reserve_detail', pk=reservation.reservation_id)
     else:
+        now = timezone.now()
         initial = {
-            'start_date': timezone.now().date(),
-            'end_date': (timezone.now() + timedelta(days=inventory.min_rental_days)).date(),
+            'start_date': now.date(),
+            'end_date': (now + timedelta(days=inventory.min_rental_days)).date(),
         }
         form = ReservationCreateForm(initial=initial, inventory=inventory)
 
@@ -363,9 +428,9 @@ def reservation_quick_create(request, inventory_id):
         )
 
     # Просроченные брони больше не должны блокировать товар
-    Reservation.objects.filter(status='active', end_date__lte=timezone.now()).update(status='expired')
-
     start_dt = timezone.now()
+    Reservation.objects.filter(status='active', end_date__lte=start_dt).update(status='expired')
+
     end_dt = start_dt + timedelta(minutes=30)
 
     # Уже есть ваша активная бронь на этот товар, пересекающаяся с новым окном
@@ -522,7 +587,8 @@ def reservation_rent(request, pk):
         messages.warning(request, 'Эта бронь уже неактуальна')
         return redirect('rentals:reserve_detail', pk=pk)
 
-    if reservation.end_date <= timezone.now():
+    now = timezone.now()
+    if reservation.end_date <= now:
         reservation.status = 'expired'
         reservation.save(update_fields=['status'])
         messages.warning(request, 'Эта бронь истекла')
@@ -537,7 +603,7 @@ def reservation_rent(request, pk):
         return redirect('rentals:reserve_detail', pk=pk)
 
     # На всякий случай блокируем пересечение с бронями других клиентов.
-    conflict_end_gt = max(timezone.now(), reservation.start_date)
+    conflict_end_gt = max(now, reservation.start_date)
     conflict = Reservation.objects.filter(
         inventory=inventory,
         status='active',
@@ -564,7 +630,7 @@ def reservation_rent(request, pk):
             manager=inventory.manager or primary_manager,
             start_date=reservation.start_date,
             end_date=reservation.end_date,
-            total_price=inventory.price_per_day * rental_days,
+            total_price=Rental.calculate_total_price(inventory, reservation.start_date, reservation.end_date),
             deposit_paid=inventory.deposit_amount,
             notes=reservation.notes,
             status='pending',
@@ -590,7 +656,7 @@ def rental_confirm(request, pk):
     """
     Подтверждение аренды менеджером. Доступно только после оплаты клиентом.
     """
-    rental = get_object_or_404(Rental, pk=pk)
+    rental = get_object_or_404(Rental.objects.select_related('inventory', 'client'), pk=pk)
 
     if request.user.role != 'manager':
         messages.error(request, 'Недостаточно прав')
@@ -611,6 +677,10 @@ def rental_confirm(request, pk):
     if request.method == 'POST':
         try:
             with transaction.atomic():
+                if not lock_rental_or_busy(pk):
+                    messages.info(request, RENTAL_BUSY_MESSAGE)
+                    return redirect('rentals:detail', pk=pk)
+
                 # Если появилась бронь другого клиента на пересекающиеся даты — не подтверждаем.
                 conflict_end_gt = max(timezone.now(), rental.start_date)
                 conflict_reservation = Reservation.objects.filter(
@@ -623,13 +693,19 @@ def rental_confirm(request, pk):
                     messages.error(request, 'Подтверждение невозможно: на выбранный период появилась активная бронь другого клиента')
                     return redirect('rentals:detail', pk=pk)
 
-                rental.status = 'confirmed'
-                rental.manager = request.user.manager_profile
-                rental.save()
+                # UPDATE только изменённых столбцов с условием на исходный статус: если заявку
+                # параллельно отклонили или подтвердили, ничего не меняем
+                updated = Rental.objects.filter(pk=pk, status='pending', payment_status='paid').update(
+                    status='confirmed', manager=request.user.manager_profile, updated_date=timezone.now()
+                )
+                if not updated:
+                    messages.warning(request, 'Эта аренда уже обработана')
+                    return redirect('rentals:detail', pk=pk)
 
+                # save(update_fields) — чтобы сработали updated_date и сигнал сброса фасетов каталога
                 inventory = rental.inventory
                 inventory.status = 'rented'
-                inventory.save()
+                inventory.save(update_fields=['status', 'updated_date'])
 
                 # Конвертируем активные брони этого клиента в рамках периода аренды.
                 Reservation.objects.filter(
@@ -641,6 +717,7 @@ def rental_confirm(request, pk):
                 ).update(status='converted')
 
                 logger.info(f'Аренда подтверждена: {rental.rental_id} менеджером {request.user.email}')
+                notify_rental_status(rental, [rental.client.user_id], 'Аренда подтверждена')
                 messages.success(request, 'Аренда успешно подтверждена')
 
         except Exception as e:
@@ -690,7 +767,7 @@ def rental_reject(request, pk):
     """
     Отклонение аренды менеджером.
     """
-    rental = get_object_or_404(Rental, pk=pk)
+    rental = get_object_or_404(Rental.objects.select_related('inventory', 'client'), pk=pk)
 
     # Только менеджер может отклонять
     if request.user.role != 'manager':
@@ -706,11 +783,19 @@ def rental_reject(request, pk):
 
         try:
             with transaction.atomic():
-                rental.status = 'rejected'
-                rental.rejection_reason = reason
-                rental.save()
+                if not lock_rental_or_busy(pk):
+                    messages.info(request, RENTAL_BUSY_MESSAGE)
+                    return redirect('rentals:detail', pk=pk)
+
+                updated = Rental.objects.filter(pk=pk, status='pending').update(
+                    status='rejected', rejection_reason=reason, updated_date=timezone.now()
+                )
+                if not updated:
+                    messages.warning(request, 'Эта аренда уже обработана')
+                    return redirect('rentals:detail', pk=pk)
 
                 logger.info(f'Аренда отклонена: {rental.rental_id} причина: {reason}')
+                notify_rental_status(rental, [rental.client.user_id], 'Аренда отклонена')
                 messages.info(request, 'Аренда отклонена')
 
         except Exception as e:
@@ -726,7 +811,7 @@ def rental_complete(request, pk):
     Завершение аренды (возврат инвентаря) с возможностью выплаты владельцу.
     """
     rental = get_object_or_404(
-        Rental.objects.select_related('inventory', 'inventory__owner', 'inventory__bank_account'),
+        Rental.objects.select_related('inventory', 'inventory__owner', 'inventory__bank_account', 'client'),
         pk=pk
     )
 
@@ -739,8 +824,11 @@ def rental_complete(request, pk):
         messages.warning(request, 'Эта аренда не может быть завершена')
         return redirect('rentals:detail', pk=pk)
 
+    # Счёт для выплаты берём из профиля владельца один раз — и для проверки, и для сообщения,
+    # чтобы внутри транзакции с блокировкой аренды оставались только UPDATE
     from users.models import BankAccount
-    if not BankAccount.objects.filter(owner=rental.inventory.owner).exists():
+    bank_account = BankAccount.objects.filter(owner_id=rental.inventory.owner_id).order_by('-is_default').first()
+    if bank_account is None:
         messages.error(
             request,
             'Завершение невозможно: у владельца нет банковских реквизитов в профиле.'
@@ -750,42 +838,26 @@ def rental_complete(request, pk):
     if request.method == 'POST':
         try:
             with transaction.atomic():
-                rental.status = 'completed'
-                rental.actual_return_date = timezone.now()
-                rental.save()
+                if not lock_rental_or_busy(pk):
+                    messages.info(request, RENTAL_BUSY_MESSAGE)
+                    return redirect('rentals:detail', pk=pk)
 
-                # Возвращаем инвентарь в доступные
-                inventory = rental.inventory
-                inventory.status = 'available'
-                inventory.total_rentals += 1
-                inventory.save()
-
-                # Начисляем баллы клиенту
-                client = rental.client
-                client.total_rentals += 1
-                client.loyalty_points += 10  # 10 баллов за аренду
-                client.save()
-
-                # Выплата владельцу — счёт берём из профиля владельца
-                from users.models import BankAccount, OwnerAgreement
-                bank_account = BankAccount.objects.filter(owner=inventory.owner).order_by('-is_default').first()
-                agreement = OwnerAgreement.objects.filter(
-                    owner=inventory.owner,
-                    is_accepted=True
-                ).order_by('-created_date').first()
-                owner_pct = agreement.owner_percentage if agreement else 70
-                owner_amount = (rental.total_price * owner_pct) / 100
-                owner = inventory.owner
-                owner.total_earnings += owner_amount
-                owner.save()
+                # Аренда, инвентарь, клиент и владелец — одним запросом (WITH … UPDATE) с условием
+                # на исходный статус: повторная отправка формы не начислит баллы и заработок дважды
+                if not complete_rental(pk, timezone.now()):
+                    messages.warning(request, 'Эта аренда не может быть завершена')
+                    return redirect('rentals:detail', pk=pk)
+
+                # Сумма для сообщения — из уже загруженных значений; начисление сделал сам UPDATE
+                # по проценту из строки владельца (денормализован из соглашения, users/signals.py)
+                owner = rental.inventory.owner
+                owner_amount = (rental.total_price * owner.current_owner_percentage) / 100
                 logger.info(f'Выплата владельцу: {owner_amount} руб. для {owner.full_name}')
-                if bank_account:
-                    messages.success(
-                        request,
-                        f'Аренда завершена. Владельцу выплачено {owner_amount:.2f} ₽ на счет {bank_account.bank_name}.'
-                    )
-                else:
-                    messages.success(request, f'Аренда завершена. Владельцу начислено {owner_amount:.2f} ₽.')
+                notify_rental_status(rental, [rental.client.user_id, owner.user_id], 'Аренда завершена')
+                messages.success(
+                    request,
+                    f'Аренда завершена. Владельцу выплачено {owner_amount:.2f} ₽ на счет {bank_account.bank_name}.'
+                )
 
         except Exception as e:
             logger.error(f'Ошибка при завершении аренды: {str(e)}')
@@ -1124,7 +1196,7 @@ def rental_cancel(request, pk):
     """
     Отмена аренды клиентом.
     """
-    rental = get_object_or_404(Rental, pk=pk)
+    rental = get_object_or_404(Rental.objects.select_related('inventory', 'client', 'manager'), pk=pk)
 
     # Проверка прав
     if request.user.role == 'client':
@@ -1143,15 +1215,29 @@ def rental_cancel(request, pk):
     if request.method == 'POST':
         try:
             with transaction.atomic():
-                rental.status = 'cancelled'
-                rental.save()
+                if not lock_rental_or_busy(pk):
+                    messages.info(request, RENTAL_BUSY_MESSAGE)
+                    return redirect('rentals:detail', pk=pk)
+
+                updated = Rental.objects.filter(pk=pk, status__in=['pending', 'confirmed']).update(
+                    status='cancelled', updated_date=timezone.now()
+                )
+                if not updated:
+                    messages.warning(request, 'Эту аренду нельзя отменить')
+                    return redirect('rentals:detail', pk=pk)
 
                 # Если инвентарь был заблокирован, освобождаем
                 if rental.inventory.status == 'rented':
                     rental.inventory.status = 'available'
-                    rental.inventory.save()
+                    rental.inventory.save(update_fields=['status', 'updated_date'])
 
                 logger.info(f'Аренда отменена: {rental.rental_id} пользователем {request.user.email}')
+                # Уведомляем другую сторону: менеджера, если отменил клиент, и клиента — в остальных случаях
+                if request.user.role == 'client':
+                    recipients = [rental.manager.user_id if rental.manager else None]
+                else:
+                    recipients = [rental.client.user_id]
+                notify_rental_status(rental, recipients, 'Аренда отменена')
                 messages.success(request, 'Аренда отменена')
 
         except Exception as e:
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0013_rental_overlap_index'),
+        ('reviews', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='review',
+            name='reviews_reviewe_df0d56_idx',
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['reviewed_id', 'target_type', 'status', '-review_date'], name='review_target_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0018_rental_updated_date'),
+        ('reviews', '0002_review_target_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-review_date', '-review_id'], name='review_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0018_rental_updated_date'),
+        ('reviews', '0003_review_date_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('status', 'published'), ('target_type', 'inventory')), fields=['reviewed_id', '-review_date'], name='idx_published_inv_reviews'),
+        ),
+    ]
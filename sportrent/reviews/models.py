@@ -66,8 +66,18 @@ class Review(models.Model):
         verbose_name_plural = 'Отзывы'
         ordering = ['-review_date']
         indexes = [
-            models.Index(fields=['reviewed_id', 'target_type', 'status']),
+            # Отзывы объекта по статусу + сортировка по дате (страница инвентаря, top-10)
+            models.Index(fields=['reviewed_id', 'target_type', 'status', '-review_date'], name='review_target_status_date_idx'),
             models.Index(fields=['reviewer', 'status']),
+            # Список отзывов для менеджера/администратора: keyset-пагинация по (review_date, review_id)
+            models.Index(fields=['-review_date', '-review_id'], name='review_date_id_idx'),
+            # Только опубликованные отзывы на инвентарь: агрегат рейтинга и top-10 на странице инвентаря
+            # читают частичный индекс без строк pending/rejected
+            models.Index(
+                fields=['reviewed_id', '-review_date'],
+                condition=models.Q(status='published', target_type='inventory'),
+                name='idx_published_inv_reviews',
+            ),
         ]
         # Ограничение: один отзыв от пользователя на одну аренду
         constraints = [
@@ -77,9 +87,25 @@ class Review(models.Model):
             )
         ]
 
+    # Поля, по которым сигналы решают, входит ли отзыв в рейтинг инвентаря (reviews/signals.py)
+    RATING_STATE_FIELDS = ('target_type', 'reviewed_id', 'status', 'rating')
+
     def __str__(self):
         return f"Отзыв от {self.reviewer.email} - {self.rating}/5"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает состояние рейтинга на момент загрузки — pre_save не перечитывает строку."""
+        instance = super().from_db(db, field_names, values)
+        if all(name in instance.__dict__ for name in cls.RATING_STATE_FIELDS):
+            instance._rating_state_saved = tuple(getattr(instance, name) for name in cls.RATING_STATE_FIELDS)
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        # Строка перечитана — сохранённое при загрузке состояние могло устареть
+        self.__dict__.pop('_rating_state_saved', None)
+        super().refresh_from_db(*args, **kwargs)
+
     @property
     def average_detailed_rating(self):
         """Средняя оценка по детальным критериям."""
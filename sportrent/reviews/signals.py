@@ -1,31 +1,86 @@
 """
-Сигналы для автоматического пересчёта рейтингов после изменения отзыва.
-Паттерн «Наблюдатель»: Review (издатель) → пересчёт рейтинга (подписчик).
+Сигналы для автоматического обновления рейтингов после изменения отзыва.
+Паттерн «Наблюдатель»: Review (издатель) → приращение рейтинга и сброс кэша отзывов (подписчики).
 """
 
 import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from .models import Review
-from .utils import update_inventory_rating
+from .utils import apply_rating_delta, invalidate_inventory_reviews
 
 logger = logging.getLogger('reviews')
 
 
+def _rated_inventory_id(target_type, reviewed_id, status):
+    """ID инвентаря, в рейтинг которого входит отзыв (только опубликованные отзывы на инвентарь)."""
+    if target_type == 'inventory' and status == 'published':
+        return reviewed_id
+    return None
+
+
+def _rated_entry(target_type, reviewed_id, status, rating):
+    """(inventory_id, rating), если отзыв входит в рейтинг, иначе None."""
+    inventory_id = _rated_inventory_id(target_type, reviewed_id, status)
+    return (inventory_id, rating) if inventory_id is not None else None
+
+
+@receiver(pre_save, sender=Review)
+def remember_rated_inventory(sender, instance, **kwargs):
+    """
+    Запоминает, входил ли отзыв в рейтинг до изменения и с какой оценкой.
+    Состояние берётся из загруженного объекта (Review.from_db / прошлый post_save);
+    SELECT — только если объект загружен без этих полей.
+    """
+    instance._rated_entry_before = None
+    if instance._state.adding:
+        return
+    previous = getattr(instance, '_rating_state_saved', None)
+    if previous is None:
+        previous = Review.objects.filter(pk=instance.pk).values_list(*Review.RATING_STATE_FIELDS).first()
+    if previous:
+        instance._rated_entry_before = _rated_entry(*previous)
+
+
 @receiver(post_save, sender=Review)
-def recalculate_rating_on_review_save(sender, instance, **kwargs):
+def update_rating_on_review_save(sender, instance, **kwargs):
     """
-    Пересчитывает рейтинг инвентаря при сохранении отзыва.
-    Срабатывает только для опубликованных отзывов на инвентарь.
+    Обновляет рейтинг инвентаря приращением: публикация добавляет оценку, снятие с публикации
+    вычитает её, смена оценки опубликованного отзыва — разницу. Отзыв, не входивший
+    в рейтинг ни до, ни после сохранения, рейтинг не трогает.
     """
-    if instance.target_type != 'inventory' or instance.status != 'published':
+    state = tuple(getattr(instance, name) for name in Review.RATING_STATE_FIELDS)
+    instance._rating_state_saved = state
+    before = getattr(instance, '_rated_entry_before', None)
+    after = _rated_entry(*state)
+    if before == after:
         return
+    if before is not None:
+        _apply(before[0], -before[1], -1)
+    if after is not None:
+        _apply(after[0], after[1], 1)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Удаление опубликованного отзыва на инвентарь вычитает его оценку из рейтинга."""
+    entry = _rated_entry(instance.target_type, instance.reviewed_id, instance.status, instance.rating)
+    if entry is not None:
+        _apply(entry[0], -entry[1], -1)
+
 
+def _apply(inventory_id, rating_delta, count_delta):
     try:
-        from inventory.models import Inventory
-        inventory = Inventory.objects.get(inventory_id=instance.reviewed_id)
-        update_inventory_rating(inventory)
-        logger.debug('Рейтинг инвентаря %s пересчитан по сигналу', inventory.inventory_id)
+        apply_rating_delta(inventory_id, rating_delta, count_delta)
+        logger.debug('Рейтинг инвентаря %s обновлён по сигналу', inventory_id)
     except Exception as e:
-        logger.error('Ошибка при пересчёте рейтинга через сигнал: %s', e)
+        logger.error('Ошибка при обновлении рейтинга через сигнал: %s', e)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def reset_inventory_reviews_cache(sender, instance, **kwargs):
+    """Сбрасывает кэш отзывов на странице инвентаря при любом изменении отзыва на него."""
+    if instance.target_type == 'inventory':
+        invalidate_inventory_reviews(instance.reviewed_id)
@@ -1,16 +1,24 @@
 """
 Тесты для приложения reviews.
-Проверяет паттерн Наблюдатель: сигнал post_save на Review пересчитывает рейтинг инвентаря.
+Проверяет паттерн Наблюдатель: сигнал post_save на Review обновляет рейтинг инвентаря
+приращением (в том числе при смене оценки, без повторного чтения загруженного отзыва)
+и совпадает с полным пересчётом;
+число запросов списка отзывов не зависит от количества строк;
+повторная отправка отзыва упирается в ограничение уникальности, а не в SELECT перед INSERT.
 """
 
 from decimal import Decimal
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from django.utils import timezone
 
 from users.models import User, Client, Owner, Manager
 from inventory.models import Inventory, SportCategory
 from rentals.models import Rental
 from reviews.models import Review
+from reviews.utils import recalculate_inventory_rating
 
 
 def _make_user(email, role):
@@ -122,3 +130,128 @@ class RatingSignalTest(TestCase):
         self.inventory.refresh_from_db()
         self.assertEqual(self.inventory.avg_rating, Decimal('4.00'))
         self.assertEqual(self.inventory.reviews_count, 2)
+
+    def test_publish_of_loaded_review_does_not_reread_it(self):
+        """Одобрение загруженного отзыва: UPDATE отзыва + UPDATE рейтинга, без повторного SELECT."""
+        review = Review.objects.create(
+            rental=self.rental,
+            reviewer=self.client_profile.user,
+            reviewed_id=self.inventory.inventory_id,
+            target_type='inventory',
+            rating=5,
+            comment='Отлично',
+        )
+        review = Review.objects.get(pk=review.pk)
+        review.status = 'published'
+        with self.assertNumQueries(2):
+            review.save(update_fields=['status'])
+        self.inventory.refresh_from_db()
+        self.assertEqual(self.inventory.reviews_count, 1)
+
+    def test_rating_recalculated_on_unpublish_and_delete(self):
+        """Снятие отзыва с публикации и удаление отзыва тоже пересчитывают рейтинг."""
+        client2 = _make_client('client2@test.com')
+        rental2 = _make_rental(self.inventory, client2, self.manager)
+        review = Review.objects.create(
+            rental=self.rental,
+            reviewer=self.client_profile.user,
+            reviewed_id=self.inventory.inventory_id,
+            target_type='inventory',
+            rating=2,
+            comment='Так себе',
+            status='published',
+        )
+        other = Review.objects.create(
+            rental=rental2,
+            reviewer=client2.user,
+            reviewed_id=self.inventory.inventory_id,
+            target_type='inventory',
+            rating=4,
+            comment='Хорошо',
+            status='published',
+        )
+
+        review.status = 'rejected'
+        review.save()
+        self.inventory.refresh_from_db()
+        self.assertEqual(self.inventory.avg_rating, Decimal('4.00'))
+        self.assertEqual(self.inventory.reviews_count, 1)
+
+        other.delete()
+        self.inventory.refresh_from_db()
+        self.assertIsNone(self.inventory.avg_rating)
+        self.assertEqual(self.inventory.reviews_count, 0)
+
+    def test_rating_change_applies_difference(self):
+        """Смена оценки опубликованного отзыва меняет сумму на разницу; итог совпадает с полным пересчётом."""
+        client2 = _make_client('client2@test.com')
+        review = Review.objects.create(
+            rental=self.rental, reviewer=self.client_profile.user, reviewed_id=self.inventory.inventory_id,
+            target_type='inventory', rating=3, comment='Нормально', status='published',
+        )
+        Review.objects.create(
+            rental=_make_rental(self.inventory, client2, self.manager), reviewer=client2.user,
+            reviewed_id=self.inventory.inventory_id, target_type='inventory', rating=4, comment='Хорошо',
+            status='published',
+        )
+        review.rating = 5
+        review.save()
+        self.inventory.refresh_from_db()
+        self.assertEqual((self.inventory.avg_rating, self.inventory.reviews_count, self.inventory.ratings_sum),
+                         (Decimal('4.50'), 2, 9))
+
+        self.assertEqual(recalculate_inventory_rating(self.inventory.inventory_id), (4.5, 2))
+        self.inventory.refresh_from_db()
+        self.assertEqual(self.inventory.ratings_sum, 9)
+
+
+class ReviewListQueriesTest(TestCase):
+    """review_list: инвентарь и имя автора подгружаются JOIN-ом, а не запросом на каждую строку."""
+
+    def setUp(self):
+        self.owner = _make_owner()
+        self.manager = _make_manager()
+        self.inventory = _make_inventory(self.owner)
+        self.clients = 0
+
+    def _add_reviews(self, count):
+        for _ in range(count):
+            self.clients += 1
+            client = _make_client(f'client{self.clients}@test.com')
+            Review.objects.create(
+                rental=_make_rental(self.inventory, client, self.manager), reviewer=client.user,
+                reviewed_id=self.inventory.inventory_id, target_type='inventory', rating=5,
+                comment='Отлично', status='published',
+            )
+
+    def _query_count(self, user):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('reviews:list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Тест Клиент')
+        self.assertContains(response, 'Отлично')
+        return len(ctx.captured_queries)
+
+    def test_query_count_independent_of_rows(self):
+        self._add_reviews(1)
+        users = (self.owner.user, self.manager.user)
+        baseline = [self._query_count(user) for user in users]
+        self._add_reviews(5)
+        self.assertEqual([self._query_count(user) for user in users], baseline)
+
+
+class ReviewCreateDuplicateTest(TestCase):
+    """Второй POST на ту же аренду не создаёт отзыв и показывает предупреждение."""
+
+    def test_second_post_rejected_by_constraint(self):
+        client_profile = _make_client()
+        rental = _make_rental(_make_inventory(_make_owner()), client_profile, _make_manager())
+        self.client.force_login(client_profile.user)
+        url = reverse('reviews:create', args=[rental.pk])
+        data = {'rating': 5, 'comment': 'Отличный велосипед, всё понравилось'}
+
+        self.client.post(url, data)
+        response = self.client.post(url, data, follow=True)
+        self.assertEqual(Review.objects.filter(rental=rental).count(), 1)
+        self.assertContains(response, 'Вы уже оставили отзыв на эту аренду')
@@ -3,33 +3,94 @@
 """
 
 import logging
-from django.db.models import Avg
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, F, FloatField, Sum
+from django.db.models.functions import Cast, NullIf
 
 from reviews.models import Review
 
 logger = logging.getLogger('reviews')
 
 
-def update_inventory_rating(inventory):
-    """Пересчёт среднего рейтинга и числа отзывов по инвентарю."""
-    try:
-        avg_rating = Review.objects.filter(
-            reviewed_id=inventory.inventory_id,
+def recalculate_inventory_rating(inventory_id):
+    """
+    Полный пересчёт рейтинга инвентаря по опубликованным отзывам: один агрегирующий запрос
+    (AVG + COUNT + SUM) и один UPDATE без загрузки самого инвентаря. Обычные изменения отзывов
+    идут через apply_rating_delta(); этот путь — для починки (команда recalculate_ratings).
+    Строка инвентаря блокируется до агрегата: одновременная публикация отзыва (её приращение)
+    встанет после записи пересчёта, а не будет затёрта им.
+    Возвращает (avg_rating, reviews_count).
+    """
+    from inventory.models import Inventory
+
+    with transaction.atomic():
+        list(Inventory.objects.select_for_update().filter(inventory_id=inventory_id).values_list('pk'))
+        stats = Review.objects.filter(
+            reviewed_id=inventory_id,
             target_type='inventory',
             status='published',
-        ).aggregate(avg=Avg('rating'))['avg']
+        ).aggregate(avg=Avg('rating'), count=Count('pk'), total=Sum('rating'))
+        avg_rating = round(float(stats['avg']), 2) if stats['avg'] is not None else None
+        Inventory.objects.filter(inventory_id=inventory_id).update(
+            avg_rating=avg_rating, reviews_count=stats['count'], ratings_sum=stats['total'] or 0,
+        )
+    return avg_rating, stats['count']
 
-        if avg_rating is not None:
-            inventory.avg_rating = round(float(avg_rating), 2)
-        else:
-            inventory.avg_rating = None
 
-        inventory.reviews_count = Review.objects.filter(
-            reviewed_id=inventory.inventory_id,
-            target_type='inventory',
-            status='published',
-        ).count()
+def apply_rating_delta(inventory_id, rating_delta, count_delta):
+    """
+    Приращение рейтинга одним UPDATE: сумма оценок и число отзывов меняются в БД (F),
+    средний рейтинг делится из них же — без чтения отзывов, O(1) при любом их количестве.
+    В SET правые части видят значения строки до UPDATE, поэтому к ним прибавляется delta.
+    """
+    from inventory.models import Inventory
 
-        inventory.save(update_fields=['avg_rating', 'reviews_count'])
+    new_count = F('reviews_count') + count_delta
+    Inventory.objects.filter(inventory_id=inventory_id).update(
+        ratings_sum=F('ratings_sum') + rating_delta,
+        reviews_count=new_count,
+        # Последний отзыв снят — NULLIF даёт деление на NULL, рейтинг становится пустым
+        avg_rating=Cast(F('ratings_sum') + rating_delta, FloatField()) / NullIf(new_count, 0),
+    )
+
+
+def update_inventory_rating(inventory):
+    """Пересчёт среднего рейтинга и числа отзывов по инвентарю (с обновлением переданного объекта)."""
+    try:
+        inventory.avg_rating, inventory.reviews_count = recalculate_inventory_rating(inventory.inventory_id)
     except Exception as e:
         logger.error('Ошибка при обновлении рейтинга инвентаря: %s', e)
+
+
+INVENTORY_REVIEWS_LIMIT = 10
+INVENTORY_REVIEWS_CACHE_TTL = 300
+
+
+def _inventory_reviews_cache_key(inventory_id):
+    return f'inv:detail:reviews:{inventory_id}'
+
+
+def get_inventory_reviews(inventory_id):
+    """
+    Последние опубликованные отзывы на инвентарь для страницы детали.
+    Кэшируются на 5 минут; сбрасываются сигналами reviews/signals.py при изменении отзыва.
+    Профиль клиента-автора подтягивается сразу — для reviewer.get_full_name без N+1.
+    """
+    def fetch():
+        return list(
+            Review.objects.filter(
+                reviewed_id=inventory_id,
+                target_type='inventory',
+                status='published',
+            ).select_related('reviewer', 'reviewer__client_profile').only(
+                'review_id', 'rating', 'comment', 'review_date',
+                'reviewer__role', 'reviewer__client_profile__full_name',
+            ).order_by('-review_date')[:INVENTORY_REVIEWS_LIMIT]
+        )
+
+    return cache.get_or_set(_inventory_reviews_cache_key(inventory_id), fetch, INVENTORY_REVIEWS_CACHE_TTL)
+
+
+def invalidate_inventory_reviews(inventory_id):
+    cache.delete(_inventory_reviews_cache_key(inventory_id))
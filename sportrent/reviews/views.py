@@ -6,14 +6,16 @@ import logging
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db import transaction
-from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Substr
 
 from .models import Review
 from .forms import ReviewForm
 from rentals.models import Rental
 from inventory.models import Inventory
+from core.pagination import KeysetPaginator
 from users.decorators import role_required
+from users.backends import profile_relations
 
 logger = logging.getLogger('reviews')
 
@@ -25,23 +27,34 @@ def review_list(request):
     """
     user = request.user
 
+    # Связи, которые выводит review_list.html (инвентарь аренды, имя автора по профилю роли), —
+    # одним JOIN для всех ролей; роль только сужает выборку.
+    # .only() — ровно те столбцы, что рендерит шаблон (при правке шаблона дополнять список);
+    # comment (TEXT до 1000 символов) не тянем целиком — шаблону хватает начала для truncatewords:15
+    base_qs = Review.objects.select_related(
+        'rental', 'rental__inventory', 'reviewer', *profile_relations('reviewer')
+    ).annotate(
+        comment_preview=Substr('comment', 1, 200),
+    ).only(
+        'review_id', 'rating', 'status', 'review_date',
+        'rental__rental_id', 'rental__inventory__name',
+        'reviewer__role', 'reviewer__email',
+        *[f'{path}__full_name' for path in profile_relations('reviewer')],
+    ).order_by('-review_date')
+
     # В зависимости от роли показываем разные отзывы
     if user.role == 'client' and hasattr(user, 'client_profile'):
-        reviews = Review.objects.filter(
-            reviewer=user
-        ).select_related('rental', 'rental__inventory').order_by('-review_date')
+        reviews = base_qs.filter(reviewer=user)
 
     elif user.role == 'owner' and hasattr(user, 'owner_profile'):
         # Отзывы на инвентарь владельца
-        reviews = Review.objects.filter(
+        reviews = base_qs.filter(
             rental__inventory__owner=user.owner_profile,
             target_type='inventory'
-        ).select_related('rental', 'reviewer', 'rental__inventory').order_by('-review_date')
+        )
 
     elif user.role in ['manager', 'administrator']:
-        reviews = Review.objects.all().select_related(
-            'rental', 'reviewer', 'rental__inventory'
-        ).order_by('-review_date')
+        reviews = base_qs
     else:
         messages.error(request, 'Недостаточно прав')
         return redirect('core:home')
@@ -51,10 +64,8 @@ def review_list(request):
     if status:
         reviews = reviews.filter(status=status)
 
-    # Пагинация
-    paginator = Paginator(reviews, 15)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    # Keyset-пагинация по (review_date, review_id): без COUNT(*) и OFFSET по всей таблице отзывов
+    page_obj = KeysetPaginator(reviews, 15, 'review_date').get_page(request.GET)
 
     context = {
         'page_obj': page_obj,
@@ -70,8 +81,9 @@ def review_create(request, rental_id):
     """
     Создание отзыва на завершенную аренду.
     """
+    # Клиент аренды сверяется по client_id — JOIN нужен только инвентарю (имя в шаблоне)
     rental = get_object_or_404(
-        Rental.objects.select_related('inventory', 'client'),
+        Rental.objects.select_related('inventory'),
         pk=rental_id
     )
 
@@ -85,21 +97,10 @@ def review_create(request, rental_id):
         messages.error(request, 'Только клиенты могут оставлять отзывы')
         return redirect('rentals:detail', pk=rental_id)
 
-    if rental.client != request.user.client_profile:
+    if rental.client_id != request.user.client_profile.pk:
         messages.error(request, 'Вы не можете оставить отзыв на чужую аренду')
         return redirect('rentals:detail', pk=rental_id)
 
-    # Проверка что отзыв еще не оставлен
-    existing_review = Review.objects.filter(
-        rental=rental,
-        reviewer=request.user,
-        target_type='inventory'
-    ).exists()
-
-    if existing_review:
-        messages.warning(request, 'Вы уже оставили отзыв на эту аренду')
-        return redirect('rentals:detail', pk=rental_id)
-
     if request.method == 'POST':
         form = ReviewForm(request.POST)
 
@@ -118,10 +119,19 @@ def review_create(request, rental_id):
                     messages.success(request, 'Отзыв отправлен на модерацию. Спасибо за ваше мнение!')
                     return redirect('rentals:detail', pk=rental_id)
 
+            except IntegrityError:
+                # Повтор ловит UniqueConstraint(rental, reviewer, target_type) — без SELECT перед INSERT
+                # и без гонки между проверкой и записью при двойной отправке формы
+                messages.warning(request, 'Вы уже оставили отзыв на эту аренду')
+                return redirect('rentals:detail', pk=rental_id)
             except Exception as e:
                 logger.error(f'Ошибка при создании отзыва: {str(e)}')
                 messages.error(request, 'Произошла ошибка при отправке отзыва')
     else:
+        # Форму уже оставленного отзыва не показываем (на POST проверка — ограничением БД)
+        if Review.objects.filter(rental=rental, reviewer=request.user, target_type='inventory').exists():
+            messages.warning(request, 'Вы уже оставили отзыв на эту аренду')
+            return redirect('rentals:detail', pk=rental_id)
         form = ReviewForm()
 
     context = {
@@ -147,7 +157,8 @@ def review_approve(request, pk):
     if request.method == 'POST':
         try:
             review.status = 'published'
-            review.save()  # сигнал post_save → recalculate_rating_on_review_save
+            # Только изменённый столбец; сигнал post_save → update_rating_on_review_save (+оценка, +1)
+            review.save(update_fields=['status'])
 
             logger.info(f'Отзыв одобрен: {review.review_id} администратором {request.user.email}')
             messages.success(request, 'Отзыв опубликован')
@@ -177,7 +188,8 @@ def review_reject(request, pk):
         try:
             review.status = 'rejected'
             review.rejection_reason = reason
-            review.save()
+            # Только изменённые столбцы: comment (TEXT) при модерации не переписывается
+            review.save(update_fields=['status', 'rejection_reason'])
 
             logger.info(f'Отзыв отклонен: {review.review_id} причина: {reason}')
             messages.info(request, 'Отзыв отклонен')
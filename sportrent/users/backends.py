@@ -0,0 +1,41 @@
+"""
+Бэкенд аутентификации с предзагрузкой ролевых профилей.
+
+Что здесь:
+- ProfileModelBackend: ModelBackend, у которого get_user() одним JOIN подтягивает
+  client_profile / owner_profile / manager_profile / admin_profile.
+  Проверки hasattr(request.user, '..._profile') и обращения к профилю во views
+  (дашборд, модерация, аренды) больше не делают отдельный SELECT на каждый запрос.
+- profile_relations(): те же JOIN-ы для связанных пользователей (отправитель сообщения,
+  автор отзыва) — User.get_full_name() в списках без запроса на каждую строку.
+
+Связано с:
+- config/settings.py: AUTHENTICATION_BACKENDS
+- users/models.py: User.ROLE_PROFILE_RELATIONS (роль → related_name профиля)
+
+Ключевые слова: аутентификация, select_related, профиль, request.user
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+# Один источник списка профилей — User.ROLE_PROFILE_RELATIONS
+PROFILE_RELATIONS = tuple(UserModel.ROLE_PROFILE_RELATIONS.values())
+
+
+class ProfileModelBackend(ModelBackend):
+    """ModelBackend, загружающий request.user вместе с профилем роли."""
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related(*PROFILE_RELATIONS).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+def profile_relations(*user_fields):
+    """Пути select_related к профилям ролей: profile_relations('sender') → ['sender__client_profile', ...]."""
+    return [f'{field}__{relation}' for field in user_fields for relation in PROFILE_RELATIONS]
@@ -2,21 +2,48 @@
 Формы для регистрации и управления пользователями.
 """
 
-import re
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.core.exceptions import ValidationError
-from django.core.validators import EmailValidator, MinValueValidator, MaxValueValidator
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import transaction
 from django.utils import timezone
 from .models import User, Client, Owner, Manager, OwnerAgreement, BankAccount
 
+# Наборы символов для проверок — один раз при импорте модуля
+_NAME_LETTERS = frozenset(
+    'абвгдеёжзийклмнопрстуфхцчшщъыьэюя' 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'
+    'abcdefghijklmnopqrstuvwxyz' 'ABCDEFGHIJKLMNOPQRSTUVWXYZ' '-'
+)
+_PASSWORD_MAX_LENGTH = 128
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*()_+-=[]{};:\'",.<>?/\\|`~')
+
+
+def _is_name(value):
+    """Имя из русских/латинских букв, пробелов и дефисов."""
+    return bool(value) and all(ch in _NAME_LETTERS or ch.isspace() for ch in value)
+
+
+def _digits(value):
+    """Только цифры из строки (телефон, счёт, код подразделения) — один проход без regex."""
+    return ''.join(filter(str.isdecimal, value))
+
+
+def _format_account_number(account_number):
+    """Номер счета: ровно 16 цифр (разделители отбрасываются), формат 2222-2222-2222-2222."""
+    cleaned = _digits(account_number)
+    if len(cleaned) != 16:
+        raise ValidationError('Номер счета должен содержать 16 цифр в формате 2222-2222-2222-2222')
+    return f"{cleaned[:4]}-{cleaned[4:8]}-{cleaned[8:12]}-{cleaned[12:16]}"
+
 
 class UserRegistrationForm(UserCreationForm):
     """Форма регистрации нового пользователя с полной валидацией."""
 
     email = forms.EmailField(
         label='Email',
-        validators=[EmailValidator(message='Введите корректный email адрес')],
+        # Формат проверяет встроенный validate_email поля; своё сообщение — через код 'invalid'
+        error_messages={'invalid': 'Введите корректный email адрес'},
         widget=forms.EmailInput(attrs={
             'class': 'form-control',
             'placeholder': 'example@mail.com'
@@ -191,18 +218,19 @@ class UserRegistrationForm(UserCreationForm):
         fields = ('email', 'phone', 'role', 'password1', 'password2')
 
     def clean_email(self):
-        """Проверка уникальности и корректности email."""
-        email = self.cleaned_data.get('email', '').strip().lower()
-
-        # Проверка формата email
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
-            raise ValidationError('Введите корректный email адрес (example@mail.com)')
-
-        # Проверка уникальности
-        if User.objects.filter(email=email).exists():
-            raise ValidationError('Пользователь с таким email уже существует.')
-
-        return email
+        """
+        Нормализация email. Формат уже проверил validate_email поля,
+        уникальность — ограничение uniq_user_email_lower в БД.
+        """
+        # forms.EmailField уже обрезал пробелы (strip=True)
+        return self.cleaned_data['email'].lower()
+
+    def _get_validation_exclusions(self):
+        # email не проверяется SELECT'ом в validate_unique/validate_constraints: дубль (в любом регистре)
+        # отклонит INSERT по uniq_user_email_lower, IntegrityError разбирает users.views.register
+        exclusions = super()._get_validation_exclusions()
+        exclusions.add('email')
+        return exclusions
 
     def clean_phone(self):
         """Валидация телефона."""
@@ -212,7 +240,7 @@ class UserRegistrationForm(UserCreationForm):
             raise ValidationError('Телефон обязателен для заполнения')
 
         # Убираем все символы кроме цифр
-        cleaned_phone = re.sub(r'[^\d]', '', phone)
+        cleaned_phone = _digits(phone)
 
         # Ожидаем формат российского номера 10 цифр (без +7)
         if len(cleaned_phone) != 10 or not cleaned_phone.isdigit():
@@ -229,7 +257,7 @@ class UserRegistrationForm(UserCreationForm):
             raise ValidationError('Имя должно содержать минимум 3 символа')
 
         # Проверка что имя содержит только буквы, пробелы и дефисы
-        if not re.match(r'^[а-яёА-ЯЁa-zA-Z\s\-]+$', full_name):
+        if not _is_name(full_name):
             raise ValidationError('Имя должно содержать только буквы')
 
         return full_name
@@ -238,41 +266,17 @@ class UserRegistrationForm(UserCreationForm):
         """Усиленная валидация пароля."""
         password = self.cleaned_data.get('password1')
 
-        if len(password) < 8:
-            raise ValidationError('Пароль должен содержать минимум 8 символов')
-
-        # Проверка наличия заглавной буквы
-        if not re.search(r'[A-Z]', password):
-            raise ValidationError('Пароль должен содержать хотя бы одну заглавную латинскую букву (A–Z)')
-
-        # Проверка наличия строчной буквы
-        if not re.search(r'[a-z]', password):
-            raise ValidationError('Пароль должен содержать хотя бы одну строчную латинскую букву (a–z)')
-
-        # Проверка наличия цифры
-        if not re.search(r'\d', password):
-            raise ValidationError('Пароль должен содержать хотя бы одну цифру')
-
-        # Проверка наличия спецсимвола
-        if not re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>?/\\|`~]', password):
-            raise ValidationError('Пароль должен содержать хотя бы один спецсимвол (!@#$%^&* и т.д.)')
-
+        _validate_password_strength(password)
         return password
 
     def clean_passport_series(self):
         """Серия паспорта: только 4 цифры."""
         series = (self.cleaned_data.get('passport_series') or '').strip()
-        role = self.cleaned_data.get('role')
 
-        if role == 'client':
-            if not series:
+        if not series:
+            if self.cleaned_data.get('role') == 'client':
                 raise ValidationError('Серия паспорта обязательна для клиента')
-            if not series.isdigit() or len(series) != 4:
-                raise ValidationError('Серия паспорта должна содержать 4 цифры')
-        elif not series:
-            return series
-
-        if series and (not series.isdigit() or len(series) != 4):
+        elif len(series) != 4 or not series.isdigit():
             raise ValidationError('Серия паспорта должна содержать 4 цифры')
 
         return series
@@ -280,17 +284,11 @@ class UserRegistrationForm(UserCreationForm):
     def clean_passport_number(self):
         """Номер паспорта: только 6 цифр."""
         number = (self.cleaned_data.get('passport_number') or '').strip()
-        role = self.cleaned_data.get('role')
 
-        if role == 'client':
-            if not number:
+        if not number:
+            if self.cleaned_data.get('role') == 'client':
                 raise ValidationError('Номер паспорта обязателен для клиента')
-            if not number.isdigit() or len(number) != 6:
-                raise ValidationError('Номер паспорта должен содержать 6 цифр')
-        elif not number:
-            return number
-
-        if number and (not number.isdigit() or len(number) != 6):
+        elif len(number) != 6 or not number.isdigit():
             raise ValidationError('Номер паспорта должен содержать 6 цифр')
 
         return number
@@ -308,7 +306,7 @@ class UserRegistrationForm(UserCreationForm):
             return code
 
         # Убираем все, кроме цифр
-        digits_only = re.sub(r'[^\d]', '', code)
+        digits_only = _digits(code)
         if len(digits_only) != 6:
             raise ValidationError('Код подразделения должен содержать 6 цифр (например: 123-456)')
 
@@ -323,7 +321,7 @@ class UserRegistrationForm(UserCreationForm):
         if role == 'client' and not issue_date:
             raise ValidationError('Дата выдачи паспорта обязательна для клиента')
 
-        if issue_date and issue_date > timezone.now().date():
+        if issue_date and issue_date > timezone.localdate():
             raise ValidationError('Дата выдачи паспорта не может быть в будущем')
 
         return issue_date
@@ -336,14 +334,7 @@ class UserRegistrationForm(UserCreationForm):
         if role == 'owner':
             if not account_number:
                 raise ValidationError('Номер счета обязателен для владельца')
-            
-            # Убираем дефисы и проверяем что только цифры
-            cleaned = re.sub(r'[^\d]', '', account_number)
-            if len(cleaned) != 16:
-                raise ValidationError('Номер счета должен содержать 16 цифр в формате 2222-2222-2222-2222')
-            
-            # Возвращаем в формате с дефисами
-            return f"{cleaned[:4]}-{cleaned[4:8]}-{cleaned[8:12]}-{cleaned[12:16]}"
+            return _format_account_number(account_number)
         
         return account_number
 
@@ -357,7 +348,7 @@ class UserRegistrationForm(UserCreationForm):
                 raise ValidationError('Имя получателя обязательно для владельца')
             
             # Проверяем что только буквы, пробелы и дефисы
-            if not re.match(r'^[а-яёА-ЯЁa-zA-Z\s\-]+$', recipient_name):
+            if not _is_name(recipient_name):
                 raise ValidationError('Имя получателя должно содержать только буквы')
         
         return recipient_name
@@ -397,57 +388,61 @@ class UserRegistrationForm(UserCreationForm):
 
     def save(self, commit=True):
         """Сохранение пользователя и создание профиля."""
+        # email, phone и role (поля Meta.fields) ModelForm уже перенёс в instance из cleaned_data
         user = super().save(commit=False)
-        user.email = self.cleaned_data['email']
-        user.phone = self.cleaned_data.get('phone')
-        user.role = self.cleaned_data['role']
 
         if commit:
-            user.save()
-
-            # Создаем профиль в зависимости от роли
-            full_name = self.cleaned_data['full_name']
-
-            if user.role == 'client':
-                Client.objects.create(
-                    user=user,
-                    full_name=full_name,
-                    passport_series=self.cleaned_data.get('passport_series') or None,
-                    passport_number=self.cleaned_data.get('passport_number') or None,
-                    passport_issue_date=self.cleaned_data.get('passport_issue_date'),
-                    passport_department_code=self.cleaned_data.get('passport_department_code') or None,
-                )
-            elif user.role == 'owner':
-                owner = Owner.objects.create(
-                    user=user,
-                    full_name=full_name,
-                    passport_series=self.cleaned_data.get('passport_series', ''),
-                    passport_number=self.cleaned_data.get('passport_number', ''),
-                    passport_issue_date=self.cleaned_data.get('passport_issue_date'),
-                    passport_department_code=self.cleaned_data.get('passport_department_code', ''),
-                    passport_issued_by=self.cleaned_data.get('passport_issued_by', ''),
-                    passport_nda_accepted_at=timezone.now(),
-                    passport_nda_version='1.0',
-                )
-
-                # Создаем соглашение с фиксированными процентами 70/30
-                OwnerAgreement.objects.create(
-                    owner=owner,
-                    owner_percentage=70,
-                    store_percentage=30,
-                    agreement_text="Соглашение о выплатах: 70% владельцу, 30% магазину",
-                    is_accepted=True,
-                    accepted_date=timezone.now()
-                )
-
-                # Создаем банковский счет
-                BankAccount.objects.create(
-                    owner=owner,
-                    bank_name=self.cleaned_data.get('bank_name', ''),
-                    account_number=self.cleaned_data.get('account_number', ''),
-                    recipient_name=self.cleaned_data.get('recipient_name', ''),
-                    is_default=True
-                )
+            # Пользователь и профиль роли (у владельца — ещё соглашение и счёт) создаются вместе:
+            # сбой на профиле не оставит User без профиля. Внутри atomic() view это savepoint
+            with transaction.atomic():
+                user.save()
+
+                # Создаем профиль в зависимости от роли
+                full_name = self.cleaned_data['full_name']
+
+                if user.role == 'client':
+                    Client.objects.create(
+                        user=user,
+                        full_name=full_name,
+                        passport_series=self.cleaned_data.get('passport_series') or None,
+                        passport_number=self.cleaned_data.get('passport_number') or None,
+                        passport_issue_date=self.cleaned_data.get('passport_issue_date'),
+                        passport_department_code=self.cleaned_data.get('passport_department_code') or None,
+                    )
+                elif user.role == 'owner':
+                    # NDA и соглашение о выплатах принимаются одной отправкой формы — одна отметка времени
+                    accepted_at = timezone.now()
+                    owner = Owner.objects.create(
+                        user=user,
+                        full_name=full_name,
+                        passport_series=self.cleaned_data.get('passport_series', ''),
+                        passport_number=self.cleaned_data.get('passport_number', ''),
+                        passport_issue_date=self.cleaned_data.get('passport_issue_date'),
+                        passport_department_code=self.cleaned_data.get('passport_department_code', ''),
+                        passport_issued_by=self.cleaned_data.get('passport_issued_by', ''),
+                        passport_nda_accepted_at=accepted_at,
+                        passport_nda_version='1.0',
+                    )
+
+                    # Создаем соглашение с фиксированными процентами 70/30
+                    OwnerAgreement.objects.create(
+                        owner=owner,
+                        owner_percentage=70,
+                        store_percentage=30,
+                        agreement_text="Соглашение о выплатах: 70% владельцу, 30% магазину",
+                        is_accepted=True,
+                        accepted_date=accepted_at
+                    )
+
+                    # Создаем банковский счет. bulk_create — один INSERT без BankAccount.save():
+                    # у только что созданного владельца нет других счетов, снимать is_default не с кого
+                    BankAccount.objects.bulk_create([BankAccount(
+                        owner=owner,
+                        bank_name=self.cleaned_data.get('bank_name', ''),
+                        account_number=self.cleaned_data.get('account_number', ''),
+                        recipient_name=self.cleaned_data.get('recipient_name', ''),
+                        is_default=True
+                    )])
 
         return user
 
@@ -473,7 +468,23 @@ class UserLoginForm(AuthenticationForm):
     )
 
 
-class ClientProfileForm(forms.ModelForm):
+class ChangedFieldsModelForm(forms.ModelForm):
+    """
+    ModelForm редактирования: существующая запись обновляется только по изменённым полям
+    (плюс auto_now-поля), без изменений UPDATE не выполняется вовсе.
+    """
+
+    def save(self, commit=True):
+        if not commit or self.instance._state.adding:
+            return super().save(commit=commit)
+        instance = super().save(commit=False)
+        if self.changed_data:
+            auto_now = [f.name for f in instance._meta.concrete_fields if getattr(f, 'auto_now', False)]
+            instance.save(update_fields=[*self.changed_data, *auto_now])
+        return instance
+
+
+class ClientProfileForm(ChangedFieldsModelForm):
     """Форма редактирования профиля клиента. На сайте только онлайн-оплата. Без паспортных данных."""
 
     class Meta:
@@ -487,7 +498,7 @@ class ClientProfileForm(forms.ModelForm):
         }
 
 
-class OwnerProfileForm(forms.ModelForm):
+class OwnerProfileForm(ChangedFieldsModelForm):
     """Форма редактирования профиля владельца."""
 
     class Meta:
@@ -501,7 +512,7 @@ class OwnerProfileForm(forms.ModelForm):
         }
 
 
-class UserUpdateForm(forms.ModelForm):
+class UserUpdateForm(ChangedFieldsModelForm):
     """Форма обновления данных пользователя."""
 
     class Meta:
@@ -518,6 +529,10 @@ class UserUpdateForm(forms.ModelForm):
             'avatar_url': 'Аватар',
         }
 
+    def clean_email(self):
+        # Как при регистрации: адреса хранятся в нижнем регистре (uniq_user_email_lower, вход по email)
+        return self.cleaned_data['email'].lower()
+
 
 class BankAccountForm(forms.ModelForm):
     """Форма для добавления/редактирования банковского счета."""
@@ -544,14 +559,7 @@ class BankAccountForm(forms.ModelForm):
         
         if not account_number:
             raise ValidationError('Номер счета обязателен')
-        
-        # Убираем дефисы и проверяем что только цифры
-        cleaned = re.sub(r'[^\d]', '', account_number)
-        if len(cleaned) != 16:
-            raise ValidationError('Номер счета должен содержать 16 цифр в формате 2222-2222-2222-2222')
-        
-        # Возвращаем в формате с дефисами
-        return f"{cleaned[:4]}-{cleaned[4:8]}-{cleaned[8:12]}-{cleaned[12:16]}"
+        return _format_account_number(account_number)
 
     def clean_recipient_name(self):
         """Валидация имени получателя - только буквы."""
@@ -561,24 +569,46 @@ class BankAccountForm(forms.ModelForm):
             raise ValidationError('Имя получателя обязательно')
         
         # Проверяем что только буквы, пробелы и дефисы
-        if not re.match(r'^[а-яёА-ЯЁa-zA-Z\s\-]+$', recipient_name):
+        if not _is_name(recipient_name):
             raise ValidationError('Имя получателя должно содержать только буквы')
 
         return recipient_name
 
 
 def _validate_password_strength(password: str) -> None:
-    """Общая проверка сложности пароля — используется в нескольких формах."""
+    """
+    Общая проверка сложности пароля — используется в нескольких формах.
+    Классы символов собираются за один проход по паролю; все невыполненные требования
+    возвращаются одним списком ошибок, а не по одному за отправку формы.
+    """
+    # Верхняя граница до любых проверок: сверхдлинный пароль не гоняет цикл и хеширование PBKDF2
+    if len(password) > _PASSWORD_MAX_LENGTH:
+        raise ValidationError(f'Пароль должен содержать не более {_PASSWORD_MAX_LENGTH} символов')
+
+    has_upper = has_lower = has_digit = has_special = False
+    for ch in password:
+        if 'A' <= ch <= 'Z':
+            has_upper = True
+        elif 'a' <= ch <= 'z':
+            has_lower = True
+        elif ch.isdecimal():
+            has_digit = True
+        elif ch in _PASSWORD_SPECIALS:
+            has_special = True
+
+    errors = []
     if len(password) < 8:
-        raise ValidationError('Пароль должен содержать минимум 8 символов')
-    if not re.search(r'[A-Z]', password):
-        raise ValidationError('Пароль должен содержать хотя бы одну заглавную латинскую букву (A–Z)')
-    if not re.search(r'[a-z]', password):
-        raise ValidationError('Пароль должен содержать хотя бы одну строчную латинскую букву (a–z)')
-    if not re.search(r'\d', password):
-        raise ValidationError('Пароль должен содержать хотя бы одну цифру')
-    if not re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>?/\\|`~]', password):
-        raise ValidationError('Пароль должен содержать хотя бы один спецсимвол (!@#$%^&* и т.д.)')
+        errors.append('Пароль должен содержать минимум 8 символов')
+    if not has_upper:
+        errors.append('Пароль должен содержать хотя бы одну заглавную латинскую букву (A–Z)')
+    if not has_lower:
+        errors.append('Пароль должен содержать хотя бы одну строчную латинскую букву (a–z)')
+    if not has_digit:
+        errors.append('Пароль должен содержать хотя бы одну цифру')
+    if not has_special:
+        errors.append('Пароль должен содержать хотя бы один спецсимвол (!@#$%^&* и т.д.)')
+    if errors:
+        raise ValidationError(errors)
 
 
 class ChangePasswordForm(forms.Form):
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0010_owner_passport_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'status', '-registration_date'], name='user_role_status_reg_idx'),
+        ),
+    ]
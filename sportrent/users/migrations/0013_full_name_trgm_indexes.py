@@ -0,0 +1,27 @@
+from django.db import migrations
+
+# Поиск по ФИО: клиенты — rental_list (менеджер), владельцы — админ-списки инвентаря и владельцев
+SEARCH_COLUMNS = (
+    ('clients', 'full_name'),
+    ('owners', 'full_name'),
+)
+
+# Как и в inventory/0013: icontains на PostgreSQL — UPPER(col::text) LIKE UPPER('%q%'),
+# GIN-индекс с gin_trgm_ops по тому же выражению
+CREATE_TRGM_INDEXES = ['CREATE EXTENSION IF NOT EXISTS pg_trgm;'] + [
+    f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} '
+    f'USING gin ((UPPER({column}::text)) gin_trgm_ops);'
+    for table, column in SEARCH_COLUMNS
+]
+DROP_TRGM_INDEXES = [f'DROP INDEX IF EXISTS {table}_{column}_trgm;' for table, column in SEARCH_COLUMNS]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_updated_date'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRGM_INDEXES, DROP_TRGM_INDEXES),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:58
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_current_percentage(apps, schema_editor):
+    # То же, что OwnerAgreement.sync_owner_percentage(), на исторических моделях
+    Owner = apps.get_model('users', 'Owner')
+    OwnerAgreement = apps.get_model('users', 'OwnerAgreement')
+    latest = OwnerAgreement.objects.filter(
+        owner=models.OuterRef('pk'), is_accepted=True
+    ).order_by('-created_date').values('owner_percentage')[:1]
+    Owner.objects.update(current_owner_percentage=Coalesce(models.Subquery(latest), models.Value(70)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_full_name_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='owner',
+            name='current_owner_percentage',
+            field=models.IntegerField(default=70, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)], verbose_name='Текущий процент владельцу'),
+        ),
+        migrations.RunPython(fill_current_percentage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:18
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def lowercase_emails(apps, schema_editor):
+    """
+    Перед уникальным индексом по LOWER(email) приводит адреса к нижнему регистру.
+    В группе адресов, различающихся только регистром, адрес остаётся за аккаунтом,
+    у которого он уже в нижнем регистре, иначе — за самым ранним; остальным
+    (аренды и профили не удаляем) выдаётся уникальный email+duplicate-<pk>.
+    """
+    User = apps.get_model('users', 'User')
+    groups = {}
+    for pk, email in User.objects.order_by('registration_date', 'pk').values_list('pk', 'email'):
+        groups.setdefault(email.lower(), []).append((pk, email))
+
+    renames = []
+    for lowered, accounts in groups.items():
+        keeper = next((account for account in accounts if account[1] == lowered), accounts[0])
+        local, _, domain = lowered.rpartition('@')
+        for pk, email in accounts:
+            if (pk, email) != keeper:
+                renames.append((pk, f'{local}+duplicate-{pk}@{domain}'))
+        if keeper[1] != lowered:
+            renames.append((keeper[0], lowered))
+
+    # Дубликаты переименовываются раньше владельцев адреса — UNIQUE(email) не срабатывает на промежуточных шагах
+    for pk, email in renames:
+        User.objects.filter(pk=pk).update(email=email)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0014_owner_current_percentage'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='uniq_user_email_lower', violation_error_message='Пользователь с таким email уже существует.'),
+        ),
+    ]
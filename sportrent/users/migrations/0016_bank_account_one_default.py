@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:29
+
+from django.db import migrations, models
+
+
+def keep_latest_default_account(apps, schema_editor):
+    """Перед созданием индекса оставляет один счёт по умолчанию — последний созданный."""
+    BankAccount = apps.get_model('users', 'BankAccount')
+    seen = set()
+    duplicates = []
+    for account_id, owner_id in BankAccount.objects.filter(
+        is_default=True
+    ).order_by('owner_id', '-created_date').values_list('account_id', 'owner_id'):
+        if owner_id in seen:
+            duplicates.append(account_id)
+        else:
+            seen.add(owner_id)
+    if duplicates:
+        BankAccount.objects.filter(account_id__in=duplicates).update(is_default=False)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0015_user_email_lower_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_default_account, noop),
+        migrations.AddConstraint(
+            model_name='bankaccount',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('owner',), name='bank_account_one_default_per_owner'),
+        ),
+    ]
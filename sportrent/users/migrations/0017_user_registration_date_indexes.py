@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0016_bank_account_one_default'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', '-registration_date'], name='user_role_reg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-registration_date'], name='user_reg_date_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:31
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0017_user_registration_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='owneragreement',
+            options={'verbose_name': 'Соглашение владельца', 'verbose_name_plural': 'Соглашения владельцев'},
+        ),
+        migrations.AlterModelOptions(
+            name='user',
+            options={'verbose_name': 'Пользователь', 'verbose_name_plural': 'Пользователи'},
+        ),
+    ]
@@ -25,10 +25,14 @@
 
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Lower
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+# Процент выплаты владельцу, пока у него нет принятого соглашения (стандартные условия 70/30)
+DEFAULT_OWNER_PERCENTAGE = 70
+
 
 class UserManager(BaseUserManager):
     """Менеджер для кастомной модели пользователя."""
@@ -38,12 +42,17 @@ class UserManager(BaseUserManager):
         if not email:
             raise ValueError('Email обязателен для заполнения')
 
-        email = self.normalize_email(email)
+        # Email хранится в нижнем регистре целиком (uniq_user_email_lower), не только домен
+        email = self.normalize_email(email).lower()
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
         return user
 
+    def get_by_natural_key(self, username):
+        """Вход по email без учёта регистра: адреса в БД уже в нижнем регистре."""
+        return self.get(**{self.model.USERNAME_FIELD: username.lower()})
+
     def create_superuser(self, email, password=None, **extra_fields):
         """Создание суперпользователя."""
         extra_fields.setdefault('is_staff', True)
@@ -72,6 +81,11 @@ class User(AbstractBaseUser, PermissionsMixin):
         ('pending', 'Ожидает проверки'),
     ]
 
+    # Подписи ролей и статусов — один словарь на класс: get_FOO_display() Django строит его на каждый вызов,
+    # а роль выводится в __str__, шапке профиля и каждой строке админ-списка
+    ROLE_DISPLAY = dict(ROLE_CHOICES)
+    STATUS_DISPLAY = dict(STATUS_CHOICES)
+
     user_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     email = models.EmailField(max_length=255, unique=True, verbose_name='Email')
     phone = models.CharField(max_length=30, blank=True, null=True, unique=True, verbose_name='Телефон')
@@ -81,6 +95,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     block_reason = models.TextField(blank=True, verbose_name='Причина блокировки')
 
     registration_date = models.DateTimeField(default=timezone.now, verbose_name='Дата регистрации')
+    updated_date = models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата изменения')
     avatar_url = models.ImageField(upload_to='avatars/', blank=True, null=True, verbose_name='Аватар')
 
     avg_rating = models.DecimalField(
@@ -98,6 +113,14 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    # Роль → related_name её профиля
+    ROLE_PROFILE_RELATIONS = {
+        'client': 'client_profile',
+        'owner': 'owner_profile',
+        'manager': 'manager_profile',
+        'administrator': 'admin_profile',
+    }
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
@@ -105,22 +128,37 @@ class User(AbstractBaseUser, PermissionsMixin):
         db_table = 'users'
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
-        ordering = ['-registration_date']
+        # Без ordering по умолчанию: порядок задают сами списки (custom_admin.users — по дате регистрации)
+        indexes = [
+            # Админ-список пользователей: фильтры role/status + сортировка по дате регистрации
+            models.Index(fields=['role', 'status', '-registration_date'], name='user_role_status_reg_idx'),
+            # Тот же список только с фильтром роли и без фильтров (+ «новые за месяц» на дашборде)
+            models.Index(fields=['role', '-registration_date'], name='user_role_reg_idx'),
+            models.Index(fields=['-registration_date'], name='user_reg_date_idx'),
+        ]
+        constraints = [
+            # Один аккаунт на адрес независимо от регистра (Ivan@mail.ru == ivan@mail.ru);
+            # регистрация не делает SELECT перед INSERT — повтор ловится как IntegrityError
+            models.UniqueConstraint(
+                Lower('email'), name='uniq_user_email_lower',
+                violation_error_message='Пользователь с таким email уже существует.',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.email} ({self.get_role_display()})"
 
+    def get_role_display(self):
+        return self.ROLE_DISPLAY.get(self.role, self.role)
+
+    def get_status_display(self):
+        return self.STATUS_DISPLAY.get(self.status, self.status)
+
     def get_full_name(self):
-        """Получение полного имени из связанных моделей."""
-        if self.role == 'client' and hasattr(self, 'client_profile'):
-            return self.client_profile.full_name
-        elif self.role == 'owner' and hasattr(self, 'owner_profile'):
-            return self.owner_profile.full_name
-        elif self.role == 'manager' and hasattr(self, 'manager_profile'):
-            return self.manager_profile.full_name
-        elif self.role == 'administrator' and hasattr(self, 'admin_profile'):
-            return self.admin_profile.full_name
-        return self.email
+        """Получение полного имени из профиля роли (или email, если профиля нет)."""
+        relation = self.ROLE_PROFILE_RELATIONS.get(self.role)
+        profile = getattr(self, relation, None) if relation else None
+        return profile.full_name if profile is not None else self.email
 
 
 class Client(models.Model):
@@ -207,6 +245,12 @@ class Owner(models.Model):
     )
 
     total_earnings = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name='Общий заработок')
+    # Процент владельцу из последнего принятого OwnerAgreement (поддерживают сигналы users/signals.py)
+    current_owner_percentage = models.IntegerField(
+        default=DEFAULT_OWNER_PERCENTAGE,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        verbose_name='Текущий процент владельцу',
+    )
     active_items = models.IntegerField(default=0, verbose_name='Активных предметов')
     verified = models.BooleanField(default=False, verbose_name='Верифицирован')
 
@@ -252,7 +296,6 @@ class OwnerAgreement(models.Model):
         db_table = 'owner_agreements'
         verbose_name = 'Соглашение владельца'
         verbose_name_plural = 'Соглашения владельцев'
-        ordering = ['-created_date']
 
     def __str__(self):
         return f"Соглашение {self.owner.full_name} - {self.owner_percentage}/{self.store_percentage}%"
@@ -262,6 +305,21 @@ class OwnerAgreement(models.Model):
             self.accepted_date = timezone.now()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def sync_owner_percentage(cls, owners=None):
+        """
+        Переписывает Owner.current_owner_percentage из последнего принятого соглашения
+        (без соглашения — DEFAULT_OWNER_PERCENTAGE) одним UPDATE. owners — queryset владельцев, по умолчанию все.
+        """
+        latest = cls.objects.filter(
+            owner=models.OuterRef('pk'), is_accepted=True
+        ).order_by('-created_date').values('owner_percentage')[:1]
+        if owners is None:
+            owners = Owner.objects.all()
+        return owners.update(current_owner_percentage=Coalesce(
+            models.Subquery(latest), models.Value(DEFAULT_OWNER_PERCENTAGE)
+        ))
+
 
 class BankAccount(models.Model):
     """Банковские реквизиты владельца."""
@@ -281,15 +339,43 @@ class BankAccount(models.Model):
         verbose_name = 'Банковский счет'
         verbose_name_plural = 'Банковские счета'
         ordering = ['-is_default', '-created_date']
+        constraints = [
+            # Не больше одного счёта по умолчанию у владельца (частичный уникальный индекс)
+            models.UniqueConstraint(
+                fields=['owner'], condition=models.Q(is_default=True), name='bank_account_one_default_per_owner',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.bank_name} - {self.account_number}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._is_default_saved = instance.__dict__.get('is_default')
+        return instance
+
     def save(self, *args, **kwargs):
-        if self.is_default:
-            # Убираем флаг is_default у других счетов этого владельца
-            BankAccount.objects.filter(owner=self.owner, is_default=True).exclude(pk=self.pk).update(is_default=False)
-        super().save(*args, **kwargs)
+        # Флаг снимается с других счетов только когда этот счёт становится основным,
+        # а не при каждой правке реквизитов. Если вызывающий передал update_fields
+        # без is_default, флаг не пишется — и снимать его с других счетов не нужно.
+        # Сами update_fields здесь не подставляются: сохранение существующего счёта
+        # и так один UPDATE, а список полей знает только вызывающий код.
+        update_fields = kwargs.get('update_fields')
+        becomes_default = (
+            self.is_default
+            and not getattr(self, '_is_default_saved', False)
+            and (update_fields is None or 'is_default' in update_fields)
+        )
+        if not becomes_default:
+            super().save(*args, **kwargs)
+        else:
+            # Сброс и запись — в одной транзакции: если запись упадёт
+            # (например, на bank_account_one_default_per_owner), старый основной счёт сохранится
+            with transaction.atomic():
+                BankAccount.objects.filter(owner_id=self.owner_id, is_default=True).exclude(pk=self.pk).update(is_default=False)
+                super().save(*args, **kwargs)
+        self._is_default_saved = self.is_default
 
 
 class Manager(models.Model):
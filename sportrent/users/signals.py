@@ -0,0 +1,17 @@
+"""
+Сигналы приложения users.
+Паттерн «Наблюдатель»: OwnerAgreement (издатель) → Owner.current_owner_percentage (подписчик).
+Завершение аренды берёт процент владельцу из профиля, не запрашивая соглашения.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Owner, OwnerAgreement
+
+
+@receiver(post_save, sender=OwnerAgreement)
+@receiver(post_delete, sender=OwnerAgreement)
+def sync_owner_percentage(sender, instance, **kwargs):
+    """Соглашение принято, изменено или удалено — пересчитываем текущий процент владельца."""
+    OwnerAgreement.sync_owner_percentage(Owner.objects.filter(pk=instance.owner_id))
@@ -1,13 +1,23 @@
 """
 Тесты для приложения users.
-Проверяет: регистрацию клиента с NDA (152-ФЗ) и декоратор @role_required.
+Проверяет: регистрацию клиента с NDA (152-ФЗ), отказ в регистрации занятого email
+в другом регистре (и только для нарушения ограничения email), декоратор @role_required
+предзагрузку профиля роли в ProfileModelBackend (и сохранение сессий со старым ModelBackend)
+денормализованный процент владельца из принятого соглашения
+обновление при редактировании профиля только изменённых столбцов
+и однократную проверку пароля при входе (email — без учёта регистра).
 """
 
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import AnonymousUser
 
-from users.models import User, Client, PassportNDA
+from users.models import User, Client, Manager, Owner, OwnerAgreement, PassportNDA
 from users.decorators import role_required
+from users.backends import ProfileModelBackend
 
 
 class PassportNDATest(TestCase):
@@ -52,6 +62,53 @@ class PassportNDATest(TestCase):
         if user:
             self.assertFalse(PassportNDA.objects.filter(user=user).exists())
 
+    def test_duplicate_email_in_other_case_rejected(self):
+        """Ivan@... при существующем ivan@... — ошибка формы от ограничения БД, второй записи нет."""
+        User.objects.create_user(email='taken@test.com', password='Pass1234!', role='client')
+        data = {
+            'email': 'Taken@TEST.com',
+            'password1': 'TestPass1!',
+            'password2': 'TestPass1!',
+            'role': 'client',
+            'full_name': 'Тест Клиент',
+            'phone': '9001234567',
+            'passport_series': '1234',
+            'passport_number': '567890',
+            'passport_issue_date': '2020-01-15',
+            'passport_department_code': '123-456',
+            'passport_nda_accepted': True,
+        }
+        response = self.client.post('/users/register/', data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('email', response.context['form'].errors)
+        self.assertEqual(User.objects.filter(email__iexact='taken@test.com').count(), 1)
+
+    def test_other_integrity_error_not_reported_as_email(self):
+        """Нарушение чужого ограничения (телефон занят параллельно) не выдаётся за занятый email."""
+        data = {
+            'email': 'free@test.com',
+            'password1': 'TestPass1!',
+            'password2': 'TestPass1!',
+            'role': 'client',
+            'full_name': 'Тест Клиент',
+            'phone': '9001234567',
+            'passport_series': '1234',
+            'passport_number': '567890',
+            'passport_issue_date': '2020-01-15',
+            'passport_department_code': '123-456',
+            'passport_nda_accepted': True,
+        }
+
+        def take_phone(user, **kwargs):
+            # Параллельная регистрация успела занять тот же телефон — настоящее нарушение users_phone_key
+            User.objects.create_user(email='other@test.com', password='Pass1234!', role='client', phone=user.phone)
+
+        with mock.patch.object(PassportNDA.objects, 'create', side_effect=take_phone):
+            response = self.client.post('/users/register/', data)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('email', response.context['form'].errors)
+        self.assertFalse(User.objects.filter(email='free@test.com').exists())
+
 
 class RoleRequiredDecoratorTest(TestCase):
     """Декоратор @role_required блокирует неверные роли."""
@@ -106,3 +163,80 @@ class RoleRequiredDecoratorTest(TestCase):
         response = dummy_view(request)
         self.assertEqual(response.status_code, 302)
         self.assertIn('login', response['Location'])
+
+
+class ProfileModelBackendTest(TestCase):
+    """get_user() подтягивает профиль роли тем же запросом."""
+
+    def test_profile_loaded_without_extra_query(self):
+        user = User.objects.create_user(email='manager@test.com', password='Pass1234!', role='manager')
+        Manager.objects.create(user=user, full_name='Тест Менеджер')
+
+        loaded = ProfileModelBackend().get_user(user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(loaded.manager_profile.full_name, 'Тест Менеджер')
+            self.assertFalse(hasattr(loaded, 'client_profile'))
+
+    def test_session_with_legacy_backend_stays_logged_in(self):
+        user = User.objects.create_user(email='legacy@test.com', password='Pass1234!', role='client')
+        self.client.force_login(user, backend='django.contrib.auth.backends.ModelBackend')
+
+        response = self.client.get('/users/profile/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user, user)
+
+
+class OwnerPercentageSignalTest(TestCase):
+    """Owner.current_owner_percentage следует за последним принятым соглашением."""
+
+    def test_percentage_follows_accepted_agreement(self):
+        owner = Owner.objects.create(
+            user=User.objects.create_user(email='owner@test.com', password='Pass1234!', role='owner'),
+            full_name='Тест Владелец',
+        )
+        agreement = OwnerAgreement.objects.create(
+            owner=owner, owner_percentage=80, store_percentage=20, agreement_text='80/20', is_accepted=True,
+        )
+        OwnerAgreement.objects.create(owner=owner, owner_percentage=90, store_percentage=10, agreement_text='90/10')
+        owner.refresh_from_db()
+        self.assertEqual(owner.current_owner_percentage, 80)
+
+        agreement.delete()
+        owner.refresh_from_db()
+        self.assertEqual(owner.current_owner_percentage, 70)
+
+
+class ProfileUpdateFieldsTest(TestCase):
+    """Редактирование профиля обновляет только изменённые столбцы."""
+
+    def test_only_changed_columns_updated(self):
+        user = User.objects.create_user(email='client@test.com', password='Pass1234!', role='client')
+        Client.objects.create(user=user, full_name='Тест Клиент')
+        self.client.force_login(user)
+
+        data = {'email': 'client@test.com', 'phone': '+79001112233', 'full_name': 'Тест Клиент'}
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/users/profile/', data)
+        self.assertEqual(response.status_code, 302)
+
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(('UPDATE "users"', 'UPDATE "clients"'))]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"phone"', updates[0])
+        self.assertNotIn('"avatar_url"', updates[0])
+        self.assertNotIn('"email"', updates[0])
+
+
+class LoginPasswordCheckTest(TestCase):
+    """Вход проверяет пароль один раз — в AuthenticationForm, без повторного authenticate() во view."""
+
+    def test_password_hashed_once(self):
+        User.objects.create_user(email='client@test.com', password='Pass1234!', role='client')
+        with mock.patch.object(User, 'check_password', autospec=True, side_effect=User.check_password) as check:
+            response = self.client.post('/users/login/', {'username': 'client@test.com', 'password': 'Pass1234!'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(check.call_count, 1)
+
+    def test_email_case_ignored(self):
+        User.objects.create_user(email='Client@Test.com', password='Pass1234!', role='client')
+        response = self.client.post('/users/login/', {'username': 'CLIENT@test.com', 'password': 'Pass1234!'})
+        self.assertEqual(response.status_code, 302)
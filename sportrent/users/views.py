@@ -19,10 +19,11 @@ Views авторизации и управления профилем польз
 
 import logging
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import login, logout, authenticate
+from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db import transaction
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Count, Q
 
 from django.contrib.auth import update_session_auth_hash
 
@@ -32,9 +33,26 @@ from .forms import (
     ChangePasswordForm,
 )
 from .models import User, BankAccount, PassportNDA
+from inventory.models import Inventory
+from rentals.models import Rental
 
 logger = logging.getLogger('users')
 
+# Роль → форма редактирования её профиля (страница profile)
+PROFILE_FORMS = {
+    'client': ClientProfileForm,
+    'owner': OwnerProfileForm,
+}
+
+# Ограничения уникальности email: по LOWER(email) и unique=True столбца (users_email_key)
+_EMAIL_UNIQUE_CONSTRAINTS = frozenset({'uniq_user_email_lower', 'users_email_key'})
+
+
+def _is_email_taken(error):
+    """IntegrityError нарушил уникальность email, а не телефона или другого ограничения."""
+    diag = getattr(error.__cause__, 'diag', None)
+    return getattr(diag, 'constraint_name', None) in _EMAIL_UNIQUE_CONSTRAINTS
+
 
 def register(request):
     """
@@ -57,19 +75,30 @@ def register(request):
                         ip = xff.split(',')[0].strip() if xff else request.META.get('REMOTE_ADDR')
                         PassportNDA.objects.create(user=user, version='v1.0', ip_address=ip)
 
-                    logger.info(f'Новый пользователь зарегистрирован: {user.email}, роль: {user.role}')
+                    logger.info('Новый пользователь зарегистрирован: %s, роль: %s', user.email, user.role)
 
-                    # Автоматический вход после регистрации
-                    login(request, user)
+                    # Автоматический вход после регистрации (бэкендов два — указываем основной явно)
+                    login(request, user, backend='users.backends.ProfileModelBackend')
                     return redirect('core:home')
 
-            except Exception as e:
-                logger.error(f'Ошибка при регистрации пользователя: {str(e)}')
+            except IntegrityError as e:
+                if _is_email_taken(e):
+                    # Email уже занят (uniq_user_email_lower) — в т.ч. при одновременной отправке двух форм
+                    form.add_error('email', 'Пользователь с таким email уже существует.')
+                    messages.error(request, 'Email: Пользователь с таким email уже существует.')
+                else:
+                    # Телефон или другое ограничение, занятое параллельным запросом после валидации формы
+                    logger.error('Ошибка при регистрации пользователя: %s', e)
+                    messages.error(request, 'Произошла ошибка при регистрации. Пожалуйста, попробуйте снова.')
+            except DatabaseError as e:
+                # ValidationError сюда не доходит — форма уже провалидирована; прочие ошибки — баги, пусть падают
+                logger.error('Ошибка при регистрации пользователя: %s', e)
                 messages.error(request, 'Произошла ошибка при регистрации. Пожалуйста, попробуйте снова.')
         else:
             for field, errors in form.errors.items():
+                label = form.fields[field].label if field != '__all__' else ''
                 for error in errors:
-                    messages.error(request, f'{form.fields.get(field).label if field != "__all__" else ""}: {error}')
+                    messages.error(request, f'{label}: {error}')
     else:
         form = UserRegistrationForm()
 
@@ -87,33 +116,29 @@ def user_login(request):
         form = UserLoginForm(request, data=request.POST)
 
         if form.is_valid():
-            email = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
-
-            user = authenticate(request, username=email, password=password)
-
-            if user is not None:
-                if user.status == 'blocked':
-                    reason = getattr(user, 'block_reason', '') or 'Причина не указана.'
-                    messages.error(
-                        request,
-                        f'Ваш аккаунт заблокирован. Причина: {reason} Обратитесь в поддержку.'
-                    )
-                    logger.warning(f'Попытка входа заблокированного пользователя: {email}')
-                else:
-                    login(request, user)
-                    logger.info(f'Пользователь вошел в систему: {user.email}')
-
-                    # Перенаправление в зависимости от роли
-                    next_url = request.GET.get('next')
-                    if next_url:
-                        return redirect(next_url)
-                    elif user.role in ['manager', 'administrator']:
-                        return redirect('custom_admin:dashboard')
-                    else:
-                        return redirect('core:home')
+            # AuthenticationForm.clean() уже вызвал authenticate(): повторный вызов
+            # прогнал бы хешер пароля (PBKDF2) второй раз на каждый вход
+            user = form.get_user()
+
+            if user.status == 'blocked':
+                reason = getattr(user, 'block_reason', '') or 'Причина не указана.'
+                messages.error(
+                    request,
+                    f'Ваш аккаунт заблокирован. Причина: {reason} Обратитесь в поддержку.'
+                )
+                logger.warning('Попытка входа заблокированного пользователя: %s', user.email)
             else:
-                messages.error(request, 'Неверный email или пароль.')
+                login(request, user)
+                logger.info('Пользователь вошел в систему: %s', user.email)
+
+                # Перенаправление в зависимости от роли
+                next_url = request.GET.get('next')
+                if next_url:
+                    return redirect(next_url)
+                elif user.role in ['manager', 'administrator']:
+                    return redirect('custom_admin:dashboard')
+                else:
+                    return redirect('core:home')
         else:
             messages.error(request, 'Неверный email или пароль.')
     else:
@@ -129,7 +154,7 @@ def user_logout(request):
     """
     user_email = request.user.email
     logout(request)
-    logger.info(f'Пользователь вышел из системы: {user_email}')
+    logger.info('Пользователь вышел из системы: %s', user_email)
     return redirect('core:home')
 
 
@@ -141,16 +166,9 @@ def profile(request):
     user = request.user
     profile_form = None
 
-    # Определяем форму профиля в зависимости от роли
-    if user.role == 'client' and hasattr(user, 'client_profile'):
-        profile_model = user.client_profile
-        ProfileFormClass = ClientProfileForm
-    elif user.role == 'owner' and hasattr(user, 'owner_profile'):
-        profile_model = user.owner_profile
-        ProfileFormClass = OwnerProfileForm
-    else:
-        profile_model = None
-        ProfileFormClass = None
+    # Форма профиля по роли; у менеджера и администратора редактируются только данные пользователя
+    ProfileFormClass = PROFILE_FORMS.get(user.role)
+    profile_model = getattr(user, User.ROLE_PROFILE_RELATIONS[user.role], None) if ProfileFormClass else None
 
     if request.method == 'POST':
         user_form = UserUpdateForm(request.POST, request.FILES, instance=user)
@@ -165,11 +183,11 @@ def profile(request):
                     if profile_form:
                         profile_form.save()
 
-                    logger.info(f'Профиль обновлен: {user.email}')
+                    logger.info('Профиль обновлен: %s', user.email)
                     messages.success(request, 'Профиль успешно обновлен.')
                     return redirect('users:profile')
-            except Exception as e:
-                logger.error(f'Ошибка при обновлении профиля: {str(e)}')
+            except DatabaseError as e:
+                logger.error('Ошибка при обновлении профиля: %s', e)
                 messages.error(request, 'Произошла ошибка при сохранении.')
     else:
         user_form = UserUpdateForm(instance=user)
@@ -182,17 +200,24 @@ def profile(request):
         'profile_form': profile_form,
     }
 
-    # Добавляем статистику в зависимости от роли
-    if user.role == 'client' and hasattr(user, 'client_profile'):
-        from rentals.models import Rental
-        context['total_rentals'] = Rental.objects.filter(client=user.client_profile).count()
-        context['active_rentals'] = Rental.objects.filter(client=user.client_profile, status='active').count()
-
-    elif user.role == 'owner' and hasattr(user, 'owner_profile'):
-        from inventory.models import Inventory
-        context['total_items'] = Inventory.objects.filter(owner=user.owner_profile).count()
-        context['active_items'] = Inventory.objects.filter(owner=user.owner_profile, status='available').count()
-        context['bank_accounts'] = BankAccount.objects.filter(owner=user.owner_profile).order_by('-is_default', '-created_date')
+    # Добавляем статистику в зависимости от роли (профиль уже найден выше — без повторных hasattr)
+    # Оба счётчика — одним агрегатом (COUNT c FILTER) за один проход по строкам пользователя.
+    # COUNT(*) и COUNT(status) не читают столбцов вне индексов (client, status, …) / (owner, status) —
+    # Postgres обходится index-only scan без чтения строк таблицы
+    if profile_model is not None and user.role == 'client':
+        stats = Rental.objects.filter(client=profile_model).aggregate(
+            total=Count('*'), active=Count('status', filter=Q(status='active')),
+        )
+        context['total_rentals'] = stats['total']
+        context['active_rentals'] = stats['active']
+
+    elif profile_model is not None and user.role == 'owner':
+        stats = Inventory.objects.filter(owner=profile_model).aggregate(
+            total=Count('*'), active=Count('status', filter=Q(status='available')),
+        )
+        context['total_items'] = stats['total']
+        context['active_items'] = stats['active']
+        context['bank_accounts'] = BankAccount.objects.filter(owner=profile_model).order_by('-is_default', '-created_date')
 
     return render(request, 'users/profile.html', context)
 
@@ -218,11 +243,11 @@ def bank_account_add(request):
                     bank_account.is_default = True
                 
                 bank_account.save()
-                logger.info(f'Добавлен банковский счет: {bank_account.account_id} для {owner.full_name}')
+                logger.info('Добавлен банковский счет: %s для %s', bank_account.account_id, owner.full_name)
                 messages.success(request, 'Банковский счет успешно добавлен.')
                 return redirect('users:profile')
             except Exception as e:
-                logger.error(f'Ошибка при добавлении банковского счета: {str(e)}')
+                logger.error('Ошибка при добавлении банковского счета: %s', e)
                 messages.error(request, 'Произошла ошибка при сохранении.')
     else:
         form = BankAccountForm()
@@ -245,10 +270,10 @@ def bank_account_delete(request, pk):
     if request.method == 'POST':
         try:
             bank_account.delete()
-            logger.info(f'Удален банковский счет: {bank_account.account_id}')
+            logger.info('Удален банковский счет: %s', bank_account.account_id)
             messages.success(request, 'Банковский счет успешно удален.')
         except Exception as e:
-            logger.error(f'Ошибка при удалении банковского счета: {str(e)}')
+            logger.error('Ошибка при удалении банковского счета: %s', e)
             messages.error(request, 'Произошла ошибка при удалении.')
 
     return redirect('users:profile')